@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Print the SQLite query plans of the lookups done by the views, without and with the indexes of 0004.
+
+Usage::
+
+    python benchmarks/query_plans.py [--scale N]
+
+The database is created in memory with the test settings and seeded with generated data. The plans and the mean
+duration of each lookup are printed a first time after dropping the indexes added by the migration
+`0004_lookup_indexes`, then a second time after creating them again as the models currently define them (later
+migrations redefined some of them under the same name).
+"""
+
+# Standard library
+import argparse
+import importlib
+import os
+import sys
+import timeit
+from datetime import date, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "sports_manager.tests.settings")
+
+# Django
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+
+# Current django project
+from sports_manager.bulk import bulk_create_with_pks  # noqa: E402
+from sports_manager.models import (  # noqa: E402
+    Category, Gymnasium, License, MedicalCertificate, Player, Team, TimeSlot
+)
+
+MIGRATION = importlib.import_module('sports_manager.migrations.0004_lookup_indexes')
+
+
+def seed(scale):
+    """Create `scale` owners with 5 players each and the objects around them."""
+    with transaction.atomic():
+        owners = bulk_create_with_pks(get_user_model(), [
+            get_user_model()(username="owner{}".format(i)) for i in range(scale)
+        ])
+        players = bulk_create_with_pks(Player, [
+            Player(owner=owner, first_name="First{}".format(j), last_name="Last{}".format(owner.pk * 5 + j), sex='MA',
+                   birthday=date(2000, 1, 1))
+            for owner in owners for j in range(5)
+        ])
+        License.objects.bulk_create([License(player=player, number=str(player.pk), is_payed=bool(player.pk % 2))
+                                     for player in players for _ in range(3)])
+        MedicalCertificate.objects.bulk_create([MedicalCertificate(player=player, validation=player.pk % 4)
+                                                for player in players for _ in range(3)])
+
+        categories = bulk_create_with_pks(Category, [
+            Category(name="Category {}".format(i), slug="category-{}".format(i), min_age=i)
+            for i in range(scale // 10 + 1)
+        ])
+        teams = bulk_create_with_pks(Team, [
+            Team(category=category, name="Team {} {}".format(category.pk, j), slug="team-{}-{}".format(category.pk, j),
+                 recrutment=True, trainer=owners[j] if j % 2 else None)
+            for category in categories for j in range(4)
+        ])
+        gymnasiums = bulk_create_with_pks(Gymnasium, [
+            Gymnasium(name="Gym {}".format(i), slug="gym-{}".format(i), address="", city="", zip_code=0)
+            for i in range(10)
+        ])
+        TimeSlot.objects.bulk_create([
+            TimeSlot(type=TimeSlot.PRACTICE, team=team, gymnasium=gymnasiums[team.pk % 10], day=(team.pk + j) % 7,
+                     start=time(18 + j), end=time(19 + j))
+            for team in teams for j in range(3)
+        ])
+
+
+def lookups():
+    """Return the lookups done by the views."""
+    owner = get_user_model().objects.order_by('pk')[len(get_user_model().objects.all()) // 2]
+    player = Player.objects.filter(owner=owner).first()
+    category = Category.objects.order_by('pk').last()
+    return [
+        ("PlayerListView", Player.objects.filter(owner__username=owner.username)),
+        ("LicenseListView", License.objects.filter(player__owner__username=owner.username)),
+        ("Category.has_teams_with_trainer", Team.objects.filter(category=category, trainer__isnull=False)[:1]),
+        ("CategoryListView", Category.objects.with_trainer_flags()),
+        ("TimeSlot of a day", TimeSlot.objects.filter(day=TimeSlot.WEDNESDAY)),
+        ("Certificates of a player", MedicalCertificate.objects.filter(player=player).order_by('start', 'validation')),
+    ]
+
+
+def explain(queryset):
+    """Return the query plan of the queryset."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def report(title, number):
+    """Print the plan and the duration of every lookup."""
+    print("=" * 80)
+    print(title)
+    print("=" * 80)
+    for name, queryset in lookups():
+        duration = timeit.timeit(lambda: list(queryset.all()), number=number) / number
+        print("{} ({:.3f} ms)".format(name, duration * 1000))
+        for line in explain(queryset):
+            print("    " + line)
+    print()
+
+
+def migration_indexes():
+    """Return the `(model, index)` of the indexes named by the migration, taken from the `Meta.indexes` of the models.
+
+    The operations of the migration are only read for the names of the indexes, their fields may have changed since.
+    """
+    names = {operation.index.name for operation in MIGRATION.Migration.operations if hasattr(operation, 'index')}
+    return [(model, index)
+            for model in django.apps.apps.get_app_config('sports_manager').get_models()
+            for index in model._meta.indexes
+            if index.name in names]
+
+
+def drop_indexes():
+    """Drop the indexes created by the migration."""
+    with connection.cursor() as cursor:
+        for name in [index.name for _, index in migration_indexes()] + ['sm_team_with_trainer_idx']:
+            cursor.execute('DROP INDEX "{}"'.format(name))
+
+
+def create_indexes():
+    """Create the indexes of the migration again, as the models define them."""
+    with connection.schema_editor() as schema_editor:
+        for model, index in migration_indexes():
+            schema_editor.add_index(model, index)
+        MIGRATION.create_team_with_trainer_index(django.apps.apps, schema_editor)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=int, default=1000, help="Number of owners (default: 1000).")
+    parser.add_argument('--number', type=int, default=50, help="Number of runs of each lookup (default: 50).")
+    args = parser.parse_args()
+
+    assert connection.vendor == 'sqlite', "EXPLAIN QUERY PLAN is specific to SQLite"
+    connection.creation.create_test_db(verbosity=0)
+    seed(args.scale)
+
+    drop_indexes()
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    report("Without the indexes of {}".format(MIGRATION.__name__.rsplit('.', 1)[-1]), args.number)
+
+    create_indexes()
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    report("With the indexes of {}".format(MIGRATION.__name__.rsplit('.', 1)[-1]), args.number)
+
+
+if __name__ == '__main__':
+    main()
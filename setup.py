@@ -30,10 +30,14 @@ VERSION = None
 REQUIRED = [
     "Django>=2.0,<2.2",
     "django-markdownx==2.0.28",
+    "Pillow>=6.0",
 ]
 
 # What packages are optional?
 EXTRAS = {
+    'xlsx': [
+        'openpyxl>=2.6',
+    ],
     'dev': [
         'flake8',
         'flake8-docstrings>=0.2.7',
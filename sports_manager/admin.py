@@ -3,13 +3,68 @@
 """Admin."""
 
 # Django
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db.models import F
+from django.utils.translation import ugettext_lazy as _
 
 # Current django project
 import sports_manager
+from sports_manager.autocomplete import LOOKUPS
+from sports_manager.duplicates import merge
 # from sports.models import Category, License, Player, Team, TimeSlot
 
 
+class PlayerNameAdminMixin:
+    """Show the name of the player of an object as sortable columns.
+
+    The names are annotated on the queryset so that no query is run for each row.
+    """
+
+    def get_queryset(self, request):
+        """Annotate the names of the player."""
+        return super().get_queryset(request).annotate(player_first_name=F('player__first_name'),
+                                                      player_last_name=F('player__last_name'))
+
+    def player_first_name(self, obj):
+        return obj.player_first_name
+    player_first_name.short_description = _("first name")
+    player_first_name.admin_order_field = 'player_first_name'
+
+    def player_last_name(self, obj):
+        return obj.player_last_name
+    player_last_name.short_description = _("last name")
+    player_last_name.admin_order_field = 'player_last_name'
+
+
+class PrefixSearchAdminMixin:
+    """Complete the foreign keys to the model with a lookup of `sports_manager.autocomplete`.
+
+    The autocompletion of the other admins reads a range of an index, the search of the changelist is left as it is.
+    """
+
+    autocomplete_lookup = None
+
+    def get_search_results(self, request, queryset, search_term):
+        """Use the lookup in the autocomplete view."""
+        if request.resolver_match.url_name.endswith('_autocomplete') and search_term.strip():
+            lookup = LOOKUPS[self.autocomplete_lookup]
+            return lookup.filter(queryset, search_term).order_by(lookup.field, 'pk'), False
+        return super().get_search_results(request, queryset, search_term)
+
+
+@admin.register(sports_manager.models.season.Season)
+class SeasonAdmin(admin.ModelAdmin):
+    list_display = (
+        'year',
+        'start',
+        'end',
+        'is_closed',
+        'archived',
+    )
+    list_filter = (
+        'is_closed',
+    )
+
 @admin.register(sports_manager.models.category.Category)
 class CategoryAdmin(admin.ModelAdmin):
     prepopulated_fields = {"slug": ("name",)}
@@ -18,9 +73,24 @@ class CategoryAdmin(admin.ModelAdmin):
         'min_age',
         'max_age'
     )
+    search_fields = (
+        '^name',
+    )
+
+@admin.register(sports_manager.models.gymnasium.Gymnasium)
+class GymnasiumAdmin(PrefixSearchAdminMixin, admin.ModelAdmin):
+    autocomplete_lookup = 'gymnasiums'
+    list_display = (
+        'name',
+        'city',
+    )
+    search_fields = (
+        '^name',
+    )
 
 @admin.register(sports_manager.models.team.Team)
-class TeamAdmin(admin.ModelAdmin):
+class TeamAdmin(PrefixSearchAdminMixin, admin.ModelAdmin):
+    autocomplete_lookup = 'teams'
     prepopulated_fields = {"slug": ("name",)}
     list_display = (
         'name',
@@ -28,6 +98,19 @@ class TeamAdmin(admin.ModelAdmin):
         'level',
         'sex'
     )
+    list_select_related = (
+        'category',
+    )
+    list_filter = (
+        'category',
+    )
+    search_fields = (
+        '^name',
+    )
+    # The admin of the users belongs to the project
+    raw_id_fields = (
+        'trainer',
+    )
 
 @admin.register(sports_manager.models.team.TimeSlot)
 class TimeSlotAdmin(admin.ModelAdmin):
@@ -36,43 +119,87 @@ class TimeSlotAdmin(admin.ModelAdmin):
         'type',
         'day'
     )
+    list_select_related = (
+        'team',
+    )
+    list_filter = (
+        'day',
+        'gymnasium',
+    )
+    autocomplete_fields = (
+        'team',
+        'gymnasium',
+    )
 
 @admin.register(sports_manager.models.player.Player)
-class PlayerAdmin(admin.ModelAdmin):
+class PlayerAdmin(PrefixSearchAdminMixin, admin.ModelAdmin):
+    autocomplete_lookup = 'players'
     list_display = (
         'first_name',
         'last_name',
         'owner',
     )
+    list_select_related = (
+        'owner',
+    )
+    # istartswith, read from the indexes of the names ignoring the case (see the migration 0014)
+    search_fields = (
+        '^last_name',
+        '^first_name',
+    )
+    raw_id_fields = (
+        'owner',
+    )
+    actions = (
+        'merge_players',
+    )
+
+    def merge_players(self, request, queryset):
+        """Merge the selected players into the oldest one."""
+        players = list(queryset.order_by('created', 'pk'))
+        if len(players) < 2:
+            self.message_user(request, _("Select at least two players to merge."), messages.WARNING)
+            return
+        moved = merge(players[0], players[1:])
+        self.message_user(request, _("%(count)d player(s) merged into %(player)s, %(moved)d object(s) moved.") % {
+            'count': len(players) - 1, 'player': players[0], 'moved': moved})
+    merge_players.short_description = _("Merge the selected players into the oldest one")
 
 @admin.register(sports_manager.models.player.MedicalCertificate)
-class MedicalCertificateAdmin(admin.ModelAdmin):
+class MedicalCertificateAdmin(PlayerNameAdminMixin, admin.ModelAdmin):
     list_display = (
         'player_first_name',
         'player_last_name',
         'start',
         'validation'
     )
-
-    def player_first_name(self, obj):
-        return obj.player.first_name
-
-    def player_last_name(self, obj):
-        return obj.player.last_name
+    list_filter = (
+        'validation',
+    )
+    # The names of the joined players are compared while scanning the rows, not read from an index
+    search_fields = (
+        '^player__last_name',
+        '^player__first_name',
+    )
+    autocomplete_fields = (
+        'player',
+    )
 
 @admin.register(sports_manager.models.player.EmergencyContact)
-class EmergencyContactAdmin(admin.ModelAdmin):
+class EmergencyContactAdmin(PlayerNameAdminMixin, admin.ModelAdmin):
     list_display = (
         'player_first_name',
         'player_last_name',
         'phone',
     )
-
-    def player_first_name(self, obj):
-        return obj.player.first_name
-
-    def player_last_name(self, obj):
-        return obj.player.last_name
+    # The names of the joined players are compared while scanning the rows, not read from an index
+    search_fields = (
+        '^player__last_name',
+        '^player__first_name',
+    )
+    autocomplete_fields = (
+        'player',
+    )
 
 @admin.register(sports_manager.models.license.License)
 class LicenseAdmin(admin.ModelAdmin):
@@ -81,3 +208,19 @@ class LicenseAdmin(admin.ModelAdmin):
         'number',
         'is_payed',
     )
+    list_select_related = (
+        'player',
+    )
+    list_filter = (
+        'is_payed',
+    )
+    # The names of the joined players are compared while scanning the rows, not read from an index
+    search_fields = (
+        '^player__last_name',
+        '^player__first_name',
+        '=number',
+    )
+    autocomplete_fields = (
+        'player',
+        'teams',
+    )
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""Read-only JSON API of the categories, teams, gymnasiums and time slots.
+
+The objects are serialized from `values()` rows, never from model instances::
+
+    GET /api/v1/teams/?fields[teams]=name,level&include=category,time-slots&fields[categories]=name
+
+`fields[<type>]` restricts the attributes returned for a type (the identifier is always returned) and `include` embeds
+related objects instead of their identifier. The objects a resource points to are fetched in the same query with a
+join, as `select_related` would, and the objects pointing to it with one more query for each relation, as
+`prefetch_related` would.
+
+The responses are cached under the current season and the `api` version counter, bumped by `sports_manager.signals`
+when one of the models changes, and their ETag is the hash of their body. A client polling a resource that did not
+change gets a 304 without any database query.
+"""
+
+# Standard library
+import hashlib
+import json
+from collections import OrderedDict
+
+# Django
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import FileField
+from django.utils.translation import ugettext as _
+
+# Current django project
+from sports_manager.cache import API, get_version
+from sports_manager.models import Category, Gymnasium, Team, TimeSlot
+from sports_manager.models.season import current_season
+
+API_VERSION = 'v1'
+RESPONSE_KEY = 'sports_manager:api:{season}:{version}:{digest}'
+
+RESOURCES = OrderedDict()
+
+
+class ApiError(Exception):
+    """Raised when a parameter of a request is invalid."""
+
+    def __init__(self, parameter, message):
+        """Keep the name of the invalid parameter."""
+        super().__init__(message)
+        self.parameter = parameter
+
+
+def register(resource):
+    """Register a resource under its type."""
+    RESOURCES[resource.type] = resource
+    return resource
+
+
+class Relation:
+    """Relation of a resource to another one.
+
+    `field` is the foreign key of the resource for a to-one relation and the foreign key of the related resource for a
+    to-many relation.
+    """
+
+    def __init__(self, resource_type, field, many=False):
+        """Initialize the relation."""
+        self.type = resource_type
+        self.field = field
+        self.many = many
+
+    @property
+    def resource(self):
+        """Return the related resource."""
+        return RESOURCES[self.type]
+
+
+class Resource:
+    """Description of the serialization of a model."""
+
+    type = None
+    model = None
+    # Attribute identifying the objects, always returned
+    lookup = 'slug'
+    attributes = ()
+    relations = {}
+
+    @classmethod
+    def identifier(cls):
+        """Return the name of the identifier in the serialized objects."""
+        return 'id' if cls.lookup == 'pk' else cls.lookup
+
+    @classmethod
+    def convert(cls, name, value):
+        """Return the serialized value of a field, the URL of a file instead of its name."""
+        if name in cls.attributes:
+            field = cls.model._meta.get_field(name)
+            if isinstance(field, FileField):
+                return field.storage.url(value) if value else None
+        return value
+
+
+@register
+class CategoryResource(Resource):
+    """Categories."""
+
+    type = 'categories'
+    model = Category
+    attributes = ('name', 'min_age', 'max_age', 'summary', 'description_html', 'img')
+    relations = {
+        'teams': Relation('teams', 'category', many=True),
+    }
+
+
+@register
+class TeamResource(Resource):
+    """Teams, without their trainer."""
+
+    type = 'teams'
+    model = Team
+    attributes = ('name', 'level', 'sex', 'url', 'recrutment', 'description_html', 'img')
+    relations = {
+        'category': Relation('categories', 'category'),
+        'time-slots': Relation('time-slots', 'team', many=True),
+    }
+
+
+@register
+class GymnasiumResource(Resource):
+    """Gymnasiums."""
+
+    type = 'gymnasiums'
+    model = Gymnasium
+    attributes = ('name', 'address', 'city', 'zip_code', 'phone', 'surface', 'capacity')
+    relations = {
+        'time-slots': Relation('time-slots', 'gymnasium', many=True),
+    }
+
+
+@register
+class TimeSlotResource(Resource):
+    """Time slots."""
+
+    type = 'time-slots'
+    model = TimeSlot
+    lookup = 'pk'
+    attributes = ('type', 'day', 'start', 'end')
+    relations = {
+        'team': Relation('teams', 'team'),
+        'gymnasium': Relation('gymnasiums', 'gymnasium'),
+    }
+
+
+def split(value):
+    """Return the items of a comma separated parameter."""
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class Document:
+    """Serialization of a resource for the parameters of a request."""
+
+    def __init__(self, resource, params):
+        """Validate the `fields[<type>]` and `include` parameters."""
+        self.resource = resource
+        self.fields = {}
+        for name in params:
+            if not (name.startswith('fields[') and name.endswith(']')):
+                continue
+            resource_type = name[len('fields['):-1]
+            if resource_type not in RESOURCES:
+                raise ApiError(name, _("Unknown type '%(type)s'.") % {'type': resource_type})
+            fields = split(params[name])
+            known = set(RESOURCES[resource_type].attributes) | set(RESOURCES[resource_type].relations)
+            unknown = set(fields) - known
+            if unknown:
+                raise ApiError(name, _("Unknown field(s): %(fields)s.") % {'fields': ', '.join(sorted(unknown))})
+            self.fields[resource_type] = fields
+
+        self.include = split(params.get('include', ''))
+        unknown = set(self.include) - set(resource.relations)
+        if unknown:
+            raise ApiError('include', _("Unknown relation(s): %(relations)s.") % {
+                'relations': ', '.join(sorted(unknown))})
+
+    def wanted(self, resource, names):
+        """Return the names asked for a resource, in the order of the resource."""
+        fields = self.fields.get(resource.type)
+        return [name for name in names if fields is None or name in fields]
+
+    def columns(self, resource, prefix=''):
+        """Return the `values()` columns of the attributes and of the to-one relations of a resource."""
+        columns = OrderedDict([(resource.identifier(), prefix + resource.lookup)])
+        for name in self.wanted(resource, resource.attributes):
+            columns[name] = prefix + name
+        for name in self.wanted(resource, resource.relations):
+            relation = resource.relations[name]
+            if not relation.many and not prefix and name not in self.include:
+                columns[name] = '{}__{}'.format(relation.field, relation.resource.lookup)
+        return columns
+
+    @staticmethod
+    def build(resource, columns, row):
+        """Build a serialized object from a row."""
+        return OrderedDict((name, resource.convert(name, row[column])) for name, column in columns.items())
+
+    def serialize(self, queryset):
+        """Return the serialized objects of a queryset."""
+        resource = self.resource
+        columns = self.columns(resource)
+        joined = OrderedDict()
+        for name in self.include:
+            relation = resource.relations[name]
+            if not relation.many:
+                joined[name] = self.columns(relation.resource, prefix='{}__'.format(relation.field))
+
+        values = ['pk'] + list(columns.values())
+        for related in joined.values():
+            values.extend(related.values())
+        rows = list(queryset.values(*values))
+
+        objects = []
+        for row in rows:
+            obj = self.build(resource, columns, row)
+            for name, related in joined.items():
+                obj[name] = self.build(resource.relations[name].resource, related, row)
+            objects.append(obj)
+
+        for name in self.include:
+            relation = resource.relations[name]
+            if relation.many:
+                self.prefetch(relation, name, [row['pk'] for row in rows], objects)
+        return objects
+
+    def prefetch(self, relation, name, pks, objects):
+        """Attach the objects of a to-many relation to the objects of the page with a single query."""
+        related = relation.resource
+        columns = self.columns(related)
+        key = '{}_id'.format(relation.field)
+        children = {pk: [] for pk in pks}
+        for row in related.model.objects.filter(**{'{}__in'.format(key): pks}).values(key, *columns.values()):
+            children[row[key]].append(self.build(related, columns, row))
+        for pk, obj in zip(pks, objects):
+            obj[name] = children[pk]
+
+
+def render(document, queryset, many=True):
+    """Return the JSON body of a list of objects (or of the single object if not `many`) or None if there is none."""
+    objects = document.serialize(queryset)
+    if not many:
+        if not objects:
+            return None
+        objects = objects[0]
+    return json.dumps({'version': API_VERSION, 'data': objects}, cls=DjangoJSONEncoder, separators=(',', ':'))
+
+
+def etag(body):
+    """Return the strong ETag of a body."""
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+def get_response(path, params, build):
+    """Return the body and the ETag of a response, built once for each version of the data.
+
+    The cache key is made of the path and of the sorted parameters so that equivalent URLs share their response, and
+    of the current season, since the time slots of the previous season are not returned once a new season starts.
+    """
+    query = sorted((name, value) for name in params for value in params.getlist(name))
+    digest = hashlib.md5(repr((path, query)).encode('utf-8')).hexdigest()
+    key = RESPONSE_KEY.format(season=current_season(), version=get_version(API), digest=digest)
+
+    def compute():
+        body = build()
+        return (body, etag(body)) if body is not None else None
+
+    # A missing object (None) is not cached
+    return cache.get_or_set(key, compute)
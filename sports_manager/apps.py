@@ -17,4 +17,7 @@ class SportsManagerConfig(AppConfig):
 
     def ready(self):
         """Run when Django starts."""
+        # Connect the signal handlers
+        import sports_manager.signals  # noqa: F401
+
         logger.debug("App {} ready.".format(self.name))
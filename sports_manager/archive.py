@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""Archive of the closed seasons.
+
+The licenses, the medical certificates and the time slots of a closed season are moved to the archive tables
+(`sports_manager.models.archive`) by chunks of `chunk_size` objects, each chunk in its own transaction: the rows are
+copied with `bulk_create` and deleted from the tables read by the views. An interrupted archive loses nothing and
+resumes where it stopped when run again.
+
+The medical certificates which are still valid are left in place, since they still count for the current season;
+archiving the season again once they expired moves them.
+"""
+
+# Standard library
+import logging
+
+# Django
+from django.db import transaction
+from django.utils import timezone
+
+# Current django project
+from sports_manager.models import (
+    ArchivedLicense, ArchivedMedicalCertificate, ArchivedTimeSlot, License, MedicalCertificate, TimeSlot
+)
+
+logger = logging.getLogger(__name__)
+
+Membership = License.teams.through
+ArchivedMembership = ArchivedLicense.teams.through
+
+
+class ArchiveError(Exception):
+    """Raised when a season can not be archived."""
+
+
+def archived_license(license):
+    """Return the archived copy of a license."""
+    return ArchivedLicense(id=license.pk, season_id=license.season_id, player_id=license.player_id,
+                           number=license.number, is_payed=license.is_payed, created=license.created,
+                           modified=license.modified)
+
+
+def archived_certificate(certificate):
+    """Return the archived copy of a medical certificate."""
+    return ArchivedMedicalCertificate(id=certificate.pk, season_id=certificate.season_id,
+                                      player_id=certificate.player_id, file=certificate.file.name,
+                                      validation=certificate.validation, start=certificate.start, end=certificate.end,
+                                      created=certificate.created)
+
+
+def archived_time_slot(time_slot):
+    """Return the archived copy of a time slot."""
+    return ArchivedTimeSlot(id=time_slot.pk, season_id=time_slot.season_id, type=time_slot.type,
+                            team_id=time_slot.team_id, gymnasium_id=time_slot.gymnasium_id, day=time_slot.day,
+                            start=time_slot.start, end=time_slot.end, created=time_slot.created,
+                            modified=time_slot.modified)
+
+
+def move_teams(pks):
+    """Copy the teams of the licenses to their archived copy and unlink them from the licenses."""
+    memberships = Membership.objects.filter(license_id__in=pks)
+    ArchivedMembership.objects.bulk_create([
+        ArchivedMembership(archivedlicense_id=license_id, team_id=team_id)
+        for license_id, team_id in memberships.values_list('license_id', 'team_id')
+    ])
+    memberships.delete()
+
+
+def move(queryset, archive_model, copy, chunk_size, before_delete=None):
+    """Move the objects of the queryset to the archive model by chunks and return how many were moved."""
+    moved = 0
+    queryset = queryset.order_by('pk')
+    while True:
+        with transaction.atomic():
+            # The objects moved by the previous chunk are not in the queryset anymore
+            objects = list(queryset[:chunk_size])
+            if not objects:
+                return moved
+            pks = [obj.pk for obj in objects]
+            archive_model.objects.bulk_create([copy(obj) for obj in objects])
+            if before_delete is not None:
+                before_delete(pks)
+            queryset.model.all_objects.filter(pk__in=pks).delete()
+        moved += len(objects)
+
+
+def archivable(season):
+    """Return the querysets of the licenses, the medical certificates and the time slots to archive for a season."""
+    return {
+        'licenses': License.all_objects.filter(season=season),
+        'certificates': (MedicalCertificate.all_objects
+                         .filter(season=season)
+                         .exclude(pk__in=MedicalCertificate.all_objects.valid().values('pk'))),
+        'time slots': TimeSlot.all_objects.filter(season=season),
+    }
+
+
+def archive_season(season, chunk_size=1000, dry_run=False):
+    """Move the objects of a closed season to the archive tables.
+
+    Return the number of licenses, medical certificates and time slots moved (that would be moved if `dry_run`).
+    """
+    if not season.is_closed:
+        raise ArchiveError("The season {} is not closed".format(season))
+    if season.is_current():
+        raise ArchiveError("The season {} is the current one".format(season))
+
+    querysets = archivable(season)
+    if dry_run:
+        return {name: queryset.count() for name, queryset in querysets.items()}
+
+    result = {
+        'licenses': move(querysets['licenses'], ArchivedLicense, archived_license, chunk_size,
+                         before_delete=move_teams),
+        'certificates': move(querysets['certificates'], ArchivedMedicalCertificate, archived_certificate,
+                             chunk_size),
+        'time slots': move(querysets['time slots'], ArchivedTimeSlot, archived_time_slot, chunk_size),
+    }
+    season.archived = timezone.now()
+    season.save(update_fields=['archived'])
+    logger.info("Season {} archived: {}".format(season, result))
+    return result
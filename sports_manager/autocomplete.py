@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""Autocompletion of the users, players, teams and gymnasiums selected in the forms.
+
+The forms do not list every object of a foreign key in a `<select>`: their widget (see `sports_manager.forms.widgets`)
+only renders the selected object and asks the `autocomplete` view for the objects starting with what is typed. Each
+lookup reads a range of an index instead of scanning the table with `LIKE`:
+
+* `users`: the username (unique index of the user model);
+* `players`: the last name (`sm_player_name_idx`), typed lowercased, capitalized or uppercased;
+* `teams` and `gymnasiums`: the slug (unique index), compared with the slug of what is typed.
+
+At most `autocomplete_limit` objects are returned, ordered by the indexed column.
+"""
+
+# Standard library
+import sys
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+
+# Django
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.utils.text import slugify
+
+# Current django project
+from sports_manager.conf import get_setting
+from sports_manager.models import Gymnasium, Player, Team
+
+LOOKUPS = OrderedDict()
+
+
+def prefix_filter(field, prefix):
+    """Return the condition of the rows whose field starts with the prefix, as a range the index of the field reads.
+
+    The upper bound is the prefix with its last character incremented, every string starting with the prefix is
+    between both bounds.
+    """
+    if ord(prefix[-1]) == sys.maxunicode:
+        return Q(**{field + '__startswith': prefix})
+    return Q(**{field + '__gte': prefix, field + '__lt': prefix[:-1] + chr(ord(prefix[-1]) + 1)})
+
+
+def register(lookup):
+    """Register a lookup under its name."""
+    LOOKUPS[lookup.name] = lookup
+    return lookup
+
+
+class Lookup:
+    """Objects of a model whose indexed field starts with a text."""
+
+    name = None
+    model = None
+    field = None
+
+    @classmethod
+    def get_queryset(cls):
+        """Return the objects that can be selected."""
+        return cls.model._default_manager.all()
+
+    @classmethod
+    def prefixes(cls, text):
+        """Return the prefixes of the indexed field matching the text."""
+        return [text]
+
+    @classmethod
+    def filter(cls, queryset, text):
+        """Return the objects of the queryset matching the text, ordered by the indexed field."""
+        prefixes = [prefix for prefix in OrderedDict.fromkeys(cls.prefixes(text.strip())) if prefix]
+        if not prefixes:
+            return queryset.none()
+        return queryset.filter(reduce(or_, (prefix_filter(cls.field, prefix) for prefix in prefixes)))
+
+    @classmethod
+    def label(cls, obj):
+        """Return the text shown for an object."""
+        return str(obj)
+
+    @classmethod
+    def search(cls, text, limit=None):
+        """Return the `(pk, label)` of the first objects matching the text."""
+        limit = limit or get_setting('autocomplete_limit')
+        queryset = cls.filter(cls.get_queryset(), text).order_by(cls.field, 'pk')
+        return [(obj.pk, cls.label(obj)) for obj in queryset[:limit]]
+
+
+@register
+class UserLookup(Lookup):
+    """Users (owners of the players, trainers of the teams) by username."""
+
+    name = 'users'
+    model = get_user_model()
+    field = 'username'
+
+    @classmethod
+    def get_queryset(cls):
+        """Only read the names."""
+        return super().get_queryset().only('pk', 'username', 'first_name', 'last_name')
+
+    @classmethod
+    def label(cls, obj):
+        """Return the username and the full name of the user."""
+        full_name = obj.get_full_name()
+        return "{} ({})".format(obj.username, full_name) if full_name else obj.username
+
+
+@register
+class PlayerLookup(Lookup):
+    """Players by last name."""
+
+    name = 'players'
+    model = Player
+    field = 'last_name'
+
+    @classmethod
+    def get_queryset(cls):
+        """Only read the names."""
+        return super().get_queryset().only('pk', 'first_name', 'last_name')
+
+    @classmethod
+    def prefixes(cls, text):
+        """Return the text as typed, lowercased, capitalized and uppercased."""
+        # The names are stored as typed, mostly capitalized
+        return [text, text.lower(), text.capitalize(), text.upper()]
+
+
+@register
+class TeamLookup(Lookup):
+    """Teams by slug."""
+
+    name = 'teams'
+    model = Team
+    field = 'slug'
+
+    @classmethod
+    def get_queryset(cls):
+        """Only read the names."""
+        return super().get_queryset().only('pk', 'name')
+
+    @classmethod
+    def prefixes(cls, text):
+        """Return the slug of the text."""
+        return [slugify(text)]
+
+
+@register
+class GymnasiumLookup(TeamLookup):
+    """Gymnasiums by slug."""
+
+    name = 'gymnasiums'
+    model = Gymnasium
+
+
+def autocomplete(name, text, limit=None):
+    """Return the `(pk, label)` of the first objects of the lookup `name` matching the text."""
+    return LOOKUPS[name].search(text, limit) if text.strip() else []
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Helpers to insert many rows at once."""
+
+# Django
+from django.db import connections, router, transaction
+from django.db.models import AutoField
+from django.db.transaction import TransactionManagementError
+
+
+def bulk_create_with_pks(model, objs, batch_size=None):
+    """Insert the objects with `bulk_create` and make sure their primary key is set.
+
+    Only the backends that can return the IDs of a bulk insert (PostgreSQL) set the primary keys of the created
+    objects. On SQLite, the first insert takes the write lock of the database until the end of the transaction: no
+    other connection can insert rows meanwhile and the objects are the last rows of the table, fetched back in
+    insertion order. The other backends insert the objects one by one, as `save()` does but without the signals.
+
+    Must be called inside a transaction.
+    """
+    if not objs:
+        return objs
+
+    using = router.db_for_write(model)
+    connection = connections[using]
+    if connection.features.can_return_ids_from_bulk_insert:
+        return model._default_manager.using(using).bulk_create(objs, batch_size=batch_size)
+
+    if not transaction.get_connection(using).in_atomic_block:
+        raise TransactionManagementError("bulk_create_with_pks() must run in a transaction")
+    manager = model._base_manager.using(using)
+    if connection.vendor == 'sqlite':
+        manager.bulk_create(objs, batch_size=batch_size)
+        pks = list(manager.order_by('-pk').values_list('pk', flat=True)[:len(objs)])[::-1]
+        for obj, pk in zip(objs, pks):
+            obj.pk = pk
+    else:
+        fields = [field for field in model._meta.concrete_fields if not isinstance(field, AutoField)]
+        for obj in objs:
+            obj.pk = manager._insert([obj], fields=fields, return_id=True)
+            obj._state.adding = False
+            obj._state.db = using
+    return objs
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Versions of the cached fragments.
+
+Each team has a version counter stored in the cache. The fragments rendered for a team are cached under a key made of
+its slug and its version, so bumping the version is enough to invalidate all of them. The weekly schedule and the
+responses of the JSON API have their own counters. The counters are bumped by the signal handlers of
+`sports_manager.signals` when an object displayed with the team, in the schedule or by the API changes.
+
+Bumping a counter also records the date of the change, so that the responses depending on it can send a
+Last-Modified header that moves forward when an object is deleted.
+"""
+
+# Standard library
+import time
+
+# Django
+from django.core.cache import cache
+from django.utils import timezone
+
+VERSION_KEY = 'sports_manager:{name}:version'
+MODIFIED_KEY = 'sports_manager:{name}:modified'
+SCHEDULE = 'schedule'
+API = 'api'
+
+
+def _initial_version():
+    """Return a version that has never been used, even if a counter has been evicted from the cache."""
+    return int(time.time() * 1000)
+
+
+def get_version(name):
+    """Return the current version of a counter."""
+    key = VERSION_KEY.format(name=name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_last_modified(name):
+    """Return the date of the last change of a counter.
+
+    A date evicted from the cache is replaced by the current date, it may only move forward.
+    """
+    key = MODIFIED_KEY.format(name=name)
+    modified = cache.get(key)
+    if modified is None:
+        cache.add(key, timezone.now(), timeout=None)
+        modified = cache.get(key)
+    return modified
+
+
+def bump_versions(names):
+    """Increment the counters to invalidate the fragments depending on them and record the date of the change."""
+    names = set(names)
+    for name in names:
+        key = VERSION_KEY.format(name=name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), timeout=None)
+    now = timezone.now()
+    cache.set_many({MODIFIED_KEY.format(name=name): now for name in names}, timeout=None)
+
+
+def team_counter(slug):
+    """Return the name of the counter of a team."""
+    return 'team:{}'.format(slug)
+
+
+def get_team_version(slug):
+    """Return the current version of the fragments of a team."""
+    return get_version(team_counter(slug))
+
+
+def bump_team_versions(slugs):
+    """Invalidate the fragments of the teams."""
+    bump_versions(team_counter(slug) for slug in slugs)
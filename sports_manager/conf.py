@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Settings of the application.
+
+The settings are read from the `SPORTS_MANAGER` dictionary of the Django settings and fall back to the defaults
+below.
+"""
+
+# Django
+from django.conf import settings
+
+DEFAULTS = {
+    # Number of seconds the rendered fragments stay in the cache (None: until their version changes)
+    'cache_timeout': None,
+    # Widths (in pixels) of the responsive variants of the images
+    'image_widths': (320, 640, 1280),
+    # Formats of the variants, from the preferred one to the fallback supported by every browser
+    'image_formats': ('webp', 'jpeg'),
+    'image_quality': 80,
+    # Directory of the partial files of the chunked uploads (None: `sports_manager_uploads` in the temporary directory)
+    'upload_directory': None,
+    # Maximal size (in bytes) of a chunk and of a whole medical certificate
+    'upload_max_chunk_size': 5 * 1024 * 1024,
+    'upload_max_size': 20 * 1024 * 1024,
+    # Number of hours after which an interrupted upload is deleted
+    'upload_expiration': 24,
+    # Number of days before the end of a medical certificate when its owner is reminded to renew it
+    'certificate_expiry_window': 30,
+    # Number of seconds the statistics of the committee dashboard stay in the cache
+    'stats_timeout': 300,
+    # Backend of the search: 'fts5' (SQLite FTS5), 'trigram' or 'auto' (FTS5 if available)
+    'search_backend': 'auto',
+    # Maximal number of search results
+    'search_limit': 20,
+    # Maximal number of objects proposed by the autocompletion of the forms
+    'autocomplete_limit': 10,
+    # Minimal similarity (between 0 and 1) of the names of two players of the same birthday reported as duplicates
+    'duplicate_threshold': 0.8,
+}
+
+
+def get_setting(name):
+    """Return the value of a setting of the application."""
+    return getattr(settings, 'SPORTS_MANAGER', {}).get(name, DEFAULTS[name])
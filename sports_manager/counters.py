@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Denormalized counters of the teams.
+
+Every team stores the number of licenses of the current season linked to it (`player_count`), how many of them are
+payed (`payed_player_count`) and how many belong to a player having a valid medical certificate
+(`certified_player_count`). The signal handlers of `sports_manager.signals` keep them up to date:
+
+* adding or removing teams of a license, saving a license and saving a medical certificate increment or decrement
+  the counters of the teams concerned with `F()` expressions;
+* deleting a license or a medical certificate computes the counters of the teams concerned again. The cascading
+  deletions of a player send the signals of its licenses and certificates in no particular order, which increments
+  could not cope with.
+
+The counters drift when the data changes without sending signals (`QuerySet.update()`, `bulk_create()`), when a
+medical certificate expires and when a new season starts: the `reconcile_team_counters` command, meant to be run
+daily, computes all of them again and reports the drift.
+"""
+
+# Standard library
+import logging
+from collections import defaultdict
+
+# Django
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# Current django project
+from sports_manager.models import License, MedicalCertificate, Team
+from sports_manager.models.season import current_season
+
+logger = logging.getLogger(__name__)
+
+Membership = License.teams.through
+
+
+def season_filter(prefix='license__'):
+    """Return the condition selecting the licenses of the current season."""
+    return Q(**{prefix + 'season__year': current_season()})
+
+
+def certified_players():
+    """Return the queryset of the primary keys of the players having a valid medical certificate."""
+    return MedicalCertificate.all_objects.valid().values('player_id')
+
+
+def contributions(**filters):
+    """Return what the memberships matching the filters add to the counters of their team.
+
+    The result maps the primary key of each team to its `[players, payed players, certified players]`.
+    """
+    rows = list(Membership.objects
+                .filter(season_filter(), **filters)
+                .values_list('team_id', 'license__is_payed', 'license__player_id'))
+    certified = set(certified_players().filter(player_id__in={row[2] for row in rows})
+                    .values_list('player_id', flat=True))
+
+    result = defaultdict(lambda: [0, 0, 0])
+    for team_id, is_payed, player_id in rows:
+        counters = result[team_id]
+        counters[0] += 1
+        counters[1] += int(is_payed)
+        counters[2] += int(player_id in certified)
+    return dict(result)
+
+
+def apply(deltas, sign=1):
+    """Add the deltas (see `contributions`) to the counters of the teams, with one UPDATE for each distinct value."""
+    updates = defaultdict(list)
+    for team_id, values in deltas.items():
+        for name, value in zip(Team.COUNTERS, values):
+            if value:
+                updates[name, sign * value].append(team_id)
+
+    with transaction.atomic():
+        for (name, value), team_ids in sorted(updates.items()):
+            Team.objects.filter(pk__in=team_ids).update(**{name: F(name) + value})
+
+
+def difference(before, after):
+    """Return the deltas turning the contributions `before` into the contributions `after`."""
+    return {team_id: [a - b for a, b in zip(after.get(team_id, (0, 0, 0)), before.get(team_id, (0, 0, 0)))]
+            for team_id in set(before) | set(after)}
+
+
+def certification(player_ids):
+    """Return whether each player has a valid medical certificate."""
+    certified = set(certified_players().filter(player_id__in=player_ids).values_list('player_id', flat=True))
+    return {player_id: player_id in certified for player_id in player_ids}
+
+
+def update_certified(before):
+    """Update the counters of the teams of the players whose certification changed since `before`.
+
+    `before` is the result of `certification` for the players before the change.
+    """
+    after = certification(before)
+    changes = [player_id for player_id in before if before[player_id] != after[player_id]]
+    if not changes:
+        return
+
+    deltas = defaultdict(lambda: [0, 0, 0])
+    memberships = (Membership.objects
+                   .filter(season_filter(), license__player_id__in=changes)
+                   .values_list('team_id', 'license__player_id'))
+    for team_id, player_id in memberships:
+        deltas[team_id][2] += 1 if after[player_id] else -1
+    apply(deltas)
+
+
+def teams_of_players(player_ids):
+    """Return the primary keys of the teams of the licenses of the players during the current season."""
+    return set(Membership.objects
+               .filter(season_filter(), license__player_id__in=player_ids)
+               .values_list('team_id', flat=True))
+
+
+def expected_counters():
+    """Return the subqueries computing the counters of the team of the outer query."""
+    memberships = Membership.objects.filter(season_filter(), team_id=OuterRef('pk'))
+    conditions = {
+        'player_count': Q(),
+        'payed_player_count': Q(license__is_payed=True),
+        'certified_player_count': Q(license__player_id__in=certified_players()),
+    }
+    return {
+        name: Coalesce(Subquery(memberships.filter(condition)
+                                .order_by()
+                                .values('team_id')
+                                .annotate(count=Count('pk'))
+                                .values('count'),
+                                output_field=IntegerField()),
+                       Value(0))
+        for name, condition in conditions.items()
+    }
+
+
+def recompute(team_ids=None):
+    """Compute the counters of the teams (every team if None) again with a single UPDATE."""
+    queryset = Team.objects.all()
+    if team_ids is not None:
+        if not team_ids:
+            return
+        queryset = queryset.filter(pk__in=team_ids)
+    queryset.update(**expected_counters())
+
+
+def drift():
+    """Return the teams whose counters differ from the data as `(slug, name of the counter, stored, expected)`."""
+    expected = {'expected_{}'.format(name): value for name, value in expected_counters().items()}
+    rows = Team.objects.annotate(**expected).order_by('slug').values('slug', *Team.COUNTERS, *expected)
+
+    result = []
+    for row in rows:
+        for name in Team.COUNTERS:
+            if row[name] != row['expected_{}'.format(name)]:
+                result.append((row['slug'], name, row[name], row['expected_{}'.format(name)]))
+    return result
+
+
+def reconcile(dry_run=False):
+    """Report the counters which drifted and compute all of them again unless `dry_run`."""
+    with transaction.atomic():
+        drifted = drift()
+        if drifted and not dry_run:
+            recompute()
+    for slug, name, stored, expected in drifted:
+        logger.warning("Counter {} of the team {} drifted: {} instead of {}".format(name, slug, stored, expected))
+    return drifted
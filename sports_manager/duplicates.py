@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""Detection and merge of the players registered twice.
+
+The same child is sometimes registered by both of its parents, or again with a typo in its name. Comparing every
+player with every other one does not scale, so the players are grouped in blocks sharing a key and only the players of
+a same block are compared. Each player is put in three blocks, so that a typo in one of its names does not hide it:
+
+* its normalized last name (accents, case, spaces and punctuation removed) and its birthday;
+* the phonetic key of its last name and its birthday, for the typos sounding the same (`Dupont` and `Dupond`);
+* its normalized first name and its birthday, for the other typos of the last name.
+
+Two players of a block are duplicates when the similarity of their names (see `similarity`) reaches the
+`duplicate_threshold` setting. The players are read with a single query and each block is small, the detection is
+linear with the number of players.
+
+Merging the duplicates of a player moves their licenses, medical certificates (archived ones included) and emergency
+contacts to the player with an UPDATE per table, then deletes them.
+"""
+
+# Standard library
+import logging
+import re
+from collections import defaultdict, namedtuple
+from difflib import SequenceMatcher
+from itertools import combinations
+
+# Django
+from django.db import transaction
+
+# Current django project
+from sports_manager import counters, search
+from sports_manager.conf import get_setting
+from sports_manager.models import ArchivedLicense, ArchivedMedicalCertificate, License, MedicalCertificate, Player
+from sports_manager.models.player import EmergencyContact
+from sports_manager.search import fold
+
+logger = logging.getLogger(__name__)
+
+Duplicate = namedtuple('Duplicate', ['score', 'player', 'other'])
+
+# Rewritings of the phonetic key, in order
+PHONETIC_RULES = [
+    (re.compile(pattern), replacement)
+    for pattern, replacement in (
+        (r'ph', 'f'),
+        (r'(qu|ck|q)', 'k'),
+        (r'c(?=[eiy])', 's'),
+        (r'c', 'k'),
+        (r'g(?=[eiy])', 'j'),
+        (r'(?<=[aeiouy])s(?=[aeiouy])', 'z'),
+        (r'h', ''),
+        (r'e?au', 'o'),
+        (r'(ai|ei)', 'e'),
+        (r'y', 'i'),
+        (r'w', 'v'),
+        (r'(\w)\1+', r'\1'),
+        # Silent endings
+        (r'(?<=\w)[dtsxe]+$', ''),
+    )
+]
+
+# Models moved to the player kept by a merge
+MERGED_MODELS = (
+    License.all_objects,
+    MedicalCertificate.all_objects,
+    EmergencyContact.objects,
+    ArchivedLicense.objects,
+    ArchivedMedicalCertificate.objects,
+)
+
+
+def normalize(name):
+    """Return the name without accents, case, spaces nor punctuation."""
+    return ''.join(char for char in fold(name) if char.isalpha())
+
+
+def phonetic(name):
+    """Return a phonetic key of a (French) name, shared by the names sounding the same."""
+    key = normalize(name)
+    for pattern, replacement in PHONETIC_RULES:
+        key = pattern.sub(replacement, key)
+    return key
+
+
+def similarity(name, other):
+    """Return the similarity of two names between 0 and 1.
+
+    The names normalized the same are identical, the names with the same phonetic key are almost identical, the
+    similarity of the others is the one of their letters.
+    """
+    name, other = normalize(name), normalize(other)
+    if name == other:
+        return 1.0
+    if phonetic(name) == phonetic(other):
+        return 0.9
+    return SequenceMatcher(None, name, other).ratio()
+
+
+def score(player, other):
+    """Return the similarity of the names of two players."""
+    return (similarity(player['first_name'], other['first_name']) +
+            similarity(player['last_name'], other['last_name'])) / 2
+
+
+def blocking_keys(player):
+    """Return the keys of the blocks of a player."""
+    return [
+        ('last_name', normalize(player['last_name']), player['birthday']),
+        ('phonetic', phonetic(player['last_name']), player['birthday']),
+        ('first_name', normalize(player['first_name']), player['birthday']),
+    ]
+
+
+def find_duplicates(queryset=None, threshold=None):
+    """Return the pairs of players that look like duplicates, the most similar first.
+
+    The players are dictionaries of their `pk`, `first_name`, `last_name`, `birthday`, `created` and
+    `owner__username`, the oldest player of a pair first.
+    """
+    if queryset is None:
+        queryset = Player.objects.all()
+    threshold = get_setting('duplicate_threshold') if threshold is None else threshold
+
+    blocks = defaultdict(list)
+    for player in (queryset
+                   .order_by('created', 'pk')
+                   .values('pk', 'first_name', 'last_name', 'birthday', 'created', 'owner__username')
+                   .iterator()):
+        for key in blocking_keys(player):
+            blocks[key].append(player)
+
+    result = {}
+    for players in blocks.values():
+        for player, other in combinations(players, 2):
+            if (player['pk'], other['pk']) not in result:
+                value = score(player, other)
+                if value >= threshold:
+                    result[(player['pk'], other['pk'])] = Duplicate(round(value, 2), player, other)
+    return sorted(result.values(), key=lambda duplicate: (-duplicate.score, duplicate.player['last_name'],
+                                                          duplicate.player['first_name'], duplicate.player['pk']))
+
+
+def merge(player, duplicates):
+    """Move the licenses, certificates and emergency contacts of the duplicates to the player and delete them.
+
+    Returns the number of objects moved.
+    """
+    pks = {duplicate.pk for duplicate in duplicates} - {player.pk}
+    if not pks:
+        return 0
+
+    with transaction.atomic():
+        # The teams whose counters change, the licenses of the player count its moved certificates
+        team_ids = set(License.teams.through.objects
+                       .filter(license__player_id__in=pks | {player.pk})
+                       .values_list('team_id', flat=True))
+        moved = sum(manager.filter(player_id__in=pks).update(player=player) for manager in MERGED_MODELS)
+        # Nothing is left to cascade, the signals remove the search documents of the duplicates
+        for duplicate in Player.objects.filter(pk__in=pks):
+            duplicate.delete()
+        # The updates do not send the signals updating the counters and the search documents
+        counters.recompute(team_ids)
+        search.update_players([player.pk])
+
+    logger.info("Player {} merged with {}: {} object(s) moved".format(player.pk, sorted(pks), moved))
+    return moved
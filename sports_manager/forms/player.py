@@ -7,9 +7,14 @@ from datetime import date, timedelta
 
 # Django
 from django.core.exceptions import ValidationError
-from django.forms import CheckboxSelectMultiple, DateInput, Form, ModelChoiceField, ModelForm, ModelMultipleChoiceField
+from django.forms import (
+    CheckboxSelectMultiple, DateInput, FileField, Form, ModelChoiceField, ModelForm, ModelMultipleChoiceField,
+    MultipleHiddenInput
+)
+from django.utils.translation import ugettext_lazy as _
 
 # Current django project
+from sports_manager.forms.widgets import AutocompleteSelect
 from sports_manager.models.player import MedicalCertificate, EmergencyContact, Player
 
 logger = logging.getLogger(__name__)
@@ -30,6 +35,24 @@ class PlayerCreationForm(ModelForm):
         ]
 
 
+class PlayerUpdateForm(ModelForm):
+    """Update of a player, its owner is completed instead of listing every user."""
+
+    class Meta:
+        model = Player
+        widgets = {
+            "owner": AutocompleteSelect('users'),
+            "birthday": DateInput(attrs={'class': 'form-control', 'placeholder': 'YYYY-MM-DD'})
+        }
+        fields = [
+            'owner',
+            'first_name',
+            'last_name',
+            'birthday',
+            'sex'
+        ]
+
+
 class EmergencyContactForm(ModelForm):
     
     class Meta:
@@ -49,3 +72,34 @@ class MedicalCertificateForm(ModelForm):
         fields = [
             'file',
         ]
+
+
+class RosterImportForm(Form):
+    """Upload of a roster of players to import."""
+
+    file = FileField(label=_("file"), help_text=_("CSV or XLSX file"))
+
+    def clean_file(self):
+        """Check the extension of the file."""
+        f = self.cleaned_data['file']
+        if not f.name.lower().endswith(('.csv', '.xlsx')):
+            raise ValidationError(_("Only CSV and XLSX files can be imported."))
+        return f
+
+
+class PlayerMergeForm(Form):
+    """Merge of duplicates into the player kept (see `sports_manager.duplicates`)."""
+
+    player = ModelChoiceField(label=_("player kept"),
+                              queryset=Player.objects.all(),
+                              widget=AutocompleteSelect('players'))
+    duplicates = ModelMultipleChoiceField(label=_("duplicates"),
+                                          queryset=Player.objects.all(),
+                                          widget=MultipleHiddenInput)
+
+    def clean(self):
+        """Check that the player is not one of its duplicates."""
+        cleaned_data = super().clean()
+        if cleaned_data.get('player') in cleaned_data.get('duplicates', ()):
+            raise ValidationError(_("A player cannot be merged with itself."))
+        return cleaned_data
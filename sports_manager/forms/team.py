@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Team forms."""
+
+# Django
+from django.forms import ModelForm
+
+# Current django project
+from sports_manager.forms.widgets import AutocompleteSelect
+from sports_manager.models import Team
+
+
+class TeamForm(ModelForm):
+    """Creation and update of a team, its trainer is completed instead of listing every user."""
+
+    class Meta:
+        model = Team
+        widgets = {
+            "trainer": AutocompleteSelect('users'),
+        }
+        fields = [
+            'name',
+            'category',
+            'level',
+            'sex',
+            'trainer',
+            'recrutment',
+            'url',
+            'description',
+            'img',
+        ]
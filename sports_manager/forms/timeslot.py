@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""Time slot forms."""
+
+# Django
+from django.forms import ModelForm
+
+# Current django project
+from sports_manager.forms.widgets import AutocompleteSelect
+from sports_manager.models import TimeSlot
+
+
+class TimeSlotForm(ModelForm):
+    """Creation and update of a time slot, its team and its gymnasium are completed instead of listed."""
+
+    class Meta:
+        model = TimeSlot
+        widgets = {
+            "team": AutocompleteSelect('teams'),
+            "gymnasium": AutocompleteSelect('gymnasiums'),
+        }
+        fields = [
+            'type',
+            'team',
+            'gymnasium',
+            'day',
+            'start',
+            'end',
+        ]
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""Form widgets."""
+
+# Django
+from django.contrib.admin.widgets import AutocompleteMixin
+from django.forms import Select
+from django.urls import reverse
+
+
+class AutocompleteSelect(AutocompleteMixin, Select):
+    """Select of a foreign key completed by the `autocomplete` view (see `sports_manager.autocomplete`).
+
+    Only the selected object is rendered, with a single query, and the options are fetched while typing by the
+    select2 scripts of the admin.
+    """
+
+    def __init__(self, lookup, attrs=None, choices=()):
+        """Use the lookup `lookup` of `sports_manager.autocomplete` instead of an admin site."""
+        self.lookup = lookup
+        self.db = None
+        self.choices = choices
+        self.attrs = {} if attrs is None else attrs.copy()
+
+    def get_url(self):
+        """Return the URL of the lookup."""
+        return reverse('sports-manager:autocomplete', kwargs={'lookup': self.lookup})
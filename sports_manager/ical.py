@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""iCalendar feeds of the time slots.
+
+Every time slot becomes a weekly recurring event starting the first matching day of the current season and ending
+with it. The times are local times of the `TIME_ZONE` setting, described by a VTIMEZONE component listing the offset
+changes of the season, so that the events keep their local time across the daylight saving time changes. The events
+are serialized once and cached under a key made of the primary key of the slot and a hash of everything they display
+(modification date of the slot, names of its team and its gymnasium...). A feed is then assembled from the cached
+events, serializing only the ones that changed, and cached itself under its ETag, so that the clients polling a feed
+that did not change only cost one light query.
+"""
+
+# Standard library
+import hashlib
+from datetime import datetime, timedelta
+
+# Django
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.utils import timezone
+
+# Current django project
+from sports_manager.models import TimeSlot
+from sports_manager.models.season import SEASON_START_MONTH, current_season
+
+EVENT_KEY = 'sports_manager:ical:event:{pk}:{digest}'
+FEED_KEY = 'sports_manager:ical:feed:{etag}'
+PLAYER_TOKEN_SALT = 'sports_manager.ical.player'
+BYDAY = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+LINE_LENGTH = 75
+# Local date and time
+DATETIME = '%Y%m%dT%H%M%S'
+# UTC date and time
+UTC_DATETIME = '%Y%m%dT%H%M%SZ'
+
+
+def escape(text):
+    """Escape a TEXT value."""
+    return (str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def fold(line):
+    """Split a content line in lines of at most 75 octets."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= LINE_LENGTH:
+        return line
+
+    lines = []
+    current = ''
+    size = 0
+    limit = LINE_LENGTH
+    for char in line:
+        char_size = len(char.encode('utf-8'))
+        if size + char_size > limit:
+            lines.append(current)
+            # The continuation lines start with a space
+            current, size, limit = '', 0, LINE_LENGTH - 1
+        current += char
+        size += char_size
+    lines.append(current)
+    return '\r\n '.join(lines)
+
+
+def first_occurrence(day, season):
+    """Return the first date of the season falling on `day` (0 is monday)."""
+    start = datetime(season, SEASON_START_MONTH, 1).date()
+    return start + timedelta(days=(day - start.weekday()) % 7)
+
+
+def season_end(season):
+    """Return the end of the season, as an aware datetime."""
+    return timezone.make_aware(datetime(season + 1, SEASON_START_MONTH, 1), timezone.get_default_timezone())
+
+
+def format_offset(offset):
+    """Return a UTC offset as `+HHMM`."""
+    minutes = int(offset.total_seconds()) // 60
+    return '{}{:02d}{:02d}'.format('-' if minutes < 0 else '+', abs(minutes) // 60, abs(minutes) % 60)
+
+
+def offset_changes(tz, start, end):
+    """Yield the UTC datetimes between `start` and `end` when the offset of `tz` changes.
+
+    The offset is compared from day to day, then quarter of hour by quarter of hour during the days it changes.
+    """
+    day, quarter = timedelta(days=1), timedelta(minutes=15)
+    current = start
+    while current < end:
+        following = min(current + day, end)
+        if current.astimezone(tz).utcoffset() != following.astimezone(tz).utcoffset():
+            while current.astimezone(tz).utcoffset() == (current + quarter).astimezone(tz).utcoffset():
+                current += quarter
+            yield current + quarter
+        current = following
+
+
+def serialize_timezone(season):
+    """Return the VTIMEZONE of the `TIME_ZONE` setting during the season."""
+    tz = timezone.get_default_timezone()
+    start = timezone.make_aware(datetime(season, SEASON_START_MONTH, 1), tz).astimezone(timezone.utc)
+    end = season_end(season).astimezone(timezone.utc)
+
+    lines = ['BEGIN:VTIMEZONE', 'TZID:{}'.format(settings.TIME_ZONE)]
+    # The offset at the start of the season, then its changes
+    previous = start.astimezone(tz).utcoffset()
+    for change in [start] + list(offset_changes(tz, start, end)):
+        local = change.astimezone(tz)
+        component = 'DAYLIGHT' if local.dst() else 'STANDARD'
+        lines.extend([
+            'BEGIN:{}'.format(component),
+            # Local time before the change
+            'DTSTART:{}'.format((change + previous).strftime(DATETIME)),
+            'TZOFFSETFROM:{}'.format(format_offset(previous)),
+            'TZOFFSETTO:{}'.format(format_offset(local.utcoffset())),
+            'TZNAME:{}'.format(escape(local.tzname())),
+            'END:{}'.format(component),
+        ])
+        previous = local.utcoffset()
+    lines.append('END:VTIMEZONE')
+    return '\r\n'.join(lines)
+
+
+def serialize_event(time_slot, season):
+    """Return the VEVENT of a time slot fetched with its team and its gymnasium."""
+    date = first_occurrence(time_slot.day, season)
+    # The end of a rule of local times is a UTC time
+    until = season_end(season).astimezone(timezone.utc)
+    gymnasium = time_slot.gymnasium
+    lines = [
+        'BEGIN:VEVENT',
+        'UID:timeslot-{}@sports-manager'.format(time_slot.pk),
+        'DTSTAMP:{}'.format(timezone.localtime(time_slot.modified, timezone.utc).strftime(UTC_DATETIME)),
+        'DTSTART;TZID={}:{}'.format(settings.TIME_ZONE, datetime.combine(date, time_slot.start).strftime(DATETIME)),
+        'DTEND;TZID={}:{}'.format(settings.TIME_ZONE, datetime.combine(date, time_slot.end).strftime(DATETIME)),
+        'RRULE:FREQ=WEEKLY;BYDAY={};UNTIL={}'.format(BYDAY[time_slot.day], until.strftime(UTC_DATETIME)),
+        'SUMMARY:{}'.format(escape('{} - {}'.format(time_slot.team.name, time_slot.get_type_display()))),
+        'LOCATION:{}'.format(escape('{}, {}, {} {}'.format(gymnasium.name, gymnasium.address, gymnasium.zip_code,
+                                                           gymnasium.city))),
+        'END:VEVENT',
+    ]
+    return '\r\n'.join(fold(line) for line in lines)
+
+
+class CalendarFeed:
+    """Feed of the time slots of a TimeSlot queryset."""
+
+    # Values that change the serialization of an event when they change
+    fields = ('modified', 'team__name', 'gymnasium__name', 'gymnasium__address', 'gymnasium__zip_code',
+              'gymnasium__city')
+
+    def __init__(self, name, queryset):
+        """Compute the cache keys of the events with a single query."""
+        self.name = name
+        self.season = current_season()
+        self.keys = [(row[0], self.event_key(row)) for row in queryset.order_by('pk').values_list('pk', *self.fields)]
+        self.etag = hashlib.md5('\n'.join([name] + [key for _, key in self.keys]).encode('utf-8')).hexdigest()
+
+    def event_key(self, row):
+        """Return the cache key of the event of a row of `fields`."""
+        digest = hashlib.md5(repr((self.season,) + row[1:]).encode('utf-8')).hexdigest()
+        return EVENT_KEY.format(pk=row[0], digest=digest)
+
+    def events(self):
+        """Return the serialized events, serializing only the ones that are not cached."""
+        events = cache.get_many([key for _, key in self.keys])
+        missing = {pk: key for pk, key in self.keys if key not in events}
+        if missing:
+            time_slots = TimeSlot.objects.filter(pk__in=missing).select_related('team', 'gymnasium')
+            serialized = {missing[time_slot.pk]: serialize_event(time_slot, self.season) for time_slot in time_slots}
+            cache.set_many(serialized)
+            events.update(serialized)
+        return [events[key] for _, key in self.keys if key in events]
+
+    def build(self):
+        """Serialize the whole calendar."""
+        lines = [
+            'BEGIN:VCALENDAR',
+            'VERSION:2.0',
+            'PRODID:-//dj-sports-manager//EN',
+            'CALSCALE:GREGORIAN',
+            fold('X-WR-CALNAME:{}'.format(escape(self.name))),
+            'X-WR-TIMEZONE:{}'.format(settings.TIME_ZONE),
+            serialize_timezone(self.season),
+        ]
+        lines.extend(self.events())
+        lines.append('END:VCALENDAR')
+        return '\r\n'.join(lines) + '\r\n'
+
+    def serialize(self):
+        """Return the calendar, built once for each ETag."""
+        return cache.get_or_set(FEED_KEY.format(etag=self.etag), self.build)
+
+
+def player_token(player):
+    """Return the token giving access to the calendar of a player."""
+    return signing.dumps(player.pk, salt=PLAYER_TOKEN_SALT)
+
+
+def player_from_token(token):
+    """Return the primary key of the player of a token or raise `signing.BadSignature`."""
+    return signing.loads(token, salt=PLAYER_TOKEN_SALT)
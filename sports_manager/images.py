@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Responsive variants of the uploaded images.
+
+Every image is resized to the widths of the `image_widths` setting (never upscaled) and encoded in each format of the
+`image_formats` setting. The variants are stored next to the original (the storage of the images inserts the hash of
+the content in every name)::
+
+    teams/<slug>/team.<hash>.jpg
+    teams/<slug>/team.<hash>.320w.<hash>.webp
+    teams/<slug>/team.<hash>.320w.<hash>.jpeg
+    ...
+
+The functions of this module only depend on the storage, so that they can run in the workers of a process pool.
+"""
+
+# Standard library
+import io
+import logging
+import os
+
+# Third-party
+from PIL import Image, ImageOps
+
+# Django
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+RESAMPLE = getattr(Image, 'Resampling', Image).LANCZOS
+PIL_FORMATS = {
+    'jpeg': 'JPEG',
+    'webp': 'WEBP',
+}
+CONTENT_TYPES = {
+    'jpeg': 'image/jpeg',
+    'webp': 'image/webp',
+}
+
+
+def variant_name(name, width, fmt):
+    """Return the name of the variant of an image."""
+    return '{}.{}w.{}'.format(os.path.splitext(name)[0], width, fmt)
+
+
+def _convert(image, fmt):
+    """Convert an image to a mode the format can encode, flattening the transparency on white for JPEG."""
+    if fmt == 'jpeg' and image.mode != 'RGB':
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        return background
+    if image.mode not in ('RGB', 'RGBA'):
+        return image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    return image
+
+
+def render_variants(storage, name, widths, formats, quality):
+    """Create the variants of an image and return their description.
+
+    An image narrower than every width only gets a variant at its own width.
+    """
+    with storage.open(name) as f:
+        image = Image.open(f)
+        image.load()
+    image = ImageOps.exif_transpose(image)
+
+    variants = []
+    for width in sorted(w for w in widths if w < image.width) or [image.width]:
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), RESAMPLE)
+        for fmt in formats:
+            buffer = io.BytesIO()
+            _convert(resized, fmt).save(buffer, PIL_FORMATS[fmt], quality=quality)
+            path = variant_name(name, width, fmt)
+            if storage.exists(path):
+                storage.delete(path)
+            path = storage.save(path, ContentFile(buffer.getvalue()))
+            variants.append({'name': path, 'width': width, 'height': height, 'format': fmt})
+
+    logger.info("{} variant(s) of {} generated".format(len(variants), name))
+    return variants
+
+
+def delete_variants(storage, variants, keep=()):
+    """Delete the files of the variants whose name is not in `keep`."""
+    for variant in variants:
+        if variant['name'] not in keep and storage.exists(variant['name']):
+            storage.delete(variant['name'])
+
+
+def regenerate(storage, name, previous, widths, formats, quality):
+    """Create the variants of an image and delete the previous ones that are not used anymore.
+
+    Return the description of the variants or None if the image can not be read.
+    """
+    try:
+        variants = render_variants(storage, name, widths, formats, quality)
+    except (IOError, OSError, ValueError):
+        logger.exception("Can not generate the variants of {}".format(name))
+        return None
+
+    delete_variants(storage, previous, keep={variant['name'] for variant in variants})
+    return variants
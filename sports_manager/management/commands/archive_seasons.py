@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Move the closed seasons to the archive tables."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+
+# Current django project
+from sports_manager.archive import ArchiveError, archive_season
+from sports_manager.models import Season
+from sports_manager.models.season import current_season
+
+
+class Command(BaseCommand):
+    """Move the licenses, the medical certificates and the time slots of the closed seasons to the archive tables.
+
+    Every closed season before the current one is archived again, to move the certificates which were still valid
+    the previous time.
+    """
+
+    help = "Move the licenses, medical certificates and time slots of the closed seasons to the archive tables."
+
+    def add_arguments(self, parser):
+        """Add the arguments of the command."""
+        parser.add_argument('--season',
+                            type=int,
+                            default=None,
+                            help="Year the season to archive starts (default: every closed season).")
+        parser.add_argument('--chunk-size',
+                            type=int,
+                            default=1000,
+                            help="Number of objects moved in each transaction.")
+        parser.add_argument('--dry-run',
+                            action='store_true',
+                            help="Count the objects that would be archived without moving them.")
+
+    def handle(self, *args, **options):
+        """Archive the seasons."""
+        if options['season'] is not None:
+            seasons = Season.objects.filter(year=options['season'])
+            if not seasons:
+                raise CommandError("The season {} does not exist".format(options['season']))
+        else:
+            seasons = Season.objects.filter(is_closed=True, year__lt=current_season()).order_by('year')
+
+        for season in seasons:
+            try:
+                counts = archive_season(season, chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+            except ArchiveError as e:
+                raise CommandError(str(e))
+            self.stdout.write("{}: {} license(s), {} certificate(s), {} time slot(s) {}".format(
+                season, counts['licenses'], counts['certificates'], counts['time slots'],
+                'would be archived' if options['dry_run'] else 'archived'))
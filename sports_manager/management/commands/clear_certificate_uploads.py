@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Delete the interrupted uploads of medical certificates."""
+
+# Standard library
+from datetime import timedelta
+
+# Django
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+# Current django project
+from sports_manager.conf import get_setting
+from sports_manager.models import CertificateUpload
+from sports_manager.uploads import discard
+
+
+class Command(BaseCommand):
+    """Delete the uploads that did not receive any chunk for a while."""
+
+    help = "Delete the uploads of medical certificates that have not been resumed for `upload_expiration` hours."
+
+    def handle(self, *args, **options):
+        """Delete the expired uploads and their partial files."""
+        limit = timezone.now() - timedelta(hours=get_setting('upload_expiration'))
+        deleted = 0
+        for upload in CertificateUpload.objects.filter(modified__lt=limit).iterator():
+            discard(upload)
+            deleted += 1
+
+        self.stdout.write("{} expired upload(s) deleted".format(deleted))
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Generate the responsive variants of the images of the categories and the teams."""
+
+# Standard library
+from concurrent.futures import ProcessPoolExecutor
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Current django project
+from sports_manager import images
+from sports_manager.conf import get_setting
+from sports_manager.models import Category, Team
+
+
+class Command(BaseCommand):
+    """Regenerate the variants of the images in parallel."""
+
+    help = "Generate the responsive variants of the images of the categories and the teams in a process pool."
+
+    def add_arguments(self, parser):
+        """Add the arguments of the command."""
+        parser.add_argument('--force',
+                            action='store_true',
+                            help="Regenerate the variants of every image, even the ones that are up to date.")
+        parser.add_argument('--workers',
+                            type=int,
+                            default=None,
+                            help="Number of worker processes (default: number of processors).")
+
+    def handle(self, *args, **options):
+        """Resize the images in the workers and record the variants from the main process."""
+        settings = (get_setting('image_widths'), get_setting('image_formats'), get_setting('image_quality'))
+
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            for model in (Category, Team):
+                futures = {}
+                for obj in model.objects.exclude(img='').only('pk', 'img', 'img_variants').iterator():
+                    if options['force'] or obj.image_variants_source() != obj.img.name:
+                        # The workers only resize the images, the database is only used by this process
+                        future = executor.submit(images.regenerate, obj.img.storage, obj.img.name,
+                                                 obj.image_variants(), *settings)
+                        futures[future] = obj
+
+                generated = 0
+                for future, obj in futures.items():
+                    variants = future.result()
+                    if variants is None:
+                        self.stderr.write("Can not read the image {}".format(obj.img.name))
+                        continue
+                    obj.set_image_variants(variants)
+                    model.objects.filter(pk=obj.pk).update(img_variants=obj.img_variants)
+                    generated += 1
+
+                self.stdout.write("{}: {} image(s) processed".format(model._meta.verbose_name_plural, generated))
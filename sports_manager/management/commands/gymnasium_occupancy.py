@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Report the weekly occupancy of the gymnasiums and the conflicting time slots."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+
+# Current django project
+from sports_manager.models import Gymnasium, Team, TimeSlot
+
+
+class Command(BaseCommand):
+    """Print the occupancy of every gymnasium for each day of the week."""
+
+    help = "Print the weekly occupancy of the gymnasiums and the time slots that overlap."
+
+    def add_arguments(self, parser):
+        """Add the arguments of the command."""
+        parser.add_argument('--check',
+                            action='store_true',
+                            help="Exit with an error if at least two time slots overlap.")
+
+    def handle(self, *args, **options):
+        """Build the occupancy index and print the report."""
+        index = TimeSlot.objects.occupancy_index()
+        gymnasiums = dict(Gymnasium.objects.values_list('pk', 'name'))
+        days = dict(TimeSlot.DAYS_OF_WEEK)
+
+        for row in index.report():
+            blocks = ", ".join("{:%H:%M}-{:%H:%M}".format(start, end) for start, end in row['blocks'])
+            self.stdout.write("{gymnasium} - {day}: {slots} slot(s), {hours}h{minutes:02d} ({blocks})".format(
+                gymnasium=gymnasiums[row['gymnasium_id']],
+                day=days[row['day']],
+                slots=row['slots'],
+                hours=row['occupied_minutes'] // 60,
+                minutes=row['occupied_minutes'] % 60,
+                blocks=blocks))
+
+        conflicts = index.conflicts()
+        teams = dict(Team.objects.values_list('pk', 'name'))
+        for a, b in conflicts:
+            self.stdout.write("Conflict in {} on {}: {} ({:%H:%M}-{:%H:%M}) and {} ({:%H:%M}-{:%H:%M})".format(
+                gymnasiums[a.gymnasium_id], days[a.day],
+                teams[a.team_id], a.start, a.end,
+                teams[b.team_id], b.start, b.end))
+
+        if conflicts and options['check']:
+            raise CommandError("{} conflicting time slot(s) found".format(len(conflicts)))
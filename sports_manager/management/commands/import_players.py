@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""Import a roster of players from a CSV or XLSX file."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+
+# Current django project
+from sports_manager.roster import RosterImporter, read_rows
+
+
+class Command(BaseCommand):
+    """Import the players, their emergency contacts and their licenses."""
+
+    help = "Import a roster of players from a CSV or XLSX file (see sports_manager.roster for the columns)."
+
+    def add_arguments(self, parser):
+        """Add the arguments of the command."""
+        parser.add_argument('path', help="Path of the CSV or XLSX file.")
+        parser.add_argument('--chunk-size',
+                            type=int,
+                            default=500,
+                            help="Number of rows inserted in each transaction (default: 500).")
+
+    def handle(self, *args, **options):
+        """Import the file."""
+        try:
+            with open(options['path'], 'rb') as f:
+                report = RosterImporter(chunk_size=options['chunk_size']).run(read_rows(f, options['path']))
+        except (OSError, ValueError) as e:
+            raise CommandError(e)
+
+        for error in report.errors:
+            for field, messages in error.errors.items():
+                self.stderr.write("Line {}: {}: {}".format(error.line, field, " ".join(messages)))
+        self.stdout.write(str(report))
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""Remind the owners of the players to renew the medical certificates expiring soon."""
+
+# Django
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+# Current django project
+from sports_manager.conf import get_setting
+from sports_manager.reminders import send_reminders
+
+
+class Command(BaseCommand):
+    """Send one digest per owner listing its certificates expiring soon.
+
+    Meant to be run daily from cron, the certificates already reminded are skipped.
+    """
+
+    help = "Email the owners of the players whose medical certificate expires in the next days."
+
+    def add_arguments(self, parser):
+        """Add the arguments of the command."""
+        parser.add_argument('--days',
+                            type=int,
+                            default=None,
+                            help="Size of the window in days (default: the `certificate_expiry_window` setting).")
+        parser.add_argument('--dry-run',
+                            action='store_true',
+                            help="Count the emails that would be sent without sending them.")
+
+    def handle(self, *args, **options):
+        """Send the digests."""
+        days = options['days'] if options['days'] is not None else get_setting('certificate_expiry_window')
+        sent = send_reminders(timezone.localdate(), days, dry_run=options['dry_run'])
+        if options['dry_run']:
+            self.stdout.write("{} email(s) would be sent".format(sent))
+        else:
+            self.stdout.write("{} email(s) sent".format(sent))
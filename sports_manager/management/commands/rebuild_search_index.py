@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""Build the search documents again."""
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Current django project
+from sports_manager.search import get_backend, rebuild
+
+
+class Command(BaseCommand):
+    """Build the search document of every player, team, category, gymnasium and emergency contact again.
+
+    Meant to be run when a season starts, since the documents of the players show the teams of their licenses of the
+    current season.
+    """
+
+    help = "Build the search documents of the players, teams, categories, gymnasiums and emergency contacts again."
+
+    def handle(self, *args, **options):
+        """Rebuild the index."""
+        count = rebuild()
+        self.stdout.write("{} document(s) indexed with the {} backend".format(count, get_backend().name))
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Compute the counters of the teams again and report the drift."""
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Current django project
+from sports_manager.counters import reconcile
+
+
+class Command(BaseCommand):
+    """Compute the counters of players of every team in bulk and report the ones which were wrong.
+
+    Meant to be run daily from cron, since the expiry of the medical certificates and the start of a new season change
+    the counters without any signal.
+    """
+
+    help = "Compute the counters of players of the teams again and report the drift."
+
+    def add_arguments(self, parser):
+        """Add the arguments of the command."""
+        parser.add_argument('--dry-run',
+                            action='store_true',
+                            help="Report the drift without fixing it.")
+
+    def handle(self, *args, **options):
+        """Reconcile the counters."""
+        drifted = reconcile(dry_run=options['dry_run'])
+        for slug, name, stored, expected in drifted:
+            self.stdout.write("{}: {} is {} instead of {}".format(slug, name, stored, expected))
+        if options['dry_run']:
+            self.stdout.write("{} counter(s) drifted".format(len(drifted)))
+        else:
+            self.stdout.write("{} counter(s) fixed".format(len(drifted)))
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Render the markdown descriptions of the categories and the teams as HTML."""
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Current django project
+from sports_manager.models import Category, Team
+
+
+class Command(BaseCommand):
+    """Backfill the pre-rendered HTML of the markdown descriptions."""
+
+    help = "Render the description of every category and team whose markdown changed since the last rendering."
+
+    def add_arguments(self, parser):
+        """Add the arguments of the command."""
+        parser.add_argument('--force',
+                            action='store_true',
+                            help="Render every description, even the ones that did not change.")
+
+    def handle(self, *args, **options):
+        """Render the descriptions."""
+        for model in (Category, Team):
+            rendered = 0
+            queryset = model.objects.only('pk', 'description', 'description_html', 'description_hash')
+            for obj in queryset.iterator():
+                if obj.render_description(force=options['force']):
+                    # Use update() so that neither save() nor the modification signals run again
+                    model.objects.filter(pk=obj.pk).update(description_html=obj.description_html,
+                                                           description_hash=obj.description_hash)
+                    rendered += 1
+
+            self.stdout.write("{}: {} description(s) rendered".format(model._meta.verbose_name_plural, rendered))
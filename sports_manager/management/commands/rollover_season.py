@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Copy the schedule and the licenses of a season to the next one."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+
+# Current django project
+from sports_manager.models import Season
+from sports_manager.models.season import current_season
+from sports_manager.rollover import Rollover
+
+
+class Command(BaseCommand):
+    """Copy the time slots of a season and create an unpaid renewal license for each of its players.
+
+    Meant to be run at the start of a season, the objects already created for the new season are skipped.
+    """
+
+    help = "Copy the time slots and renew the licenses of a season into the next one."
+
+    def add_arguments(self, parser):
+        """Add the arguments of the command."""
+        parser.add_argument('--to',
+                            type=int,
+                            default=None,
+                            help="Year the new season starts (default: the current season).")
+        parser.add_argument('--dry-run',
+                            action='store_true',
+                            help="Print the objects that would be created without creating them.")
+
+    def handle(self, *args, **options):
+        """Roll the previous season over."""
+        year = options['to'] if options['to'] is not None else current_season()
+        source = Season.objects.filter(year=year - 1).first()
+        if source is None:
+            raise CommandError("The season {}-{} does not exist".format(year - 1, year))
+        target = Season.objects.filter(year=year).first()
+        if target is None:
+            # The dry run does not create the season
+            target = Season(year=year) if options['dry_run'] else Season.objects.for_year(year)
+
+        rollover = Rollover(source, target)
+        for line in rollover.diff():
+            self.stdout.write(line)
+        if options['dry_run']:
+            self.stdout.write("{} time slot(s) and {} license(s) would be created".format(
+                len(rollover.time_slots), len(rollover.licenses)))
+        else:
+            rollover.apply()
+            self.stdout.write("{} time slot(s) and {} license(s) created".format(
+                len(rollover.time_slots), len(rollover.licenses)))
@@ -0,0 +1,33 @@
+# Generated by Django 2.1.15 on 2026-10-18 15:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_manager', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='description_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='description hash'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='description_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='rendered description'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='description_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='description hash'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='description_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='rendered description'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.1.15 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_manager', '0002_rendered_description'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='license',
+            name='is_payed',
+            field=models.BooleanField(db_index=True, verbose_name='has been payed'),
+        ),
+        migrations.AlterField(
+            model_name='license',
+            name='number',
+            field=models.CharField(blank=True, db_index=True, max_length=20, verbose_name='number'),
+        ),
+        migrations.AlterField(
+            model_name='medicalcertificate',
+            name='validation',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'not uploaded'), (1, 'in validation'), (2, 'valid'), (3, 'rejected')], db_index=True, default=0, verbose_name='validation step'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['last_name', 'first_name'], name='sm_player_name_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 2.1.15 on 2026-10-18 15:22
+
+from django.db import migrations, models
+
+# Backends supporting partial indexes (CREATE INDEX ... WHERE ...)
+PARTIAL_INDEX_VENDORS = ('postgresql', 'sqlite')
+
+
+def create_team_with_trainer_index(apps, schema_editor):
+    if schema_editor.connection.vendor in PARTIAL_INDEX_VENDORS:
+        schema_editor.execute('CREATE INDEX "sm_team_with_trainer_idx" ON "sports_manager_team" ("category_id") '
+                              'WHERE "trainer_id" IS NOT NULL')
+
+
+def drop_team_with_trainer_index(apps, schema_editor):
+    if schema_editor.connection.vendor in PARTIAL_INDEX_VENDORS:
+        schema_editor.execute('DROP INDEX "sm_team_with_trainer_idx"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_manager', '0003_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='license',
+            index=models.Index(fields=['player', 'created'], name='sm_license_player_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicalcertificate',
+            index=models.Index(fields=['player', 'start', 'validation'], name='sm_certificate_player_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['owner', 'last_name', 'first_name'], name='sm_player_owner_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timeslot',
+            index=models.Index(fields=['day', 'start', 'end'], name='sm_timeslot_schedule_idx'),
+        ),
+        migrations.RunPython(create_team_with_trainer_index, drop_team_with_trainer_index),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.1.15 on 2026-10-18 16:05
+
+from django.db import migrations, models
+
+
+def restore_team_with_trainer_index(apps, schema_editor):
+    # SQLite rebuilds the table to add or remove a column, which drops the partial index created by 0004
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('CREATE INDEX IF NOT EXISTS "sm_team_with_trainer_idx" ON "sports_manager_team" '
+                              '("category_id") WHERE "trainer_id" IS NOT NULL')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_manager', '0005_timeslot_dates'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_team_with_trainer_index),
+        migrations.AddField(
+            model_name='category',
+            name='img_variants',
+            field=models.TextField(blank=True, editable=False, verbose_name='image variants'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='img_variants',
+            field=models.TextField(blank=True, editable=False, verbose_name='image variants'),
+        ),
+        migrations.RunPython(restore_team_with_trainer_index, migrations.RunPython.noop),
+    ]
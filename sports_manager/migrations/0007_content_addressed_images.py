@@ -0,0 +1,35 @@
+# Generated by Django 2.1.15 on 2026-10-18 16:30
+
+from django.db import migrations, models
+import sports_manager.models.category
+import sports_manager.models.team
+import sports_manager.storage
+
+
+def restore_team_with_trainer_index(apps, schema_editor):
+    # SQLite rebuilds the table to alter a column, which drops the partial index created by 0004
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('CREATE INDEX IF NOT EXISTS "sm_team_with_trainer_idx" ON "sports_manager_team" '
+                              '("category_id") WHERE "trainer_id" IS NOT NULL')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_manager', '0006_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_team_with_trainer_index),
+        migrations.AlterField(
+            model_name='category',
+            name='img',
+            field=models.ImageField(blank=True, storage=sports_manager.storage.ContentAddressedStorage(), upload_to=sports_manager.models.category.image_upload_to, verbose_name='image'),
+        ),
+        migrations.AlterField(
+            model_name='team',
+            name='img',
+            field=models.ImageField(blank=True, storage=sports_manager.storage.ContentAddressedStorage(), upload_to=sports_manager.models.team.image_upload_to, verbose_name='image'),
+        ),
+        migrations.RunPython(restore_team_with_trainer_index, migrations.RunPython.noop),
+    ]
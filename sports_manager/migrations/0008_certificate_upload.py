@@ -0,0 +1,34 @@
+# Generated by Django 2.1.15 on 2026-10-18 16:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_manager', '0007_content_addressed_images'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CertificateUpload',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True, verbose_name='token')),
+                ('filename', models.CharField(max_length=255, verbose_name='file name')),
+                ('size', models.PositiveIntegerField(verbose_name='size')),
+                ('checksum', models.CharField(max_length=64, verbose_name='SHA-256 checksum')),
+                ('offset', models.PositiveIntegerField(default=0, verbose_name='received bytes')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='creation date')),
+                ('modified', models.DateTimeField(auto_now=True, verbose_name='last modification date')),
+                ('certificate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='sports_manager.MedicalCertificate', verbose_name='medical certificate')),
+            ],
+            options={
+                'verbose_name': 'certificate upload',
+                'verbose_name_plural': 'certificate uploads',
+                'ordering': ('created',),
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.1.15 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_manager', '0008_certificate_upload'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='medicalcertificate',
+            index=models.Index(fields=['validation', 'created'], name='sm_certificate_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 2.1.15 on 2026-10-18 17:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_manager', '0009_certificate_queue_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CertificateExpiryNotice',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('end', models.DateField(verbose_name='ending date')),
+                ('sent', models.DateTimeField(auto_now_add=True, verbose_name='sending date')),
+            ],
+            options={
+                'verbose_name': 'certificate expiry notice',
+                'verbose_name_plural': 'certificate expiry notices',
+                'ordering': ('sent',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='medicalcertificate',
+            index=models.Index(fields=['validation', 'end'], name='sm_certificate_expiry_idx'),
+        ),
+        migrations.AddField(
+            model_name='certificateexpirynotice',
+            name='certificate',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='expiry_notices', to='sports_manager.MedicalCertificate', verbose_name='medical certificate'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='certificateexpirynotice',
+            unique_together={('certificate', 'end')},
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 2.1.15 on 2026-10-18 18:10
+
+from django.db import migrations, models
+
+
+def restore_team_with_trainer_index(apps, schema_editor):
+    # SQLite rebuilds the table to add or remove a column, which drops the partial index created by 0004
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('CREATE INDEX IF NOT EXISTS "sm_team_with_trainer_idx" ON "sports_manager_team" '
+                              '("category_id") WHERE "trainer_id" IS NOT NULL')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_manager', '0010_certificate_expiry_notice'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_team_with_trainer_index),
+        migrations.AddField(
+            model_name='team',
+            name='certified_player_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='number of players with a valid medical certificate'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='payed_player_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='number of players who payed'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='player_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='number of players'),
+        ),
+        migrations.RunPython(restore_team_with_trainer_index, migrations.RunPython.noop),
+    ]
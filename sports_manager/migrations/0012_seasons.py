@@ -0,0 +1,236 @@
+# Generated by Django 2.1.15 on 2026-10-18 18:30
+
+from datetime import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+import sports_manager.models.player
+import sports_manager.models.season
+
+SEASON_START_MONTH = 9
+
+
+def assign_seasons(apps, schema_editor):
+    # The licenses and the certificates belong to the season they were created in, the time slots describe the
+    # weekly schedule in use and belong to the current season
+    Season = apps.get_model('sports_manager', 'Season')
+
+    def get_season(year):
+        return Season.objects.get_or_create(year=year, defaults={
+            'start': datetime(year, SEASON_START_MONTH, 1).date(),
+            'end': datetime(year + 1, SEASON_START_MONTH, 1).date(),
+        })[0]
+
+    today = timezone.localdate()
+    current = today.year if today.month >= SEASON_START_MONTH else today.year - 1
+    TimeSlot = apps.get_model('sports_manager', 'TimeSlot')
+    if TimeSlot.objects.exists():
+        TimeSlot.objects.update(season=get_season(current))
+
+    for name in ('License', 'MedicalCertificate'):
+        model = apps.get_model('sports_manager', name)
+        dates = model.objects.aggregate(first=models.Min('created'), last=models.Max('created'))
+        if dates['first'] is None:
+            continue
+        for year in range(timezone.localtime(dates['first']).year - 1, timezone.localtime(dates['last']).year + 1):
+            queryset = model.objects.filter(created__gte=timezone.make_aware(datetime(year, SEASON_START_MONTH, 1)),
+                                            created__lt=timezone.make_aware(datetime(year + 1, SEASON_START_MONTH, 1)))
+            if queryset.exists():
+                queryset.update(season=get_season(year))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_manager', '0011_team_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Season',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(help_text='Year the season starts.', unique=True, verbose_name='year')),
+                ('start', models.DateField(verbose_name='starting date')),
+                ('end', models.DateField(verbose_name='ending date')),
+                ('is_closed', models.BooleanField(default=False, verbose_name='is closed')),
+                ('archived', models.DateTimeField(blank=True, editable=False, null=True, verbose_name='archiving date')),
+            ],
+            options={
+                'verbose_name': 'season',
+                'verbose_name_plural': 'seasons',
+                'ordering': ('-year',),
+            },
+        ),
+        migrations.AddField(
+            model_name='license',
+            name='season',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, to='sports_manager.Season', verbose_name='season'),
+        ),
+        migrations.AddField(
+            model_name='medicalcertificate',
+            name='season',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, to='sports_manager.Season', verbose_name='season'),
+        ),
+        migrations.AddField(
+            model_name='timeslot',
+            name='season',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, to='sports_manager.Season', verbose_name='season'),
+        ),
+        migrations.RunPython(assign_seasons, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='license',
+            name='season',
+            field=models.ForeignKey(default=sports_manager.models.season.current_season_id, editable=False, on_delete=django.db.models.deletion.PROTECT, to='sports_manager.Season', verbose_name='season'),
+        ),
+        migrations.AlterField(
+            model_name='medicalcertificate',
+            name='season',
+            field=models.ForeignKey(default=sports_manager.models.season.current_season_id, editable=False, on_delete=django.db.models.deletion.PROTECT, to='sports_manager.Season', verbose_name='season'),
+        ),
+        migrations.AlterField(
+            model_name='timeslot',
+            name='season',
+            field=models.ForeignKey(default=sports_manager.models.season.current_season_id, editable=False, on_delete=django.db.models.deletion.PROTECT, to='sports_manager.Season', verbose_name='season'),
+        ),
+        migrations.RemoveIndex(
+            model_name='license',
+            name='sm_license_player_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='medicalcertificate',
+            name='sm_certificate_queue_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='timeslot',
+            name='sm_timeslot_schedule_idx',
+        ),
+        migrations.AddIndex(
+            model_name='license',
+            index=models.Index(fields=['season', 'player', 'created'], name='sm_license_player_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='license',
+            index=models.Index(fields=['season', 'created'], name='sm_license_season_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicalcertificate',
+            index=models.Index(fields=['season', 'validation', 'created'], name='sm_certificate_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='medicalcertificate',
+            index=models.Index(fields=['season', 'player'], name='sm_certificate_season_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timeslot',
+            index=models.Index(fields=['season', 'day', 'start', 'end'], name='sm_timeslot_schedule_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timeslot',
+            index=models.Index(fields=['season', 'gymnasium', 'day'], name='sm_timeslot_gymnasium_day_idx'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedLicense',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('number', models.CharField(blank=True, max_length=20, verbose_name='number')),
+                ('is_payed', models.BooleanField(verbose_name='has been payed')),
+                ('created', models.DateTimeField(verbose_name='creation date')),
+                ('modified', models.DateTimeField(verbose_name='last modification date')),
+                ('archived', models.DateTimeField(auto_now_add=True, verbose_name='archiving date')),
+            ],
+            options={
+                'verbose_name': 'archived license',
+                'verbose_name_plural': 'archived licenses',
+                'ordering': ('created',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedMedicalCertificate',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('file', models.FileField(blank=True, upload_to=sports_manager.models.player.file_upload_to, verbose_name='file')),
+                ('validation', models.PositiveSmallIntegerField(choices=[(0, 'not uploaded'), (1, 'in validation'), (2, 'valid'), (3, 'rejected')], verbose_name='validation step')),
+                ('start', models.DateField(verbose_name='starting date')),
+                ('end', models.DateField(null=True, verbose_name='ending date')),
+                ('created', models.DateTimeField(verbose_name='creation date')),
+                ('archived', models.DateTimeField(auto_now_add=True, verbose_name='archiving date')),
+            ],
+            options={
+                'verbose_name': 'archived medical certificate',
+                'verbose_name_plural': 'archived medical certificates',
+                'ordering': ('player', 'start', 'validation'),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedTimeSlot',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('type', models.PositiveSmallIntegerField(choices=[(0, 'practice'), (1, 'match')], verbose_name='type')),
+                ('day', models.PositiveSmallIntegerField(choices=[(0, 'monday'), (1, 'tuesday'), (2, 'wednesday'), (3, 'thursday'), (4, 'friday'), (5, 'saturday'), (6, 'sunday')], verbose_name='day')),
+                ('start', models.TimeField(verbose_name='starting time')),
+                ('end', models.TimeField(verbose_name='ending time')),
+                ('created', models.DateTimeField(verbose_name='creation date')),
+                ('modified', models.DateTimeField(verbose_name='last modification date')),
+                ('archived', models.DateTimeField(auto_now_add=True, verbose_name='archiving date')),
+            ],
+            options={
+                'verbose_name': 'archived time slot',
+                'verbose_name_plural': 'archived time slots',
+                'ordering': ('day', 'start', 'end'),
+            },
+        ),
+        migrations.AddField(
+            model_name='archivedtimeslot',
+            name='gymnasium',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='sports_manager.Gymnasium', verbose_name='gymnasium'),
+        ),
+        migrations.AddField(
+            model_name='archivedtimeslot',
+            name='season',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='sports_manager.Season', verbose_name='season'),
+        ),
+        migrations.AddField(
+            model_name='archivedtimeslot',
+            name='team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='sports_manager.Team', verbose_name='team'),
+        ),
+        migrations.AddField(
+            model_name='archivedmedicalcertificate',
+            name='player',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='sports_manager.Player', verbose_name='player'),
+        ),
+        migrations.AddField(
+            model_name='archivedmedicalcertificate',
+            name='season',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='sports_manager.Season', verbose_name='season'),
+        ),
+        migrations.AddField(
+            model_name='archivedlicense',
+            name='player',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='sports_manager.Player', verbose_name='player'),
+        ),
+        migrations.AddField(
+            model_name='archivedlicense',
+            name='season',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='sports_manager.Season', verbose_name='season'),
+        ),
+        migrations.AddField(
+            model_name='archivedlicense',
+            name='teams',
+            field=models.ManyToManyField(blank=True, to='sports_manager.Team', verbose_name='teams'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtimeslot',
+            index=models.Index(fields=['season', 'team'], name='sm_archived_timeslot_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedmedicalcertificate',
+            index=models.Index(fields=['season', 'player'], name='sm_archived_certificate_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedlicense',
+            index=models.Index(fields=['season', 'player'], name='sm_archived_license_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 2.1.15 on 2026-10-18 18:50
+
+from django.db import OperationalError, migrations, models
+import django.db.models.deletion
+
+
+def create_fts_table(apps, schema_editor):
+    # The search falls back to the trigram table when SQLite is not compiled with FTS5
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute('CREATE VIRTUAL TABLE "sports_manager_search_fts" USING fts5(title, body)')
+    except OperationalError:
+        pass
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS "sports_manager_search_fts"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_manager', '0012_seasons'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('player', 'player'), ('team', 'team'), ('category', 'category'), ('gymnasium', 'gymnasium'), ('emergency-contact', 'emergency contact')], max_length=20, verbose_name='kind')),
+                ('object_id', models.PositiveIntegerField(verbose_name='object id')),
+                ('title', models.CharField(max_length=255, verbose_name='title')),
+                ('subtitle', models.CharField(blank=True, max_length=255, verbose_name='subtitle')),
+                ('url', models.CharField(blank=True, max_length=255, verbose_name='URL')),
+                ('search_title', models.CharField(max_length=255, verbose_name='indexed title')),
+                ('search_body', models.TextField(blank=True, verbose_name='indexed body')),
+                ('modified', models.DateTimeField(auto_now=True, verbose_name='last modification date')),
+            ],
+            options={
+                'verbose_name': 'search document',
+                'verbose_name_plural': 'search documents',
+                'ordering': ('kind', 'title'),
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=3, verbose_name='term')),
+                ('weight', models.PositiveSmallIntegerField(verbose_name='weight')),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='sports_manager.SearchDocument', verbose_name='document')),
+            ],
+            options={
+                'verbose_name': 'search term',
+                'verbose_name_plural': 'search terms',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='searchdocument',
+            unique_together={('kind', 'object_id')},
+        ),
+        migrations.AddIndex(
+            model_name='searchterm',
+            index=models.Index(fields=['term', 'document', 'weight'], name='sm_search_term_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='searchterm',
+            unique_together={('document', 'term')},
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 2.1.15 on 2026-10-18 19:10
+
+from django.db import migrations
+
+# The admin searches the players with `istartswith`, which compiles to `LIKE` on SQLite and MySQL and to
+# `UPPER(...) LIKE UPPER(...)` on PostgreSQL: the plain index of the names is only read by SQLite if it ignores the
+# case, and by PostgreSQL if it is built on the uppercased names with the pattern operator class.
+# MySQL compares the names ignoring the case with its default collations, sm_player_name_idx already starts with
+# the last name.
+SEARCH_INDEXES = {
+    'sqlite': [
+        'CREATE INDEX "sm_player_last_name_ci_idx" ON "sports_manager_player" ("last_name" COLLATE NOCASE)',
+        'CREATE INDEX "sm_player_first_name_ci_idx" ON "sports_manager_player" ("first_name" COLLATE NOCASE)',
+    ],
+    'postgresql': [
+        'CREATE INDEX "sm_player_last_name_ci_idx" ON "sports_manager_player" '
+        '(UPPER("last_name"::text) text_pattern_ops)',
+        'CREATE INDEX "sm_player_first_name_ci_idx" ON "sports_manager_player" '
+        '(UPPER("first_name"::text) text_pattern_ops)',
+    ],
+    'mysql': [
+        'CREATE INDEX `sm_player_first_name_ci_idx` ON `sports_manager_player` (`first_name`)',
+    ],
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    # SQLite rebuilds the table to alter a column, the migrations altering the players must create them again
+    for sql in SEARCH_INDEXES.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in SEARCH_INDEXES.get(vendor, []):
+        name = sql.split()[2]
+        schema_editor.execute('DROP INDEX {} ON `sports_manager_player`'.format(name) if vendor == 'mysql'
+                              else 'DROP INDEX {}'.format(name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_manager', '0013_search_documents'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
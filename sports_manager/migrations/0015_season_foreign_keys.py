@@ -0,0 +1,30 @@
+# Generated by Django 2.1.15 on 2026-10-18 19:20
+
+from django.db import migrations
+import django.db.models.deletion
+import sports_manager.models.season
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports_manager', '0014_player_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='license',
+            name='season',
+            field=sports_manager.models.season.SeasonForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, to='sports_manager.Season', verbose_name='season'),
+        ),
+        migrations.AlterField(
+            model_name='medicalcertificate',
+            name='season',
+            field=sports_manager.models.season.SeasonForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, to='sports_manager.Season', verbose_name='season'),
+        ),
+        migrations.AlterField(
+            model_name='timeslot',
+            name='season',
+            field=sports_manager.models.season.SeasonForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, to='sports_manager.Season', verbose_name='season'),
+        ),
+    ]
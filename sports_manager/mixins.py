@@ -2,6 +2,11 @@
 
 # Django
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import Http404
+from django.utils.translation import ugettext as _
+
+# Current django project
+from sports_manager.pagination import CursorPaginator, InvalidCursor
 
 
 class StaffMixin(LoginRequiredMixin, UserPassesTestMixin):
@@ -11,7 +16,7 @@ class StaffMixin(LoginRequiredMixin, UserPassesTestMixin):
     raise_exception = True
 
     def test_func(self):
-        return self.request.is_staff
+        return self.request.user.is_staff
 
 
 class SuperuserMixin(LoginRequiredMixin, UserPassesTestMixin):
@@ -21,7 +26,7 @@ class SuperuserMixin(LoginRequiredMixin, UserPassesTestMixin):
     raise_exception = True
 
     def test_func(self):
-        return self.request.is_superuser
+        return self.request.user.is_superuser
 
 
 class OwnerMixin(LoginRequiredMixin, UserPassesTestMixin):
@@ -30,3 +35,29 @@ class OwnerMixin(LoginRequiredMixin, UserPassesTestMixin):
 
     def test_func(self):
         return self.request.user.username == self.kwargs.get(self.owner_kwargs)
+
+
+class CursorPaginationMixin:
+    """Paginate a ListView with a cursor instead of page numbers (see `sports_manager.pagination`).
+
+    The `cursor` query parameter holds the opaque token of the page. `page_obj.next_cursor` and
+    `page_obj.previous_cursor` are the tokens of the next and previous pages (None if there is none). The total
+    number of objects (`paginator.count`) is only counted if `paginate_count` is True, and the first
+    `paginate_following` objects of the next page are fetched with the page (`page_obj.following`).
+    """
+
+    cursor_kwarg = 'cursor'
+    # Ordering of the pages (default: the Meta.ordering of the model), the primary key is appended
+    cursor_ordering = None
+    paginate_count = False
+    paginate_following = 0
+
+    def paginate_queryset(self, queryset, page_size):
+        """Return the page of the cursor."""
+        paginator = CursorPaginator(queryset, page_size, ordering=self.cursor_ordering,
+                                    with_count=self.paginate_count)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg), following=self.paginate_following)
+        except InvalidCursor:
+            raise Http404(_("Invalid cursor."))
+        return paginator, page, page.object_list, page.has_other_pages()
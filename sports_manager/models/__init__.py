@@ -3,5 +3,8 @@
 from sports_manager.models.category import Category
 from sports_manager.models.gymnasium import Gymnasium
 from sports_manager.models.license import License
-from sports_manager.models.player import Player, MedicalCertificate
-from sports_manager.models.team import Team, TimeSlot
\ No newline at end of file
+from sports_manager.models.player import CertificateExpiryNotice, CertificateUpload, Player, MedicalCertificate
+from sports_manager.models.season import Season
+from sports_manager.models.team import Team, TimeSlot
+from sports_manager.models.archive import ArchivedLicense, ArchivedMedicalCertificate, ArchivedTimeSlot
+from sports_manager.models.search import SearchDocument, SearchTerm
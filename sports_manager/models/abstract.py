@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""Abstract models shared by several models of the application."""
+
+# Standard library
+import hashlib
+import json
+import logging
+
+# Django
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+# Current django project
+from markdownx.utils import markdownify
+from sports_manager import images
+from sports_manager.conf import get_setting
+
+logger = logging.getLogger(__name__)
+
+
+def description_hash(description):
+    """Return the SHA-256 hex digest of a markdown description."""
+    return hashlib.sha256((description or '').encode('utf-8')).hexdigest()
+
+
+class RenderedDescriptionModel(models.Model):
+    """Store the HTML rendering of the `description` markdown field next to it.
+
+    The HTML is only rendered again when the hash of the description changes, so pages displaying the description
+    never have to parse the markdown.
+    """
+
+    description_html = models.TextField(_('rendered description'), blank=True, editable=False)
+    description_hash = models.CharField(_('description hash'), max_length=64, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def render_description(self, force=False):
+        """Render the description as HTML if it changed since the last rendering.
+
+        Return True if the HTML has been rendered again.
+        """
+        digest = description_hash(self.description)
+        if not force and digest == self.description_hash:
+            return False
+
+        logger.debug("Rendering description of {} {}".format(self._meta.model_name, self.pk))
+        self.description_html = markdownify(self.description)
+        self.description_hash = digest
+        return True
+
+    def description_md(self):
+        """Get the description as HTML (not Mdown)."""
+        if self.description_hash != description_hash(self.description):
+            self.render_description()
+        return self.description_html
+
+
+class ResponsiveImageModel(models.Model):
+    """Record the responsive variants of the `img` field next to it.
+
+    The variants are generated when a new image is saved and described as JSON in `img_variants`::
+
+        {"source": "teams/<slug>/team.jpg", "variants": [{"name": ..., "width": ..., "height": ..., "format": ...}]}
+    """
+
+    img_variants = models.TextField(_('image variants'), blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        """Generate the variants when a new image has been uploaded."""
+        uploaded = bool(self.img) and not self.img._committed
+        super().save(*args, **kwargs)
+        if uploaded or self.image_variants_source() != (self.img.name or ''):
+            self.update_image_variants()
+
+    def _image_variants(self):
+        """Return the decoded description of the variants."""
+        return json.loads(self.img_variants) if self.img_variants else {}
+
+    def image_variants_source(self):
+        """Return the name of the image the variants have been generated from."""
+        return self._image_variants().get('source', '')
+
+    def image_variants(self, fmt=None):
+        """Return the variants ordered by width, optionally only the ones of a format."""
+        variants = self._image_variants().get('variants', [])
+        return sorted((v for v in variants if fmt is None or v['format'] == fmt), key=lambda v: v['width'])
+
+    def set_image_variants(self, variants):
+        """Record the variants of the current image."""
+        self.img_variants = json.dumps({'source': self.img.name, 'variants': variants}) if variants else ''
+
+    def update_image_variants(self):
+        """Generate the variants of the image, delete the previous ones and record them without calling save().
+
+        The image replaced by a new one is deleted as well.
+        """
+        storage = self.img.storage
+        previous = self.image_variants_source()
+        if previous and previous != self.img.name:
+            storage.delete(previous)
+
+        if self.img:
+            variants = images.regenerate(storage, self.img.name, self.image_variants(),
+                                         get_setting('image_widths'), get_setting('image_formats'),
+                                         get_setting('image_quality'))
+        else:
+            images.delete_variants(storage, self.image_variants())
+            variants = None
+
+        self.set_image_variants(variants)
+        type(self)._default_manager.filter(pk=self.pk).update(img_variants=self.img_variants)
+
+    def srcset(self, fmt):
+        """Return the `srcset` attribute listing the variants of a format."""
+        storage = self.img.storage
+        return ', '.join('{} {}w'.format(storage.url(v['name']), v['width']) for v in self.image_variants(fmt))
+
+    def sources(self):
+        """Return the `type` and `srcset` of a `<source>` element for each format, in the order of the settings."""
+        return [
+            {'type': images.CONTENT_TYPES[fmt], 'srcset': self.srcset(fmt)}
+            for fmt in get_setting('image_formats') if self.image_variants(fmt)
+        ]
+
+    def thumbnail_url(self):
+        """Return the URL of the smallest variant in the last format of the settings, or of the image itself."""
+        variants = self.image_variants(get_setting('image_formats')[-1])
+        if variants:
+            return self.img.storage.url(variants[0]['name'])
+        return self.img.url if self.img else ''
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Archive of the closed seasons.
+
+The `archive_seasons` command moves the licenses, the medical certificates and the time slots of the closed seasons
+to these tables (see `sports_manager.archive`), so that the tables read by the views only hold the recent seasons.
+The archived objects keep their primary key.
+"""
+
+# Django
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+# Current django project
+from sports_manager.models.player import MedicalCertificate, file_upload_to
+from sports_manager.models.team import TimeSlot
+
+
+class ArchivedLicense(models.Model):
+    """License of a closed season."""
+
+    id = models.IntegerField(primary_key=True)
+    season = models.ForeignKey('Season', on_delete=models.PROTECT, verbose_name=_("season"))
+    teams = models.ManyToManyField('Team', blank=True, verbose_name=_("teams"))
+    player = models.ForeignKey('Player', on_delete=models.CASCADE, verbose_name=_("player"))
+    number = models.CharField(_("number"), max_length=20, blank=True)
+    is_payed = models.BooleanField(_('has been payed'))
+    created = models.DateTimeField(_('creation date'))
+    modified = models.DateTimeField(_('last modification date'))
+    archived = models.DateTimeField(_('archiving date'), auto_now_add=True)
+
+    def __str__(self):
+        """String representation."""
+        return "{} ({})".format(self.player, self.number)
+
+    class Meta:
+        """Meta class."""
+
+        verbose_name = _("archived license")
+        verbose_name_plural = _("archived licenses")
+        ordering = ("created",)
+        indexes = [
+            models.Index(fields=["season", "player"], name="sm_archived_license_idx"),
+        ]
+
+
+class ArchivedMedicalCertificate(models.Model):
+    """Medical certificate of a closed season."""
+
+    id = models.IntegerField(primary_key=True)
+    season = models.ForeignKey('Season', on_delete=models.PROTECT, verbose_name=_("season"))
+    player = models.ForeignKey("Player", on_delete=models.CASCADE, verbose_name=_('player'))
+    file = models.FileField(_('file'), upload_to=file_upload_to, blank=True)
+    validation = models.PositiveSmallIntegerField(_("validation step"), choices=MedicalCertificate.CERTIFICATION_STEPS)
+    start = models.DateField(_('starting date'))
+    end = models.DateField(_('ending date'), null=True)
+    created = models.DateTimeField(_('creation date'))
+    archived = models.DateTimeField(_('archiving date'), auto_now_add=True)
+
+    class Meta:
+        """Meta class."""
+
+        verbose_name = _("archived medical certificate")
+        verbose_name_plural = _("archived medical certificates")
+        ordering = ("player", "start", "validation")
+        indexes = [
+            models.Index(fields=["season", "player"], name="sm_archived_certificate_idx"),
+        ]
+
+
+class ArchivedTimeSlot(models.Model):
+    """Time slot of a closed season."""
+
+    id = models.IntegerField(primary_key=True)
+    season = models.ForeignKey('Season', on_delete=models.PROTECT, verbose_name=_("season"))
+    type = models.PositiveSmallIntegerField(_("type"), choices=TimeSlot.TYPE_PRACTICE)
+    team = models.ForeignKey('Team', on_delete=models.CASCADE, verbose_name=_('team'))
+    gymnasium = models.ForeignKey('Gymnasium', on_delete=models.CASCADE, verbose_name=_('gymnasium'))
+    day = models.PositiveSmallIntegerField(_("day"), choices=TimeSlot.DAYS_OF_WEEK)
+    start = models.TimeField(_("starting time"))
+    end = models.TimeField(_("ending time"))
+    created = models.DateTimeField(_('creation date'))
+    modified = models.DateTimeField(_('last modification date'))
+    archived = models.DateTimeField(_('archiving date'), auto_now_add=True)
+
+    def __str__(self):
+        """String representation."""
+        return "{} - {}".format(self.team.name, self.get_day_display())
+
+    class Meta:
+        """Meta class."""
+
+        verbose_name = _("archived time slot")
+        verbose_name_plural = _("archived time slots")
+        ordering = ("day", "start", "end")
+        indexes = [
+            models.Index(fields=["season", "team"], name="sm_archived_timeslot_idx"),
+        ]
@@ -13,9 +13,9 @@ from django.utils.translation import ugettext_lazy as _
 
 # Current django project
 from markdownx.models import MarkdownxField
-from markdownx.utils import markdownify
+from sports_manager.models.abstract import RenderedDescriptionModel, ResponsiveImageModel
 from sports_manager.models.team import Team
-from sports_manager.storage import OverwriteStorage
+from sports_manager.storage import ContentAddressedStorage
 
 logger = logging.getLogger(__name__)
 
@@ -37,17 +37,31 @@ def image_upload_to(instance, filename):
     return path
 
 
-class Category(models.Model):
+class CategoryQuerySet(models.QuerySet):
+    """Custom queryset for the Category model."""
+
+    def with_trainer_flags(self):
+        """Annotate each category with a flag telling if one of its teams has a trainer.
+
+        The flag is computed by an EXISTS subquery so a whole list of categories is fetched with a single query.
+        """
+        teams = Team.objects.filter(category=models.OuterRef('pk'), trainer__isnull=False)
+        return self.annotate(has_trainer_team=models.Exists(teams))
+
+
+class Category(RenderedDescriptionModel, ResponsiveImageModel):
     """Sport category model."""
 
     slug = models.SlugField(_("slug"), unique=True, max_length=128, null=True)
     name = models.CharField(_('name'), unique=True, max_length=128)
-    img = models.ImageField(_('image'), storage=OverwriteStorage(), upload_to=image_upload_to, blank=True)
+    img = models.ImageField(_('image'), storage=ContentAddressedStorage(), upload_to=image_upload_to, blank=True)
     min_age = models.PositiveSmallIntegerField(_('minimal age'))
     max_age = models.PositiveSmallIntegerField(_('maximal age'), blank=True, null=True)
     summary = models.TextField(_('summary'), max_length=512)
     description = MarkdownxField(_('description'))
 
+    objects = CategoryQuerySet.as_manager()
+
     def __str__(self):
         """String representation."""
         return self.name
@@ -65,12 +79,14 @@ class Category(models.Model):
     def save(self, *args, **kwargs):
         """Override the save method in order to rewrite the slug field each time we save the object."""
         self.slug = slugify(self.name)
+        self.render_description()
         super().save(*args, **kwargs)
 
-    def description_md(self):
-        """Return the text mardownified."""
-        return markdownify(self.description)
-
     def has_teams_with_trainer(self):
-        """Check if there is at least a team in this category that have a trainer."""
-        return True if Team.objects.filter(category=self, trainer__isnull=False) else False
+        """Check if there is at least a team in this category that have a trainer.
+
+        Use the annotation set by `CategoryQuerySet.with_trainer_flags` when it is available.
+        """
+        if hasattr(self, 'has_trainer_team'):
+            return self.has_trainer_team
+        return Team.objects.filter(category=self, trainer__isnull=False).exists()
@@ -12,20 +12,46 @@ from django.utils.translation import ugettext_lazy as _
 # Current django project
 from markdownx.models import MarkdownxField
 from markdownx.utils import markdownify
+from sports_manager.models.player import MedicalCertificate
+from sports_manager.models.season import CurrentSeasonManager, SeasonForeignKey
 
 logger = logging.getLogger(__name__)
 
 
+class LicenseQuerySet(models.QuerySet):
+    """Custom queryset for the License model."""
+
+    def for_season(self, year):
+        """Filter the licenses of the season starting in `year`."""
+        return self.filter(season__year=year)
+
+    def with_roster_status(self):
+        """Annotate each license with `has_valid_certificate`, True if its player has a validated medical certificate
+        which has not expired.
+
+        The payment status is the `is_payed` field of the license.
+        """
+        # A certificate validated during a previous season may still be valid
+        certificates = MedicalCertificate.all_objects.valid().filter(player=models.OuterRef('player'))
+        return self.annotate(has_valid_certificate=models.Exists(certificates))
+
+
 class License(models.Model):
     """License model."""
 
+    season = SeasonForeignKey('Season', on_delete=models.PROTECT, editable=False, verbose_name=_("season"))
     teams = models.ManyToManyField('Team', blank=True, verbose_name=_("teams"))
     player = models.ForeignKey('Player', on_delete=models.CASCADE, verbose_name=_("player"))
-    number = models.CharField(_("number"), max_length=20, blank=True)
-    is_payed = models.BooleanField(_('has been payed'))
+    number = models.CharField(_("number"), max_length=20, blank=True, db_index=True)
+    is_payed = models.BooleanField(_('has been payed'), db_index=True)
     created = models.DateTimeField(_('creation date'), auto_now_add=True)
     modified = models.DateTimeField(_('last modification date'), auto_now=True)
 
+    # Licenses of the current season
+    objects = CurrentSeasonManager.from_queryset(LicenseQuerySet)()
+    # Licenses of every season
+    all_objects = LicenseQuerySet.as_manager()
+
     def __str__(self):
         """String representation."""
         return "{} ({})".format(self.player, self.number)
@@ -36,3 +62,9 @@ class License(models.Model):
         verbose_name = _("license")
         verbose_name_plural = _("licenses")
         ordering = ("created",)
+        indexes = [
+            # Licenses of the players of an owner (LicenseListView)
+            models.Index(fields=["season", "player", "created"], name="sm_license_player_created_idx"),
+            # Licenses of a season (admin, export)
+            models.Index(fields=["season", "created"], name="sm_license_season_idx"),
+        ]
@@ -3,6 +3,7 @@
 # Standard library
 import logging
 import os
+import uuid
 from datetime import date, timedelta
 
 # Django
@@ -10,12 +11,13 @@ from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 # Current django project
 from markdownx.models import MarkdownxField
 from markdownx.utils import markdownify
-from sports_manager.storage import OverwriteStorage
+from sports_manager.models.season import CurrentSeasonManager, SeasonForeignKey
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +82,22 @@ class Player(models.Model):
         verbose_name = _("player")
         verbose_name_plural = _("players")
         ordering = ("last_name", "first_name")
+        indexes = [
+            models.Index(fields=["last_name", "first_name"], name="sm_player_name_idx"),
+            # Players of an owner (PlayerListView)
+            models.Index(fields=["owner", "last_name", "first_name"], name="sm_player_owner_name_idx"),
+        ]
+        # The admin searches the names ignoring the case with sm_player_last_name_ci_idx and
+        # sm_player_first_name_ci_idx, created with SQL by the migration 0014 since they depend on the backend
+
+
+class MedicalCertificateQuerySet(models.QuerySet):
+    """Custom queryset for the MedicalCertificate model."""
+
+    def valid(self, today=None):
+        """Filter the validated certificates which have not expired."""
+        today = today or timezone.localdate()
+        return self.filter(models.Q(end__isnull=True) | models.Q(end__gte=today), validation=MedicalCertificate.VALID)
 
 
 class MedicalCertificate(models.Model):
@@ -98,25 +116,68 @@ class MedicalCertificate(models.Model):
         (REJECTED, _("rejected")),
     )
 
+    season = SeasonForeignKey('Season', on_delete=models.PROTECT, editable=False, verbose_name=_("season"))
     player = models.ForeignKey("Player", on_delete=models.CASCADE, verbose_name=_('player'))
     file = models.FileField(_('file'), upload_to=file_upload_to, blank=True)
     validation = models.PositiveSmallIntegerField(_("validation step"),
                                                   choices=CERTIFICATION_STEPS,
-                                                  default=NOT_UPLOADED)
+                                                  default=NOT_UPLOADED,
+                                                  db_index=True)
     start = models.DateField(_('starting date'), auto_now_add=True)
     end = models.DateField(_('ending date'), null=True)
     created = models.DateTimeField(_('creation date'), auto_now_add=True)
 
+    # Certificates of the current season
+    objects = CurrentSeasonManager.from_queryset(MedicalCertificateQuerySet)()
+    # Certificates of every season, a certificate stays valid until its ending date whatever its season
+    all_objects = MedicalCertificateQuerySet.as_manager()
+
     class Meta:
         """Meta class."""
 
         verbose_name = _("medical certificate")
         verbose_name_plural = _("medical certificates")
         ordering = ("player", "start", "validation")
+        indexes = [
+            models.Index(fields=["player", "start", "validation"], name="sm_certificate_player_idx"),
+            # Validation queue, browsed by creation date
+            models.Index(fields=["season", "validation", "created"], name="sm_certificate_queue_idx"),
+            # Certificates of the players of a season
+            models.Index(fields=["season", "player"], name="sm_certificate_season_idx"),
+            # Valid certificates expiring in a window (notify_certificate_expiry)
+            models.Index(fields=["validation", "end"], name="sm_certificate_expiry_idx"),
+        ]
     
-    def is_valid(self):
-        """Check if the medical certificate is valid."""
-        return self.validation == self.CERTIFICATION_VALID
+    def is_valid(self, today=None):
+        """Check if the medical certificate is validated and has not expired, as MedicalCertificateQuerySet.valid()."""
+        today = today or timezone.localdate()
+        return self.validation == self.VALID and (self.end is None or self.end >= today)
+
+
+class CertificateExpiryNotice(models.Model):
+    """Reminder sent to the owner of a player because its medical certificate expires soon.
+
+    The ending date is recorded so that a certificate whose ending date changes gets a new reminder.
+    """
+
+    certificate = models.ForeignKey("MedicalCertificate",
+                                    on_delete=models.CASCADE,
+                                    related_name='expiry_notices',
+                                    verbose_name=_('medical certificate'))
+    end = models.DateField(_('ending date'))
+    sent = models.DateTimeField(_('sending date'), auto_now_add=True)
+
+    def __str__(self):
+        """String representation."""
+        return "{} ({})".format(self.certificate_id, self.end)
+
+    class Meta:
+        """Meta class."""
+
+        verbose_name = _("certificate expiry notice")
+        verbose_name_plural = _("certificate expiry notices")
+        ordering = ("sent",)
+        unique_together = ("certificate", "end")
 
 
 class EmergencyContact(models.Model):
@@ -138,4 +199,39 @@ class EmergencyContact(models.Model):
             RegexValidator(regex=r"^(?:(?:\+|00)33|0)\s*[1-7,9](?:[\s.-]*\d{2}){4}$",
                            message=_("This is not a correct phone number"))
         ]
-    )
\ No newline at end of file
+    )
+
+
+class CertificateUpload(models.Model):
+    """Upload of the file of a medical certificate sent by chunks.
+
+    The chunks are appended to a partial file on disk (see `sports_manager.uploads`). `offset` is the number of bytes
+    received so far, so that an interrupted upload resumes from there.
+    """
+
+    token = models.UUIDField(_("token"), default=uuid.uuid4, unique=True, editable=False)
+    certificate = models.ForeignKey("MedicalCertificate",
+                                    on_delete=models.CASCADE,
+                                    verbose_name=_('medical certificate'))
+    filename = models.CharField(_("file name"), max_length=255)
+    size = models.PositiveIntegerField(_("size"))
+    checksum = models.CharField(_("SHA-256 checksum"), max_length=64)
+    offset = models.PositiveIntegerField(_("received bytes"), default=0)
+    created = models.DateTimeField(_('creation date'), auto_now_add=True)
+    modified = models.DateTimeField(_('last modification date'), auto_now=True)
+
+    def __str__(self):
+        """String representation."""
+        return "{} ({}/{})".format(self.filename, self.offset, self.size)
+
+    class Meta:
+        """Meta class."""
+
+        verbose_name = _("certificate upload")
+        verbose_name_plural = _("certificate uploads")
+        ordering = ("created",)
+
+    @property
+    def is_complete(self):
+        """Return True if every byte has been received."""
+        return self.offset >= self.size
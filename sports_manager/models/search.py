@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Search documents (see `sports_manager.search`)."""
+
+# Django
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+
+class SearchDocument(models.Model):
+    """Denormalized copy of an object searched by the staff.
+
+    The title and the body are indexed after their accents were removed and they were lowercased, the subtitle and
+    the URL are only displayed.
+    """
+
+    PLAYER = 'player'
+    TEAM = 'team'
+    CATEGORY = 'category'
+    GYMNASIUM = 'gymnasium'
+    EMERGENCY_CONTACT = 'emergency-contact'
+
+    KINDS = (
+        (PLAYER, _('player')),
+        (TEAM, _('team')),
+        (CATEGORY, _('category')),
+        (GYMNASIUM, _('gymnasium')),
+        (EMERGENCY_CONTACT, _('emergency contact')),
+    )
+
+    kind = models.CharField(_("kind"), max_length=20, choices=KINDS)
+    object_id = models.PositiveIntegerField(_("object id"))
+    title = models.CharField(_("title"), max_length=255)
+    subtitle = models.CharField(_("subtitle"), max_length=255, blank=True)
+    url = models.CharField(_("URL"), max_length=255, blank=True)
+    # Folded words indexed
+    search_title = models.CharField(_("indexed title"), max_length=255)
+    search_body = models.TextField(_("indexed body"), blank=True)
+    modified = models.DateTimeField(_('last modification date'), auto_now=True)
+
+    def __str__(self):
+        """String representation."""
+        return "{} ({})".format(self.title, self.get_kind_display())
+
+    class Meta:
+        """Meta class."""
+
+        verbose_name = _("search document")
+        verbose_name_plural = _("search documents")
+        ordering = ("kind", "title")
+        unique_together = ("kind", "object_id")
+
+
+class SearchTerm(models.Model):
+    """Trigram of a word of a search document, used when SQLite FTS5 is not available.
+
+    The words are padded with two spaces before being cut, so that the trigrams of a prefix are the first trigrams of
+    the words starting with it.
+    """
+
+    document = models.ForeignKey('SearchDocument', on_delete=models.CASCADE, verbose_name=_("document"))
+    term = models.CharField(_("term"), max_length=3)
+    # Higher for the trigrams of the title
+    weight = models.PositiveSmallIntegerField(_("weight"))
+
+    class Meta:
+        """Meta class."""
+
+        verbose_name = _("search term")
+        verbose_name_plural = _("search terms")
+        unique_together = ("document", "term")
+        indexes = [
+            # Documents having the trigrams of the query, without reading the table
+            models.Index(fields=["term", "document", "weight"], name="sm_search_term_idx"),
+        ]
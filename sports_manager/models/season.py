@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Season implementation."""
+
+# Standard library
+from datetime import date
+
+# Django
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+
+# A season starts in September and ends in August
+SEASON_START_MONTH = 9
+
+
+def current_season():
+    """Return the year the current season started."""
+    today = timezone.localdate()
+    return today.year if today.month >= SEASON_START_MONTH else today.year - 1
+
+
+class SeasonQuerySet(models.QuerySet):
+    """Custom queryset for the Season model."""
+
+    def for_year(self, year):
+        """Return the season starting in `year`, created if needed."""
+        return self.get_or_create(year=year, defaults={
+            'start': date(year, SEASON_START_MONTH, 1),
+            'end': date(year + 1, SEASON_START_MONTH, 1),
+        })[0]
+
+    def current(self):
+        """Return the current season, created if needed."""
+        return self.for_year(current_season())
+
+
+class Season(models.Model):
+    """Season of the club, from September to August.
+
+    The licenses, the medical certificates and the time slots belong to a season. Their default manager only returns
+    the objects of the current season (see `CurrentSeasonManager`), so that the queries of the views and of the admin
+    keep the same cost whatever the number of seasons recorded. Once a season is closed, the
+    `archive_seasons` command moves its objects to the archive tables (see `sports_manager.models.archive`).
+    """
+
+    year = models.PositiveSmallIntegerField(_('year'), unique=True, help_text=_("Year the season starts."))
+    start = models.DateField(_('starting date'))
+    # First day of the next season
+    end = models.DateField(_('ending date'))
+    is_closed = models.BooleanField(_('is closed'), default=False)
+    archived = models.DateTimeField(_('archiving date'), blank=True, null=True, editable=False)
+
+    objects = SeasonQuerySet.as_manager()
+
+    def __str__(self):
+        """String representation."""
+        return "{}-{}".format(self.year, self.year + 1)
+
+    class Meta:
+        """Meta class."""
+
+        verbose_name = _("season")
+        verbose_name_plural = _("seasons")
+        ordering = ("-year",)
+
+    def is_current(self):
+        """Check if the season is the current one."""
+        return self.year == current_season()
+
+
+def current_season_id():
+    """Return the primary key of the current season, created if needed."""
+    return Season.objects.current().pk
+
+
+class SeasonForeignKey(models.ForeignKey):
+    """Foreign key to the season of an object, the current season if it is not set when the object is inserted.
+
+    A callable default would look the current season up (and create it) for every object built, each unbound form
+    included.
+    """
+
+    def pre_save(self, model_instance, add):
+        """Set the current season of the objects inserted without one."""
+        if add and getattr(model_instance, self.attname) is None:
+            setattr(model_instance, self.attname, current_season_id())
+        return super().pre_save(model_instance, add)
+
+
+class CurrentSeasonManager(models.Manager):
+    """Manager only returning the objects of the current season.
+
+    The objects of every season are available through the `all_objects` manager of the models.
+    """
+
+    def get_queryset(self):
+        """Filter the objects of the current season.
+
+        The season is compared by primary key, found by a subquery evaluated once, so that the indexes starting with
+        the season are read without joining the seasons.
+        """
+        season = Season.objects.filter(year=current_season()).order_by().values('pk')
+        return super().get_queryset().filter(season_id=models.Subquery(season))
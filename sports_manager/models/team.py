@@ -3,18 +3,22 @@
 # Standard library
 import logging
 import os
+from datetime import datetime
 
 # Django
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.text import slugify
 from django.utils.translation import ugettext_lazy as _
 
 # Current django project
 from markdownx.models import MarkdownxField
-from markdownx.utils import markdownify
+from sports_manager.models.abstract import RenderedDescriptionModel, ResponsiveImageModel
 from sports_manager.models.gymnasium import Gymnasium
-from sports_manager.storage import OverwriteStorage
+from sports_manager.models.season import CurrentSeasonManager, SeasonForeignKey, current_season_id
+from sports_manager.occupancy import OccupancyIndex
+from sports_manager.storage import ContentAddressedStorage
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +42,7 @@ def image_upload_to(instance, filename):
 
     return path
 
-class Team(models.Model):
+class Team(RenderedDescriptionModel, ResponsiveImageModel):
     """Team model."""
 
     LEVELS = (
@@ -71,6 +75,8 @@ class Team(models.Model):
         ('MI', _('mixed')),
         ('FE', _('female'))
     )
+
+    COUNTERS = ('player_count', 'payed_player_count', 'certified_player_count')
     slug = models.SlugField(_("slug"), unique=True, max_length=128, null=True)
     category = models.ForeignKey('Category', on_delete=models.CASCADE, verbose_name='category')
     name = models.CharField(_("name"), unique=True, max_length=128)
@@ -83,9 +89,16 @@ class Team(models.Model):
                                 verbose_name=_('trainer'))
     url = models.URLField(_("competition URL"))
     description = MarkdownxField(_('description'))
-    img = models.ImageField(_('image'), storage=OverwriteStorage(), upload_to=image_upload_to, blank=True)
+    img = models.ImageField(_('image'), storage=ContentAddressedStorage(), upload_to=image_upload_to, blank=True)
     recrutment = models.BooleanField(_('is recruting'))
 
+    # Licenses of the current season, maintained by the signal handlers (see sports_manager.counters)
+    player_count = models.IntegerField(_('number of players'), default=0, editable=False)
+    payed_player_count = models.IntegerField(_('number of players who payed'), default=0, editable=False)
+    certified_player_count = models.IntegerField(_('number of players with a valid medical certificate'),
+                                                 default=0,
+                                                 editable=False)
+
     def __str__(self):
         """String representation."""
         return "{} - {}".format(self.name, self.get_sex_display())
@@ -96,23 +109,51 @@ class Team(models.Model):
         verbose_name = _("team")
         verbose_name_plural = _("teams")
         ordering = ("sex", "level", "name")
+        # The partial index on the teams having a trainer (Category.has_teams_with_trainer) is created by the
+        # migration 0004_lookup_indexes as Index does not support conditions yet.
     
     def save(self, *args, **kwargs):
-        """Override the save method in order to rewrite the slug field each time we save the object."""
+        """Override the save method in order to rewrite the slug field each time we save the object.
+
+        The counters are left out of the updates, so that saving a team loaded before a license changed does not
+        overwrite the counters updated meanwhile.
+        """
         self.slug = slugify(self.name)
+        self.render_description()
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [field.name for field in self._meta.concrete_fields
+                                       if not field.primary_key and field.name not in self.COUNTERS]
         super().save(*args, **kwargs)
 
-    def description_md(self):
-        """Get the description as HTML (not Mdown)."""
-        return markdownify(self.description)
-
     def get_training_days(self):
-        """Get the list of training days ordered by day."""
-        return self.training_set.all()
+        """Get the list of training days ordered by day, with their gymnasium."""
+        return self.timeslot_set.select_related('gymnasium')
 
     def get_players(self):
-        """Get the list of teamates of the team."""
-        return self.license_set.order_by("last_name")
+        """Get the licenses of the teammates (of the current season), ordered by the name of the player.
+
+        The players and the status of their medical certificate (see `LicenseQuerySet.with_roster_status`) are
+        fetched with the licenses in a single query.
+        """
+        return (self.license_set
+                .select_related('player')
+                .with_roster_status()
+                .order_by('player__last_name', 'player__first_name', 'pk'))
+
+
+class TimeSlotQuerySet(models.QuerySet):
+    """Custom queryset for the TimeSlot model."""
+
+    def occupancy_index(self):
+        """Build the occupancy index of the gymnasiums from the time slots of the queryset."""
+        return OccupancyIndex.from_queryset(self)
+
+    def find_conflicts(self):
+        """Return the pairs of time slots booked in the same gymnasium at overlapping times.
+
+        Each pair is made of two `sports_manager.occupancy.Interval`.
+        """
+        return self.occupancy_index().conflicts()
 
 
 class TimeSlot(models.Model):
@@ -143,6 +184,7 @@ class TimeSlot(models.Model):
         (MATCH, _('match')),
     )
 
+    season = SeasonForeignKey('Season', on_delete=models.PROTECT, editable=False, verbose_name=_("season"))
     type = models.PositiveSmallIntegerField(_("type"), choices=TYPE_PRACTICE)
     team = models.ForeignKey('Team', on_delete=models.CASCADE, verbose_name=_('team'))
     gymnasium = models.ForeignKey('Gymnasium', on_delete=models.CASCADE, verbose_name=_('gymnasium'))
@@ -150,14 +192,49 @@ class TimeSlot(models.Model):
     start = models.TimeField(_("starting time"))
     end = models.TimeField(_("ending time"))
     # gymnasium = models.ForeignKey('dj_gymnasiums.Gymnasium', on_delete=models.CASCADE)
+    created = models.DateTimeField(_('creation date'), auto_now_add=True)
+    modified = models.DateTimeField(_('last modification date'), auto_now=True)
+
+    # Time slots of the current season
+    objects = CurrentSeasonManager.from_queryset(TimeSlotQuerySet)()
+    # Time slots of every season
+    all_objects = TimeSlotQuerySet.as_manager()
 
     def __str__(self):
         """String representation."""
         return "{} - {}".format(self.team.name, self.get_day_display())
 
+    def clean(self):
+        """Check that the time slot ends after it starts and does not overlap another one in the gymnasium.
+
+        Only the time slots of the same season are compared.
+        """
+        if None in (self.gymnasium_id, self.day, self.start, self.end):
+            return
+
+        start = self.start.time() if isinstance(self.start, datetime) else self.start
+        end = self.end.time() if isinstance(self.end, datetime) else self.end
+        if start >= end:
+            raise ValidationError({'end': _("The time slot must end after it starts.")})
+
+        # The season of a new time slot is only set when it is inserted
+        season_id = self.season_id if self.season_id is not None else current_season_id()
+        index = TimeSlot.all_objects.filter(season_id=season_id, gymnasium_id=self.gymnasium_id,
+                                            day=self.day).occupancy_index()
+        overlapping = index.overlapping(self.gymnasium_id, self.day, start, end, exclude=self.pk)
+        if overlapping:
+            teams = Team.objects.filter(pk__in={i.team_id for i in overlapping}).values_list('name', flat=True)
+            raise ValidationError(_("The gymnasium is already booked at this time by: %(teams)s."),
+                                  params={'teams': ", ".join(teams)})
+
     class Meta:
         """Meta class."""
 
         verbose_name = _("time slot")
         verbose_name_plural = _("time slots")
         ordering = ("day", "start", "end")
+        indexes = [
+            models.Index(fields=["season", "day", "start", "end"], name="sm_timeslot_schedule_idx"),
+            # Occupancy of a gymnasium (TimeSlot.clean)
+            models.Index(fields=["season", "gymnasium", "day"], name="sm_timeslot_gymnasium_day_idx"),
+        ]
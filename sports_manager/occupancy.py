@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Weekly occupancy index of the gymnasiums.
+
+The time slots are grouped by (gymnasium, day) and sorted by starting time once. Every lookup is then done with a
+binary search or a sweep line, so checking the whole week costs O(n log n) instead of comparing every pair of slots.
+"""
+
+# Standard library
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, namedtuple
+
+Interval = namedtuple('Interval', ['pk', 'gymnasium_id', 'day', 'start', 'end', 'team_id'])
+
+
+def to_minutes(t):
+    """Return the number of minutes elapsed since midnight."""
+    return t.hour * 60 + t.minute
+
+
+class DayOccupancy:
+    """Time slots of a gymnasium during one day, sorted by starting time."""
+
+    def __init__(self, intervals):
+        """Sort the intervals and compute the running maximum of their ending times."""
+        self.intervals = sorted(intervals, key=lambda i: (i.start, i.end))
+        self._starts = [i.start for i in self.intervals]
+        self._max_ends = []
+        for interval in self.intervals:
+            self._max_ends.append(max(self._max_ends[-1], interval.end) if self._max_ends else interval.end)
+
+    def overlapping(self, start, end, exclude=None):
+        """Return the intervals overlapping [start, end[.
+
+        Two slots that only touch each other (one ends when the other starts) do not overlap.
+        """
+        # Every candidate starts before `end`...
+        hi = bisect_left(self._starts, end)
+        # ... and is after the first interval whose running maximum ending time is after `start`.
+        lo = bisect_right(self._max_ends, start, 0, hi)
+        return [i for i in self.intervals[lo:hi] if i.end > start and i.pk != exclude]
+
+    def conflicts(self):
+        """Return every pair of overlapping intervals using a sweep line."""
+        pairs = []
+        active = []
+        for interval in self.intervals:
+            while active and active[0][0] <= interval.start:
+                heapq.heappop(active)
+            pairs.extend((other, interval) for _, _, other in active)
+            heapq.heappush(active, (interval.end, interval.pk, interval))
+        return pairs
+
+    def blocks(self):
+        """Return the union of the intervals as a list of (start, end) tuples."""
+        merged = []
+        for interval in self.intervals:
+            if merged and interval.start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], interval.end))
+            else:
+                merged.append((interval.start, interval.end))
+        return merged
+
+    def occupied_minutes(self):
+        """Return the number of minutes during which the gymnasium is used."""
+        return sum(to_minutes(end) - to_minutes(start) for start, end in self.blocks())
+
+
+class OccupancyIndex:
+    """Index of the time slots per (gymnasium, day)."""
+
+    def __init__(self, intervals):
+        """Group the intervals by gymnasium and day."""
+        groups = defaultdict(list)
+        for interval in intervals:
+            groups[(interval.gymnasium_id, interval.day)].append(interval)
+        self._days = {key: DayOccupancy(value) for key, value in groups.items()}
+
+    @classmethod
+    def from_queryset(cls, queryset):
+        """Build the index from a TimeSlot queryset using a single query."""
+        return cls(Interval(*row) for row in queryset.order_by().values_list(*Interval._fields))
+
+    def __getitem__(self, key):
+        """Return the occupancy of a (gymnasium, day) tuple."""
+        return self._days.get(key, DayOccupancy([]))
+
+    def overlapping(self, gymnasium_id, day, start, end, exclude=None):
+        """Return the intervals of the gymnasium overlapping [start, end[ during the day."""
+        return self[(gymnasium_id, day)].overlapping(start, end, exclude=exclude)
+
+    def conflicts(self):
+        """Return every pair of overlapping intervals, ordered by gymnasium and day."""
+        return [pair for key in sorted(self._days) for pair in self._days[key].conflicts()]
+
+    def report(self):
+        """Return the occupancy of every (gymnasium, day) ordered by gymnasium and day."""
+        return [
+            {
+                'gymnasium_id': gymnasium_id,
+                'day': day,
+                'slots': len(self._days[(gymnasium_id, day)].intervals),
+                'blocks': self._days[(gymnasium_id, day)].blocks(),
+                'occupied_minutes': self._days[(gymnasium_id, day)].occupied_minutes(),
+            }
+            for gymnasium_id, day in sorted(self._days)
+        ]
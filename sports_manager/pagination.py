@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""Keyset (cursor) pagination.
+
+The pages are fetched with a `WHERE (ordering) > (values of the last row)` condition instead of an OFFSET, so every
+page costs an index range scan whatever its depth. The queryset is ordered by the `Meta.ordering` of the model
+followed by the primary key, which makes the ordering total. The ordering fields must not be nullable.
+
+The position of a page is given by an opaque token encoding the direction and the values of the row it starts
+after (next page) or before (previous page). The token is signed so that the clients can not forge the values put
+in the query.
+"""
+
+# Standard library
+import base64
+import binascii
+import datetime
+import json
+from functools import reduce
+from operator import or_
+
+# Django
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+signer = signing.Signer(salt='sports_manager.pagination')
+
+
+class InvalidCursor(Exception):
+    """Raised when a cursor can not be decoded."""
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """JSON encoder keeping the microseconds of the times, which DjangoJSONEncoder rounds to milliseconds."""
+
+    def default(self, o):
+        """Encode the times with their full precision."""
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(direction, values):
+    """Return the opaque token of a position."""
+    data = json.dumps([direction, values], cls=CursorEncoder, separators=(',', ':'))
+    return signer.sign(base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('='))
+
+
+def decode_cursor(cursor):
+    """Return the direction and the values of a token or raise InvalidCursor."""
+    try:
+        data = signer.unsign(cursor)
+        data = base64.urlsafe_b64decode((data + '=' * (-len(data) % 4)).encode('ascii'))
+        direction, values = json.loads(data.decode('utf-8'))
+    except (signing.BadSignature, binascii.Error, UnicodeError, ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if direction not in (NEXT, PREVIOUS) or not isinstance(values, list):
+        raise InvalidCursor(cursor)
+    return direction, values
+
+
+class CursorPage:
+    """Page of a CursorPaginator, exposing the same API as `django.core.paginator.Page` where it makes sense."""
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor, following=()):
+        """Initialize the page."""
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        # First objects of the next page, fetched with the page
+        self.following = list(following)
+
+    def __repr__(self):
+        """Representation of the page."""
+        return '<CursorPage of {} objects>'.format(len(self.object_list))
+
+    def __len__(self):
+        """Number of objects of the page."""
+        return len(self.object_list)
+
+    def __iter__(self):
+        """Iterate over the objects of the page."""
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        """Return an object of the page."""
+        return self.object_list[index]
+
+    def has_next(self):
+        """Return True if there is a page after this one."""
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        """Return True if there is a page before this one."""
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        """Return True if there are other pages."""
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Paginate a queryset using its ordering as the key.
+
+    `count` runs a COUNT query only when it is used and only if `with_count` is True, it is None otherwise.
+    """
+
+    def __init__(self, queryset, per_page, ordering=None, with_count=False):
+        """Order the queryset by `ordering` (default: `Meta.ordering`) followed by the primary key."""
+        ordering = list(ordering if ordering is not None else queryset.model._meta.ordering)
+        pk_name = queryset.model._meta.pk.name
+        if not any(field.lstrip('-') in ('pk', pk_name) for field in ordering):
+            ordering.append('pk')
+        self.ordering = ordering
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.with_count = with_count
+        self._count = None
+
+    @property
+    def count(self):
+        """Return the total number of objects, or None if counting is disabled."""
+        if not self.with_count:
+            return None
+        if self._count is None:
+            self._count = self.queryset.count()
+        return self._count
+
+    @staticmethod
+    def _value(obj, field):
+        """Return the value of an ordering field of an object."""
+        return reduce(getattr, field.lstrip('-').split('__'), obj)
+
+    def _values(self, obj):
+        """Return the values of the ordering fields of an object."""
+        return [self._value(obj, field) for field in self.ordering]
+
+    def _after(self, values, reverse=False):
+        """Return the condition selecting the rows after (before if `reverse`) the values in the ordering."""
+        conditions = []
+        for i, field in enumerate(self.ordering):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            condition = Q(**{'{}__{}'.format(name, 'lt' if descending else 'gt'): values[i]})
+            for previous, value in zip(self.ordering[:i], values[:i]):
+                condition &= Q(**{previous.lstrip('-'): value})
+            conditions.append(condition)
+        return reduce(or_, conditions)
+
+    def _ordered(self, reverse=False):
+        """Return the queryset ordered by the key, in reverse if asked."""
+        if reverse:
+            return self.queryset.order_by(*[f[1:] if f.startswith('-') else '-' + f for f in self.ordering])
+        return self.queryset.order_by(*self.ordering)
+
+    def page(self, cursor=None, following=0):
+        """Return the page starting at `cursor` (the first page if None) or raise InvalidCursor.
+
+        The `following` first objects of the next page are fetched with the page (`CursorPage.following`), only when
+        browsing forward.
+        """
+        direction, values = decode_cursor(cursor) if cursor else (NEXT, None)
+        if values is not None and len(values) != len(self.ordering):
+            raise InvalidCursor(cursor)
+
+        reverse = direction == PREVIOUS
+        following = 0 if reverse else following
+        queryset = self._ordered(reverse)
+        try:
+            if values is not None:
+                queryset = queryset.filter(self._after(values, reverse))
+            # One more row tells if there is another page in this direction
+            rows = list(queryset[:self.per_page + max(following, 1)])
+        except (ValidationError, ValueError, TypeError):
+            # Values which do not fit the ordering fields
+            raise InvalidCursor(cursor)
+        has_more = len(rows) > self.per_page
+        rows, following = rows[:self.per_page], rows[self.per_page:self.per_page + following]
+        if reverse:
+            rows.reverse()
+
+        if not rows:
+            return CursorPage(rows, self, None, None)
+
+        first, last = self._values(rows[0]), self._values(rows[-1])
+        # Coming from another page means there is a page in the opposite direction
+        has_next = has_more if not reverse else True
+        has_previous = has_more if reverse else values is not None
+        return CursorPage(rows, self,
+                          encode_cursor(NEXT, last) if has_next else None,
+                          encode_cursor(PREVIOUS, first) if has_previous else None,
+                          following)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Reminders sent to the owners of the players whose medical certificate expires soon.
+
+The certificates ending in the window are fetched with one range query on the (validation, end) index, excluding
+the ones already reminded for the same ending date. They are grouped by owner and every owner receives one digest;
+all the digests are sent through a single connection with `send_mass_mail`. The reminders are then recorded, so that
+running the command again only sends the new ones.
+"""
+
+# Standard library
+import logging
+from collections import OrderedDict
+from datetime import timedelta
+
+# Django
+from django.core.mail import send_mass_mail
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils.translation import ugettext as _
+
+# Current django project
+from sports_manager.models import CertificateExpiryNotice, MedicalCertificate
+
+logger = logging.getLogger(__name__)
+
+
+def expiring_certificates(start, end):
+    """Return the valid certificates ending between `start` and `end` whose owner has not been reminded yet."""
+    notices = CertificateExpiryNotice.objects.filter(certificate=OuterRef('pk'), end=OuterRef('end'))
+    # A certificate validated during a previous season may expire during this one
+    return (MedicalCertificate.all_objects
+            .filter(validation=MedicalCertificate.VALID, end__range=(start, end))
+            .annotate(reminded=Exists(notices))
+            .filter(reminded=False)
+            .select_related('player__owner')
+            .order_by('player__owner', 'end', 'player__last_name', 'player__first_name'))
+
+
+def group_by_owner(certificates):
+    """Return the certificates grouped by the owner of their player, skipping the owners without email."""
+    groups = OrderedDict()
+    for certificate in certificates:
+        owner = certificate.player.owner
+        if not owner.email:
+            logger.warning("{} has no email, can not remind the end of certificate {}".format(owner, certificate.pk))
+            continue
+        groups.setdefault(owner, []).append(certificate)
+    return groups
+
+
+def digest(owner, certificates):
+    """Return the (subject, message, from_email, recipient_list) tuple of the digest of an owner."""
+    lines = [
+        _("Hello %(name)s,") % {'name': owner.get_full_name() or owner.get_username()},
+        "",
+        _("The following medical certificates expire soon:"),
+        "",
+    ]
+    lines.extend("- {}: {}".format(certificate.player, certificate.end.isoformat()) for certificate in certificates)
+    lines.extend(["", _("Please upload a new medical certificate before these dates.")])
+    return (_("Medical certificates expiring soon"), "\n".join(lines), None, [owner.email])
+
+
+def send_reminders(today, days, dry_run=False):
+    """Send the digests of the certificates ending in the next `days` days and return the number of emails sent."""
+    groups = group_by_owner(expiring_certificates(today, today + timedelta(days=days)))
+    if dry_run or not groups:
+        return len(groups)
+
+    sent = send_mass_mail([digest(owner, certificates) for owner, certificates in groups.items()])
+    with transaction.atomic():
+        CertificateExpiryNotice.objects.bulk_create([
+            CertificateExpiryNotice(certificate=certificate, end=certificate.end)
+            for certificates in groups.values()
+            for certificate in certificates
+        ])
+    return sent
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""Rollover of a season to the next one.
+
+The weekly schedule of the previous season is copied to the new season, and every player licensed during the
+previous season gets an unpaid renewal license in the same teams. Everything is inserted with `bulk_create` (the
+teams of the licenses directly in the `License.teams` through table) in a single transaction, with a few queries
+whatever the number of teams and players.
+
+The objects already present in the new season are skipped: a time slot of the same team in the same gymnasium at the
+same time, a license of the same player. Running the rollover again only creates what is missing, and a dry run
+returns the objects that would be created without writing anything.
+
+The teams do not belong to a season and are kept as they are.
+"""
+
+# Standard library
+import logging
+
+# Django
+from django.db import transaction
+
+# Current django project
+from sports_manager import counters, search
+from sports_manager.bulk import bulk_create_with_pks
+from sports_manager.cache import API, SCHEDULE, bump_team_versions, bump_versions
+from sports_manager.models import License, SearchDocument, Team, TimeSlot
+
+logger = logging.getLogger(__name__)
+
+Membership = License.teams.through
+
+
+class Rollover:
+    """Objects to create to roll the season `source` over to the season `target`."""
+
+    def __init__(self, source, target):
+        """Compute the time slots and the licenses missing in the target season."""
+        self.source = source
+        self.target = target
+
+        # An unsaved target season has no object yet
+        existing = set(TimeSlot.all_objects
+                       .filter(season_id=target.pk)
+                       .values_list('team_id', 'gymnasium_id', 'day', 'start', 'end'))
+        self.time_slots = [
+            TimeSlot(season=target, type=time_slot.type, team=time_slot.team, gymnasium=time_slot.gymnasium,
+                     day=time_slot.day, start=time_slot.start, end=time_slot.end)
+            for time_slot in (TimeSlot.all_objects
+                              .filter(season=source)
+                              .select_related('team', 'gymnasium')
+                              .order_by('team__name', 'day', 'start', 'pk'))
+            if (time_slot.team_id, time_slot.gymnasium_id, time_slot.day, time_slot.start, time_slot.end)
+            not in existing
+        ]
+
+        renewed = License.all_objects.filter(season_id=target.pk).values('player_id')
+        previous = list(License.all_objects
+                        .filter(season=source)
+                        .exclude(player_id__in=renewed)
+                        .select_related('player')
+                        .order_by('player__last_name', 'player__first_name', 'pk'))
+        teams = {}
+        memberships = Membership.objects.filter(license__in=previous).values_list('license_id', 'team_id')
+        for license_id, team_id in memberships:
+            teams.setdefault(license_id, []).append(team_id)
+
+        # A player licensed twice during the previous season is renewed once, in every team of its licenses
+        self.licenses = []
+        self.teams = {}
+        for license in previous:
+            if license.player_id not in self.teams:
+                self.licenses.append(License(season=target, player=license.player, number=license.number,
+                                             is_payed=False))
+                self.teams[license.player_id] = set()
+            self.teams[license.player_id].update(teams.get(license.pk, ()))
+
+        team_ids = set(time_slot.team_id for time_slot in self.time_slots)
+        team_ids.update(*self.teams.values())
+        self.team_names = dict(Team.objects.filter(pk__in=team_ids).values_list('pk', 'name'))
+
+    def diff(self):
+        """Yield a line for each object to create."""
+        for time_slot in self.time_slots:
+            yield "+ time slot {} {}-{} in {}".format(time_slot, time_slot.start.strftime('%H:%M'),
+                                                       time_slot.end.strftime('%H:%M'), time_slot.gymnasium)
+        for license in self.licenses:
+            names = sorted(self.team_names[team_id] for team_id in self.teams[license.player_id])
+            yield "+ license {} in {}".format(license, ", ".join(names) or "no team")
+
+    def apply(self):
+        """Create the time slots, the licenses and their teams in a single transaction."""
+        with transaction.atomic():
+            TimeSlot.objects.bulk_create(self.time_slots)
+            bulk_create_with_pks(License, self.licenses)
+            Membership.objects.bulk_create([
+                Membership(license_id=license.pk, team_id=team_id)
+                for license in self.licenses
+                for team_id in sorted(self.teams[license.player_id])
+            ])
+            # bulk_create does not send the signals updating the counters, the search documents and the cache
+            if self.target.is_current():
+                counters.recompute(set().union(*self.teams.values()))
+                search.update(SearchDocument.PLAYER, self.teams)
+
+        if self.time_slots:
+            bump_versions([SCHEDULE, API])
+            bump_team_versions(Team.objects
+                               .filter(pk__in={time_slot.team_id for time_slot in self.time_slots})
+                               .values_list('slug', flat=True))
+        logger.info("Season {} rolled over to {}: {} time slot(s), {} license(s)".format(
+            self.source, self.target, len(self.time_slots), len(self.licenses)))
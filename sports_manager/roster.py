@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""Bulk import of a roster of players from a CSV or XLSX file.
+
+Every row holds a player, its emergency contact and optionally its license::
+
+    owner,first_name,last_name,birthday,sex,emergency_first_name,emergency_last_name,emergency_phone,
+    emergency_email,license_number,is_payed,teams
+
+`owner` is the username of the account owning the player and `teams` a list of team slugs separated by `;`.
+
+The rows are read one by one and validated with the forms used by the player creation view. Once the whole file has
+been read, so that a malformed file raises a ValueError before anything is inserted, the valid rows are inserted by
+chunks with `bulk_create`, each chunk in its own transaction. A row that can not be imported is reported and does not
+stop the import.
+"""
+
+# Standard library
+import csv
+import io
+import logging
+import zipfile
+from collections import namedtuple
+from datetime import date, datetime
+
+# Django
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, transaction
+from django.utils.translation import ugettext as _
+
+# Current django project
+from sports_manager import counters, search
+from sports_manager.bulk import bulk_create_with_pks
+from sports_manager.forms.player import EmergencyContactForm, PlayerCreationForm
+from sports_manager.models import License, MedicalCertificate, Player, Season, Team
+from sports_manager.models.player import EmergencyContact
+
+logger = logging.getLogger(__name__)
+
+EMERGENCY_PREFIX = 'emergency_'
+TEAMS_SEPARATOR = ';'
+TRUE_VALUES = ('1', 'true', 'yes', 'y', 'x', 'oui')
+
+RowError = namedtuple('RowError', ['line', 'errors'])
+
+
+class ImportReport:
+    """Result of an import."""
+
+    def __init__(self):
+        """Initialize an empty report."""
+        self.created = 0
+        self.errors = []
+
+    def add_error(self, line, errors):
+        """Record the errors of a row."""
+        self.errors.append(RowError(line, errors))
+
+    def __str__(self):
+        """String representation."""
+        return "{} player(s) imported, {} error(s)".format(self.created, len(self.errors))
+
+
+def _cell(value):
+    """Convert the value of a cell to the string a form expects."""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value).strip()
+
+
+def read_csv(fileobj):
+    """Yield the rows of a binary CSV file as dictionaries."""
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    try:
+        for row in csv.DictReader(text, strict=True):
+            yield {key.strip(): _cell(value) for key, value in row.items() if key}
+    except (csv.Error, UnicodeDecodeError) as e:
+        # A malformed quoting, a file that is not encoded in UTF-8...
+        raise ValueError(_("The file is not a valid CSV file: %(error)s") % {'error': e})
+
+
+def read_xlsx(fileobj):
+    """Yield the rows of the first sheet of a XLSX file as dictionaries."""
+    try:
+        # Third-party
+        import openpyxl
+    except ImportError:
+        raise ValueError(_("openpyxl is required to import XLSX files."))
+
+    try:
+        sheet = openpyxl.load_workbook(fileobj, read_only=True, data_only=True).active
+        rows = sheet.iter_rows(values_only=True)
+        header = [_cell(value) for value in next(rows, [])]
+        for values in rows:
+            yield {key: _cell(value) for key, value in zip(header, values) if key}
+    except (zipfile.BadZipFile, KeyError, SyntaxError) as e:
+        # Not a ZIP archive, a missing part or an invalid XML document (ParseError is a SyntaxError)
+        raise ValueError(_("The file is not a valid XLSX file: %(error)s") % {'error': e})
+
+
+def read_rows(fileobj, filename):
+    """Yield the rows of a roster file according to its extension."""
+    if filename.lower().endswith('.xlsx'):
+        return read_xlsx(fileobj)
+    return read_csv(fileobj)
+
+
+class PendingRow:
+    """Row validated by the forms and waiting to be inserted."""
+
+    def __init__(self, line, row, player, emergency_contact):
+        """Keep the objects built from the row."""
+        self.line = line
+        self.row = row
+        self.player = player
+        self.emergency_contact = emergency_contact
+        self.team_slugs = [slug.strip() for slug in row.get('teams', '').split(TEAMS_SEPARATOR) if slug.strip()]
+
+    @property
+    def has_license(self):
+        """Return True if the row describes a license."""
+        return bool(self.row.get('license_number') or self.team_slugs)
+
+
+class RosterImporter:
+    """Import the rows of a roster by chunks."""
+
+    def __init__(self, chunk_size=500):
+        """Initialize the importer."""
+        self.chunk_size = chunk_size
+        self.report = ImportReport()
+
+    def run(self, rows):
+        """Import the rows and return the report.
+
+        Every row is read and validated before the first insert: the ValueError raised by a malformed file leaves the
+        database unchanged.
+        """
+        # The first line of the file is the header
+        pending_rows = [pending for pending in (self.validate(line, row) for line, row in enumerate(rows, start=2))
+                        if pending is not None]
+        for start in range(0, len(pending_rows), self.chunk_size):
+            self.flush(pending_rows[start:start + self.chunk_size])
+        return self.report
+
+    def validate(self, line, row):
+        """Validate a row with the forms, return None if it is not valid."""
+        player_form = PlayerCreationForm(row)
+        emergency_form = EmergencyContactForm({key[len(EMERGENCY_PREFIX):]: value
+                                               for key, value in row.items()
+                                               if key.startswith(EMERGENCY_PREFIX)})
+
+        errors = {}
+        if not row.get('owner'):
+            errors['owner'] = [_("This field is required.")]
+        if not player_form.is_valid():
+            errors.update(player_form.errors)
+        if not emergency_form.is_valid():
+            errors.update({EMERGENCY_PREFIX + key: value for key, value in emergency_form.errors.items()})
+
+        if errors:
+            self.report.add_error(line, errors)
+            return None
+
+        return PendingRow(line, row, player_form.instance, emergency_form.instance)
+
+    def resolve(self, chunk):
+        """Set the owner of the players, return the teams by slug and drop the rows referencing unknown objects."""
+        usernames = {pending.row['owner'] for pending in chunk}
+        owners = {user.username: user for user in get_user_model().objects.filter(username__in=usernames)}
+        slugs = {slug for pending in chunk for slug in pending.team_slugs}
+        teams = dict(Team.objects.filter(slug__in=slugs).values_list('slug', 'pk')) if slugs else {}
+
+        resolved = []
+        for pending in chunk:
+            errors = {}
+            if pending.row['owner'] not in owners:
+                errors['owner'] = [_("Unknown user '%(username)s'.") % {'username': pending.row['owner']}]
+            unknown = [slug for slug in pending.team_slugs if slug not in teams]
+            if unknown:
+                errors['teams'] = [_("Unknown team '%(slug)s'.") % {'slug': slug} for slug in unknown]
+
+            if errors:
+                self.report.add_error(pending.line, errors)
+            else:
+                pending.player.owner = owners[pending.row['owner']]
+                resolved.append(pending)
+        return resolved, teams
+
+    def flush(self, chunk):
+        """Insert a chunk of rows in a single transaction."""
+        if not chunk:
+            return
+
+        chunk, teams = self.resolve(chunk)
+        if not chunk:
+            return
+
+        try:
+            with transaction.atomic():
+                self.insert(chunk, teams)
+        except DatabaseError as e:
+            logger.exception("Can not import the lines {} to {}".format(chunk[0].line, chunk[-1].line))
+            for pending in chunk:
+                self.report.add_error(pending.line, {'__all__': [str(e)]})
+        else:
+            self.report.created += len(chunk)
+
+    def insert(self, chunk, teams):
+        """Insert the players and the objects linked to them."""
+        bulk_create_with_pks(Player, [pending.player for pending in chunk])
+
+        for pending in chunk:
+            pending.emergency_contact.player = pending.player
+        EmergencyContact.objects.bulk_create([pending.emergency_contact for pending in chunk])
+        # Given explicitly, the default of the field would look the season up for every object
+        season = Season.objects.current()
+        MedicalCertificate.objects.bulk_create([MedicalCertificate(season=season, player=pending.player)
+                                                for pending in chunk])
+
+        with_license = [pending for pending in chunk if pending.has_license]
+        licenses = bulk_create_with_pks(License, [
+            License(season=season,
+                    player=pending.player,
+                    number=pending.row.get('license_number', ''),
+                    is_payed=pending.row.get('is_payed', '').lower() in TRUE_VALUES)
+            for pending in with_license
+        ])
+        License.teams.through.objects.bulk_create([
+            License.teams.through(license_id=license.pk, team_id=teams[slug])
+            for pending, license in zip(with_license, licenses)
+            for slug in set(pending.team_slugs)
+        ])
+        # bulk_create does not send the signals updating the counters of the teams and the search documents
+        counters.recompute({teams[slug] for pending in with_license for slug in pending.team_slugs})
+        search.update_players([pending.player.pk for pending in chunk])
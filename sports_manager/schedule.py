@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Weekly schedule of all the teams in all the gymnasiums."""
+
+# Standard library
+import hashlib
+
+# Django
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.translation import get_language
+
+# Current django project
+from sports_manager.cache import SCHEDULE, get_last_modified, get_version
+from sports_manager.models import TimeSlot
+
+SCHEDULE_KEY = 'sports_manager:schedule:{etag}:{language}'
+
+
+class ScheduleState:
+    """ETag and last modification date of the weekly schedule, computed with a single aggregate query.
+
+    The deletions and the changes of the teams and of the gymnasiums do not change the modification dates of the time
+    slots, the last modification date is the latest of them and of the last change of the `SCHEDULE` counter.
+    """
+
+    def __init__(self):
+        """Compute the state."""
+        state = TimeSlot.objects.order_by().aggregate(count=Count('pk'), modified=Max('modified'))
+        self.last_modified = max(filter(None, [state['modified'], get_last_modified(SCHEDULE)]))
+        self.etag = hashlib.md5("{}:{}:{}".format(
+            get_version(SCHEDULE),
+            state['count'],
+            self.last_modified.isoformat() if self.last_modified else '',
+        ).encode('utf-8')).hexdigest()
+
+    def representation_etag(self, format):
+        """Return the ETag of the schedule rendered in `format` in the active language."""
+        return hashlib.md5("{}:{}:{}".format(self.etag, format, get_language()).encode('utf-8')).hexdigest()
+
+
+def build_schedule():
+    """Fetch every time slot with its team and gymnasium in one query and bucket them by day."""
+    days = [
+        {'day': day, 'name': str(name), 'time_slots': []}
+        for day, name in TimeSlot.DAYS_OF_WEEK
+    ]
+    queryset = TimeSlot.objects.select_related('team', 'gymnasium').order_by('day', 'start', 'end', 'gymnasium__name')
+    for time_slot in queryset:
+        days[time_slot.day]['time_slots'].append({
+            'id': time_slot.pk,
+            'type': str(time_slot.get_type_display()),
+            'start': time_slot.start.strftime('%H:%M'),
+            'end': time_slot.end.strftime('%H:%M'),
+            'team': {'name': time_slot.team.name, 'slug': time_slot.team.slug},
+            'gymnasium': {'name': time_slot.gymnasium.name, 'slug': time_slot.gymnasium.slug},
+        })
+    return days
+
+
+def get_schedule(state):
+    """Return the schedule, built once for each state of the time slots and each language."""
+    return cache.get_or_set(SCHEDULE_KEY.format(etag=state.etag, language=get_language()), build_schedule)
@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+"""Full-text search of the players, teams, categories, gymnasiums and emergency contacts.
+
+Every searched object has a denormalized `SearchDocument`: its title (the name of the object) and its body (the
+names of the related objects, the address of a gymnasium...) are stored with their accents removed and lowercased.
+The handlers of `sports_manager.signals` update the documents of the objects saved or deleted and of the objects
+whose document shows them (the players of a renamed team for example). The teams of a player are the ones of its
+licenses of the current season: the `rebuild_search_index` command builds every document again, meant to be run
+when a season starts and after an import bypassing the signals.
+
+The documents are indexed by one of two backends, chosen by the `search_backend` setting:
+
+* `fts5`: an SQLite FTS5 table created by the migrations when SQLite is compiled with FTS5, ranked with `bm25()`;
+* `trigram`: a table of the trigrams of the words of the documents (`SearchTerm`), for the other databases. A
+  document matches if it has every trigram of the words of the query, ranked by the weight of the trigrams.
+
+With `auto` (the default), FTS5 is used when its table exists. Both backends match the words of the query as
+prefixes of the words of the documents: `dup` finds `Dupont`.
+"""
+
+# Standard library
+import re
+import unicodedata
+from collections import OrderedDict
+
+# Django
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.urls import NoReverseMatch, reverse
+
+# Current django project
+from sports_manager.bulk import bulk_create_with_pks
+from sports_manager.conf import get_setting
+from sports_manager.models import Category, Gymnasium, License, Player, SearchDocument, SearchTerm, Team
+from sports_manager.models.player import EmergencyContact
+
+FTS_TABLE = 'sports_manager_search_fts'
+# Weights of the title and of the body
+TITLE_WEIGHT = 10
+BODY_WEIGHT = 1
+
+INDEXES = OrderedDict()
+
+
+def fold(text):
+    """Return the text without accents and lowercased."""
+    return ''.join(char for char in unicodedata.normalize('NFKD', str(text))
+                   if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text):
+    """Return the folded words of a text."""
+    return re.findall(r'\w+', fold(text))
+
+
+def trigrams(word):
+    """Return the trigrams of a word padded with two spaces, the first ones are the trigrams of its prefixes."""
+    padded = '  ' + word
+    return [padded[i:i + 3] for i in range(len(word))]
+
+
+def get_url(name, **kwargs):
+    """Return the URL of a view of the application, empty if the arguments are invalid (an empty slug)."""
+    try:
+        return reverse('sports-manager:' + name, kwargs=kwargs)
+    except NoReverseMatch:
+        return ''
+
+
+def register(index):
+    """Register an index under its kind."""
+    INDEXES[index.kind] = index
+    return index
+
+
+class Index:
+    """Description of the documents of a model."""
+
+    kind = None
+    model = None
+
+    @classmethod
+    def documents(cls, pks):
+        """Return the documents of the objects, as dictionaries of the fields of SearchDocument."""
+        raise NotImplementedError
+
+
+@register
+class PlayerIndex(Index):
+    """Players, with the teams of their licenses of the current season."""
+
+    kind = SearchDocument.PLAYER
+    model = Player
+
+    @classmethod
+    def documents(cls, pks):
+        """Return the documents of the players."""
+        teams = {}
+        for player_id, name in (License.objects
+                                .filter(player_id__in=pks, teams__isnull=False)
+                                .order_by('teams__name')
+                                .values_list('player_id', 'teams__name')):
+            names = teams.setdefault(player_id, [])
+            if name not in names:
+                names.append(name)
+
+        result = []
+        for player in Player.objects.filter(pk__in=pks).values('pk', 'first_name', 'last_name', 'owner__username'):
+            names = teams.get(player['pk'], [])
+            result.append({
+                'object_id': player['pk'],
+                'title': "{} {}".format(player['first_name'], player['last_name']),
+                'subtitle': ", ".join(names),
+                'url': get_url('player-list', username=player['owner__username']),
+                'body': " ".join(names),
+            })
+        return result
+
+
+@register
+class TeamIndex(Index):
+    """Teams, with their category, level and trainer."""
+
+    kind = SearchDocument.TEAM
+    model = Team
+
+    @classmethod
+    def documents(cls, pks):
+        """Return the documents of the teams."""
+        levels = dict(Team._meta.get_field('level').flatchoices)
+        sexes = dict(Team.SEXES)
+        result = []
+        for team in Team.objects.filter(pk__in=pks).values('pk', 'slug', 'name', 'level', 'sex', 'category__name',
+                                                           'trainer__first_name', 'trainer__last_name'):
+            result.append({
+                'object_id': team['pk'],
+                'title': team['name'],
+                'subtitle': team['category__name'],
+                'url': get_url('team-detail', slug=team['slug']),
+                'body': " ".join(str(value) for value in (team['category__name'],
+                                                          levels.get(team['level'], ''),
+                                                          sexes.get(team['sex'], ''),
+                                                          team['trainer__first_name'] or '',
+                                                          team['trainer__last_name'] or '')),
+            })
+        return result
+
+
+@register
+class CategoryIndex(Index):
+    """Categories, with their summary."""
+
+    kind = SearchDocument.CATEGORY
+    model = Category
+
+    @classmethod
+    def documents(cls, pks):
+        """Return the documents of the categories."""
+        return [{
+            'object_id': category['pk'],
+            'title': category['name'],
+            'subtitle': category['summary'][:255],
+            'url': get_url('category-detail', slug=category['slug']),
+            'body': category['summary'],
+        } for category in Category.objects.filter(pk__in=pks).values('pk', 'slug', 'name', 'summary')]
+
+
+@register
+class GymnasiumIndex(Index):
+    """Gymnasiums, with their address."""
+
+    kind = SearchDocument.GYMNASIUM
+    model = Gymnasium
+
+    @classmethod
+    def documents(cls, pks):
+        """Return the documents of the gymnasiums."""
+        result = []
+        for gymnasium in Gymnasium.objects.filter(pk__in=pks).values('pk', 'slug', 'name', 'address', 'zip_code',
+                                                                     'city'):
+            address = "{}, {} {}".format(gymnasium['address'], gymnasium['zip_code'], gymnasium['city'])
+            result.append({
+                'object_id': gymnasium['pk'],
+                'title': gymnasium['name'],
+                'subtitle': address[:255],
+                'url': get_url('gymnasium-detail', slug=gymnasium['slug']),
+                'body': address,
+            })
+        return result
+
+
+@register
+class EmergencyContactIndex(Index):
+    """Emergency contacts, with their player, phone and email."""
+
+    kind = SearchDocument.EMERGENCY_CONTACT
+    model = EmergencyContact
+
+    @classmethod
+    def documents(cls, pks):
+        """Return the documents of the emergency contacts."""
+        result = []
+        for contact in EmergencyContact.objects.filter(pk__in=pks).values('pk', 'first_name', 'last_name', 'phone',
+                                                                          'email', 'player__first_name',
+                                                                          'player__last_name',
+                                                                          'player__owner__username'):
+            player = "{} {}".format(contact['player__first_name'], contact['player__last_name'])
+            result.append({
+                'object_id': contact['pk'],
+                'title': "{} {}".format(contact['first_name'], contact['last_name']),
+                'subtitle': player,
+                'url': get_url('player-list', username=contact['player__owner__username']),
+                'body': " ".join((player, contact['phone'], contact['email'])),
+            })
+        return result
+
+
+class Fts5Backend:
+    """Index of the documents in an SQLite FTS5 table, whose rowid is the primary key of the document."""
+
+    name = 'fts5'
+
+    def add(self, documents):
+        """Index the documents."""
+        with connection.cursor() as cursor:
+            cursor.executemany('INSERT INTO {} (rowid, title, body) VALUES (%s, %s, %s)'.format(FTS_TABLE),
+                               [(document.pk, document.search_title, document.search_body) for document in documents])
+
+    def remove(self, pks):
+        """Remove the documents from the index."""
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM {} WHERE rowid IN ({})'.format(FTS_TABLE, ', '.join(['%s'] * len(pks))),
+                           list(pks))
+
+    def clear(self):
+        """Remove every document from the index."""
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM {}'.format(FTS_TABLE))
+
+    def search(self, words, kinds, limit):
+        """Return the primary keys and the ranks of the best documents having every word as a prefix."""
+        # The words only contain letters, digits and underscores: quoting them is enough to escape them
+        query = ' '.join('"{}"*'.format(word) for word in words)
+        sql = ('SELECT d.id, -bm25({table}, {title}, {body}) FROM {table} JOIN {documents} d ON d.id = {table}.rowid '
+               'WHERE {table} MATCH %s'.format(table=FTS_TABLE, documents=SearchDocument._meta.db_table,
+                                               title=float(TITLE_WEIGHT), body=float(BODY_WEIGHT)))
+        params = [query]
+        if kinds:
+            sql += ' AND d.kind IN ({})'.format(', '.join(['%s'] * len(kinds)))
+            params.extend(kinds)
+        sql += ' ORDER BY 2 DESC, d.id LIMIT %s'
+        params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+
+class TrigramBackend:
+    """Index of the documents in the table of the trigrams of their words."""
+
+    name = 'trigram'
+
+    def add(self, documents):
+        """Index the documents."""
+        terms = []
+        for document in documents:
+            weights = {}
+            for text, weight in ((document.search_body, BODY_WEIGHT), (document.search_title, TITLE_WEIGHT)):
+                for word in text.split():
+                    for term in trigrams(word):
+                        weights[term] = max(weights.get(term, 0), weight)
+            terms.extend(SearchTerm(document_id=document.pk, term=term, weight=weight)
+                         for term, weight in weights.items())
+        SearchTerm.objects.bulk_create(terms)
+
+    def remove(self, pks):
+        """Remove the documents from the index, their terms are deleted with them."""
+
+    def clear(self):
+        """Remove every document from the index."""
+        SearchTerm.objects.all().delete()
+
+    def search(self, words, kinds, limit):
+        """Return the primary keys and the ranks of the best documents having every trigram of the words."""
+        terms = {term for word in words for term in trigrams(word)}
+        queryset = SearchTerm.objects.filter(term__in=terms)
+        if kinds:
+            queryset = queryset.filter(document__kind__in=kinds)
+        return list(queryset
+                    .values('document_id')
+                    .annotate(count=Count('pk'), rank=Sum('weight'))
+                    .filter(count=len(terms))
+                    .order_by('-rank', 'document_id')
+                    .values_list('document_id', 'rank')[:limit])
+
+
+_fts5_tables = {}
+
+
+def fts5_available():
+    """Return True if the FTS5 table has been created by the migrations."""
+    if connection.vendor != 'sqlite':
+        return False
+    name = connection.settings_dict['NAME']
+    if name not in _fts5_tables:
+        with connection.cursor() as cursor:
+            _fts5_tables[name] = FTS_TABLE in connection.introspection.table_names(cursor)
+    return _fts5_tables[name]
+
+
+def get_backend():
+    """Return the backend chosen by the `search_backend` setting."""
+    name = get_setting('search_backend')
+    if name == 'auto':
+        name = 'fts5' if fts5_available() else 'trigram'
+    return Fts5Backend() if name == 'fts5' else TrigramBackend()
+
+
+def update(kind, pks):
+    """Build the documents of the objects of a kind again, removing the ones of the objects which do not exist."""
+    pks = set(pks)
+    if not pks:
+        return
+    backend = get_backend()
+    with transaction.atomic():
+        existing = list(SearchDocument.objects.filter(kind=kind, object_id__in=pks).values_list('pk', flat=True))
+        if existing:
+            backend.remove(existing)
+            SearchDocument.objects.filter(pk__in=existing).delete()
+        documents = bulk_create_with_pks(SearchDocument, [
+            SearchDocument(kind=kind, object_id=values['object_id'], title=values['title'][:255],
+                           subtitle=values['subtitle'][:255], url=values['url'],
+                           search_title=' '.join(tokenize(values['title']))[:255],
+                           search_body=' '.join(tokenize(values['body'])))
+            for values in INDEXES[kind].documents(pks)
+        ])
+        backend.add(documents)
+
+
+def update_players(pks):
+    """Update the documents of the players and of their emergency contacts, which show their name."""
+    update(SearchDocument.PLAYER, pks)
+    update(SearchDocument.EMERGENCY_CONTACT,
+           EmergencyContact.objects.filter(player_id__in=pks).values_list('pk', flat=True))
+
+
+def rebuild(chunk_size=1000):
+    """Build every document again and return how many were built."""
+    with transaction.atomic():
+        get_backend().clear()
+        SearchDocument.objects.all().delete()
+        for kind, index in INDEXES.items():
+            pks = list(index.model._default_manager.order_by('pk').values_list('pk', flat=True))
+            for start in range(0, len(pks), chunk_size):
+                update(kind, pks[start:start + chunk_size])
+    return SearchDocument.objects.count()
+
+
+def search(query, kinds=None, limit=None):
+    """Return the documents matching every word of the query, the best ranked first, as dictionaries."""
+    words = tokenize(query)[:10]
+    if not words:
+        return []
+    limit = limit or get_setting('search_limit')
+    ranks = OrderedDict(get_backend().search(words, kinds, limit))
+    documents = SearchDocument.objects.in_bulk(list(ranks))
+    return [{
+        'type': documents[pk].kind,
+        'title': documents[pk].title,
+        'subtitle': documents[pk].subtitle,
+        'url': documents[pk].url,
+        'rank': round(float(rank), 3),
+    } for pk, rank in ranks.items() if pk in documents]
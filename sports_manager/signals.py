@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""Signal handlers of the application."""
+
+# Standard library
+import logging
+
+# Django
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+# Current django project
+from sports_manager import counters, search
+from sports_manager.cache import API, SCHEDULE, bump_team_versions, bump_versions
+from sports_manager.models import (
+    Category, Gymnasium, License, MedicalCertificate, Player, SearchDocument, Team, TimeSlot
+)
+from sports_manager.models.player import EmergencyContact
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def invalidate_team(sender, instance, **kwargs):
+    """Invalidate the fragments of the team."""
+    bump_team_versions([instance.slug])
+
+
+@receiver(pre_save, sender=TimeSlot)
+def remember_time_slot_team(sender, instance, **kwargs):
+    """Remember the team of a time slot before it is updated, in case the time slot moves to another team."""
+    if instance.pk is not None:
+        instance._previous_team_id = (TimeSlot.all_objects
+                                      .filter(pk=instance.pk)
+                                      .values_list('team_id', flat=True)
+                                      .first())
+
+
+@receiver(post_save, sender=TimeSlot)
+@receiver(post_delete, sender=TimeSlot)
+def invalidate_time_slot_team(sender, instance, **kwargs):
+    """Invalidate the fragments of the team of the time slot."""
+    teams = {instance.team_id, getattr(instance, '_previous_team_id', None)}
+    bump_team_versions(Team.objects.filter(pk__in=teams - {None}).values_list('slug', flat=True))
+
+
+@receiver(post_save, sender=Gymnasium)
+@receiver(post_delete, sender=Gymnasium)
+def invalidate_gymnasium_teams(sender, instance, **kwargs):
+    """Invalidate the fragments of the teams having a time slot in the gymnasium."""
+    bump_team_versions(Team.objects.filter(timeslot__gymnasium=instance).values_list('slug', flat=True))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_teams(sender, instance, **kwargs):
+    """Invalidate the fragments of the teams of the category."""
+    bump_team_versions(Team.objects.filter(category=instance).values_list('slug', flat=True))
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_trainer_teams(sender, instance, **kwargs):
+    """Invalidate the fragments of the teams of the trainer, which show their name."""
+    bump_team_versions(Team.objects.filter(trainer=instance).values_list('slug', flat=True))
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+@receiver(post_save, sender=TimeSlot)
+@receiver(post_delete, sender=TimeSlot)
+@receiver(post_save, sender=Gymnasium)
+@receiver(post_delete, sender=Gymnasium)
+def invalidate_schedule(sender, instance, **kwargs):
+    """Invalidate the weekly schedule."""
+    bump_versions([SCHEDULE])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+@receiver(post_save, sender=TimeSlot)
+@receiver(post_delete, sender=TimeSlot)
+@receiver(post_save, sender=Gymnasium)
+@receiver(post_delete, sender=Gymnasium)
+def invalidate_api(sender, instance, **kwargs):
+    """Invalidate the responses of the JSON API."""
+    bump_versions([API])
+
+
+@receiver(pre_save, sender=License)
+def remember_license_contributions(sender, instance, **kwargs):
+    """Remember what an existing license adds to the counters of its teams before it is updated."""
+    if instance.pk is not None:
+        instance._previous_contributions = counters.contributions(license_id=instance.pk)
+
+
+@receiver(post_save, sender=License)
+def update_license_counters(sender, instance, created, **kwargs):
+    """Update the counters of the teams of the license, a new license does not have teams yet."""
+    if not created:
+        after = counters.contributions(license_id=instance.pk)
+        counters.apply(counters.difference(getattr(instance, '_previous_contributions', {}), after))
+
+
+@receiver(m2m_changed, sender=License.teams.through)
+def update_membership_counters(sender, instance, action, reverse, pk_set, **kwargs):
+    """Count the licenses added to a team and uncount the ones removed from it."""
+    if action not in ('post_add', 'pre_remove', 'pre_clear') or (action == 'post_add' and not pk_set):
+        return
+
+    # The instance is a team and the primary keys are licenses for the changes made from the team
+    instance_field, pk_field = ('team_id', 'license_id') if reverse else ('license_id', 'team_id')
+    filters = {instance_field: instance.pk}
+    if pk_set is not None:
+        filters['{}__in'.format(pk_field)] = pk_set
+    counters.apply(counters.contributions(**filters), sign=1 if action == 'post_add' else -1)
+
+
+@receiver(pre_delete, sender=License)
+def remember_license_teams(sender, instance, **kwargs):
+    """Remember the teams of a license before it is deleted."""
+    instance._counter_teams = set(License.teams.through.objects
+                                  .filter(license_id=instance.pk)
+                                  .values_list('team_id', flat=True))
+
+
+@receiver(pre_save, sender=MedicalCertificate)
+def remember_certification(sender, instance, **kwargs):
+    """Remember whether the player (and the previous one if it changes) had a valid certificate."""
+    players = {instance.player_id}
+    if instance.pk is not None:
+        players.update(MedicalCertificate.all_objects.filter(pk=instance.pk).values_list('player_id', flat=True))
+    instance._previous_certification = counters.certification(players)
+
+
+@receiver(post_save, sender=MedicalCertificate)
+def update_certified_counters(sender, instance, **kwargs):
+    """Update the counters of the teams of the players whose certification changed."""
+    counters.update_certified(getattr(instance, '_previous_certification', {}))
+
+
+@receiver(pre_delete, sender=MedicalCertificate)
+def remember_certificate_teams(sender, instance, **kwargs):
+    """Remember the teams of the player of a certificate before it is deleted."""
+    instance._counter_teams = counters.teams_of_players([instance.player_id])
+
+
+@receiver(post_delete, sender=License)
+@receiver(post_delete, sender=MedicalCertificate)
+def recompute_counters(sender, instance, **kwargs):
+    """Compute the counters of the teams of a deleted license or certificate again."""
+    counters.recompute(getattr(instance, '_counter_teams', set()))
+
+
+def license_players(license_ids):
+    """Return the primary keys of the players of the licenses."""
+    return License.all_objects.filter(pk__in=license_ids).values_list('player_id', flat=True)
+
+
+@receiver(post_save, sender=Player)
+def index_player(sender, instance, **kwargs):
+    """Update the documents of the player and of its emergency contacts, which show its name."""
+    search.update_players([instance.pk])
+
+
+@receiver(post_save, sender=Team)
+def index_team(sender, instance, **kwargs):
+    """Update the documents of the team and of its players, which show its name."""
+    search.update(SearchDocument.TEAM, [instance.pk])
+    search.update(SearchDocument.PLAYER, instance.license_set.values_list('player_id', flat=True))
+
+
+@receiver(pre_delete, sender=Team)
+def remember_team_players(sender, instance, **kwargs):
+    """Remember the players of a team before it is deleted."""
+    instance._search_players = set(instance.license_set.values_list('player_id', flat=True))
+
+
+@receiver(post_delete, sender=Team)
+def unindex_team(sender, instance, **kwargs):
+    """Remove the document of the team and update the ones of its players."""
+    search.update(SearchDocument.TEAM, [instance.pk])
+    search.update(SearchDocument.PLAYER, getattr(instance, '_search_players', set()))
+
+
+@receiver(post_save, sender=Category)
+def index_category(sender, instance, **kwargs):
+    """Update the documents of the category and of its teams, which show its name."""
+    search.update(SearchDocument.CATEGORY, [instance.pk])
+    search.update(SearchDocument.TEAM, instance.team_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Gymnasium)
+@receiver(post_save, sender=EmergencyContact)
+@receiver(post_delete, sender=Player)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Gymnasium)
+@receiver(post_delete, sender=EmergencyContact)
+def index_object(sender, instance, **kwargs):
+    """Update (or remove) the document of the object."""
+    kind = next(kind for kind, index in search.INDEXES.items() if index.model is sender)
+    search.update(kind, [instance.pk])
+
+
+@receiver(post_save, sender=License)
+@receiver(post_delete, sender=License)
+def index_license_player(sender, instance, **kwargs):
+    """Update the document of the player of the license, which shows its teams."""
+    search.update(SearchDocument.PLAYER, [instance.player_id])
+
+
+@receiver(m2m_changed, sender=License.teams.through)
+def index_membership_players(sender, instance, action, reverse, pk_set, **kwargs):
+    """Update the documents of the players whose teams changed."""
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            search.update(SearchDocument.PLAYER, [instance.player_id])
+    elif action == 'pre_clear':
+        # The instance is a team, its licenses are not known anymore after the change
+        instance._search_players = set(instance.license_set.values_list('player_id', flat=True))
+    elif action == 'post_clear':
+        search.update(SearchDocument.PLAYER, getattr(instance, '_search_players', set()))
+    elif action in ('post_add', 'post_remove'):
+        search.update(SearchDocument.PLAYER, license_players(pk_set))
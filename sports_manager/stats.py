@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Statistics of the licenses of the current season for the committee.
+
+Every figure is computed by the database with conditional aggregates (`Count(filter=Q(...))`), in a handful of
+queries whatever the number of licenses:
+
+* one query annotating the categories with their licenses;
+* one aggregate over the licenses for the totals, the sexes and the age brackets of the categories;
+* one aggregate over the medical certificates of the licensed players;
+* one query reading the counters stored on the teams (see `sports_manager.counters`).
+
+The age brackets are the ages of the categories: a player belongs to the bracket of a category if its age today is
+between the minimal and the maximal age of the category. The statistics are cached for `stats_timeout` seconds (the
+setting of the application).
+"""
+
+# Django
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.translation import get_language
+
+# Current django project
+from sports_manager.conf import get_setting
+from sports_manager.models import Category, License, MedicalCertificate, Player, Team
+from sports_manager.models.season import current_season
+
+STATS_KEY = 'sports_manager:stats:{season}:{today}:{language}'
+
+
+def years_before(day, years):
+    """Return the same day `years` years before, the 28th of February for the 29th."""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def age_condition(today, min_age, max_age=None, prefix='player__'):
+    """Return the condition selecting the players whose age is between `min_age` and `max_age` (included)."""
+    condition = Q(**{prefix + 'birthday__lte': years_before(today, min_age)})
+    if max_age is not None:
+        # Still `max_age` years old the day before their next birthday
+        condition &= Q(**{prefix + 'birthday__gt': years_before(today, max_age + 1)})
+    return condition
+
+
+def percentage(part, total):
+    """Return the percentage of a part of a total, 0 if the total is 0."""
+    return round(100 * part / total) if total else 0
+
+
+def build_stats(season, today):
+    """Compute the statistics of the licenses of a season."""
+    licenses = License.all_objects.for_season(season)
+    certified = Q(player__in=MedicalCertificate.all_objects.valid(today).values('player_id'))
+
+    season_filter = Q(team__license__season__year=season)
+    categories = list(Category.objects.order_by('min_age', 'name').annotate(
+        licenses=Count('team__license', filter=season_filter, distinct=True),
+        payed=Count('team__license', filter=season_filter & Q(team__license__is_payed=True), distinct=True),
+        **{'sex_{}'.format(sex): Count('team__license',
+                                       filter=season_filter & Q(team__license__player__sex=sex),
+                                       distinct=True)
+           for sex, _ in Player.SEXES}
+    ).values('pk', 'name', 'slug', 'min_age', 'max_age', 'licenses', 'payed',
+             *['sex_{}'.format(sex) for sex, _ in Player.SEXES]))
+
+    brackets = {'bracket_{}'.format(category['pk']): Count('pk', filter=age_condition(today, category['min_age'],
+                                                                                       category['max_age']))
+                for category in categories}
+    sexes = {'sex_{}'.format(sex): Count('pk', filter=Q(player__sex=sex)) for sex, _ in Player.SEXES}
+    totals = licenses.aggregate(
+        total=Count('pk'),
+        payed=Count('pk', filter=Q(is_payed=True)),
+        certified=Count('pk', filter=certified),
+        without_team=Count('pk', filter=~Q(pk__in=License.teams.through.objects.values('license_id'))),
+        **sexes,
+        **brackets
+    )
+
+    certificates = MedicalCertificate.all_objects.filter(player__in=licenses.values('player_id')).aggregate(
+        **{'validation_{}'.format(step): Count('pk', filter=Q(validation=step))
+           for step, _ in MedicalCertificate.CERTIFICATION_STEPS},
+        expired=Count('pk', filter=Q(validation=MedicalCertificate.VALID, end__lt=today))
+    )
+
+    return {
+        'season': season,
+        'date': today,
+        'total': totals['total'],
+        'payed': totals['payed'],
+        'payed_percentage': percentage(totals['payed'], totals['total']),
+        'certified': totals['certified'],
+        'certified_percentage': percentage(totals['certified'], totals['total']),
+        'without_team': totals['without_team'],
+        'sexes': [{'sex': sex, 'name': str(name), 'count': totals['sex_{}'.format(sex)]}
+                  for sex, name in Player.SEXES],
+        'categories': [{
+            'name': category['name'],
+            'slug': category['slug'],
+            'min_age': category['min_age'],
+            'max_age': category['max_age'],
+            'licenses': category['licenses'],
+            'payed': category['payed'],
+            'payed_percentage': percentage(category['payed'], category['licenses']),
+            'sexes': [category['sex_{}'.format(sex)] for sex, _ in Player.SEXES],
+            # Licensed players whose age is in the bracket of the category, whatever their teams
+            'bracket': totals['bracket_{}'.format(category['pk'])],
+        } for category in categories],
+        'certificates': [{'validation': step, 'name': str(name), 'count': certificates['validation_{}'.format(step)]}
+                         for step, name in MedicalCertificate.CERTIFICATION_STEPS],
+        'expired_certificates': certificates['expired'],
+        'teams': list(Team.objects.order_by('name').values('name', 'slug', *Team.COUNTERS)),
+    }
+
+
+def get_stats():
+    """Return the statistics of the current season, computed at most once every `stats_timeout` seconds."""
+    season, today = current_season(), timezone.localdate()
+    key = STATS_KEY.format(season=season, today=today.isoformat(), language=get_language())
+    return cache.get_or_set(key, lambda: build_stats(season, today), get_setting('stats_timeout'))
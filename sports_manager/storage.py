@@ -1,32 +1,120 @@
 # Standard library
+import hashlib
 import os
+import re
+import tempfile
 
 # Django
-from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
 from django.core.files.storage import FileSystemStorage
 
+# Length of the digest inserted in the names of the files
+HASH_LENGTH = 16
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{%d}(\.[^./]*)?$' % HASH_LENGTH)
 
-class OverwriteStorage(FileSystemStorage):
 
-    def get_available_name(self, name, max_length):
-        """Returns a filename that's free on the target storage system, and
-        available for new content to be written to.
+def is_content_addressed(name):
+    """Return True if the name of a file contains the hash of its content."""
+    return HASHED_NAME_RE.search(name) is not None
 
-        Found at http://djangosnippets.org/snippets/976/
 
-        This file storage solves overwrite on upload problem. Another
-        proposed solution was to override the save method on the model
-        like so (from https://code.djangoproject.com/ticket/11663):
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage naming the files after the hash of their content.
 
-        def save(self, *args, **kwargs):
-            try:
-                this = MyModelName.objects.get(id=self.id)
-                if this.MyImageFieldName != self.MyImageFieldName:
-                    this.MyImageFieldName.delete()
-            except: pass
-            super(MyModelName, self).save(*args, **kwargs)
+    The SHA-256 digest of the content is computed while the upload is streamed into a temporary file created in the
+    destination directory, which is then renamed to `<name>.<digest><ext>`. The rename is atomic, so a file is either
+    missing or complete, and uploading the same content twice under the same name stores it once.
+
+    Since the content of a name never changes, the files can be served with far-future cache headers (see
+    `sports_manager.views.media.serve`). With nginx::
+
+        location ~ "\\.[0-9a-f]{16}\\.[^./]+$" {
+            expires max;
+            add_header Cache-Control "public, immutable";
+        }
+    """
+
+    def get_available_name(self, name, max_length=None):
+        """Return the name, truncated so that it still fits in `max_length` once the digest is inserted.
+
+        The final name is only known once the content has been hashed, the name is not checked for existence.
         """
-        # If the filename already exists, remove it as if it was a true file system
-        if self.exists(name):
-            os.remove(os.path.join(settings.MEDIA_ROOT, name))
+        # The dot and the digest inserted by `hashed_name`
+        hashed_length = len(name) + 1 + HASH_LENGTH
+        if max_length and hashed_length > max_length:
+            dir_name, file_name = os.path.split(name)
+            file_root, file_ext = os.path.splitext(file_name)
+            file_root = file_root[:-(hashed_length - max_length)]
+            if not file_root:
+                raise SuspiciousFileOperation(
+                    'Storage can not find an available filename for "%s". Please make sure that the corresponding '
+                    'file field allows sufficient "max_length".' % name
+                )
+            name = os.path.join(dir_name, '{}{}'.format(file_root, file_ext))
+        return name
+
+    def hashed_name(self, name, digest):
+        """Insert the digest in the name of the file."""
+        root, ext = os.path.splitext(name)
+        return '{}.{}{}'.format(root, digest[:HASH_LENGTH], ext)
+
+    def _make_directory(self, directory):
+        """Create the directory and its parents if they do not exist."""
+        if self.directory_permissions_mode is not None:
+            # os.makedirs applies the global umask, so it is reset for consistency with file_permissions_mode
+            old_umask = os.umask(0)
+            try:
+                os.makedirs(directory, self.directory_permissions_mode, exist_ok=True)
+            finally:
+                os.umask(old_umask)
+        else:
+            os.makedirs(directory, exist_ok=True)
+
+    def _save(self, name, content):
+        """Stream the content into a temporary file while hashing it, then rename it after its digest."""
+        directory = os.path.dirname(self.path(name))
+        self._make_directory(directory)
+
+        digest = hashlib.sha256()
+        fd, temporary_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in content.chunks():
+                    if not isinstance(chunk, bytes):
+                        chunk = chunk.encode('utf-8')
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            name = self.hashed_name(name, digest.hexdigest())
+            full_path = self.path(name)
+            if os.path.exists(full_path):
+                # Same name, same content: the file is already stored
+                os.remove(temporary_path)
+            else:
+                if self.file_permissions_mode is not None:
+                    os.chmod(temporary_path, self.file_permissions_mode)
+                else:
+                    # mkstemp creates the files readable by their owner only
+                    umask = os.umask(0)
+                    os.umask(umask)
+                    os.chmod(temporary_path, 0o666 & ~umask)
+                os.replace(temporary_path, full_path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+        # Store filenames with forward slashes, even on Windows.
+        return name.replace('\\', '/')
+
+
+class OverwriteStorage(FileSystemStorage):
+    """File system storage replacing the existing files.
+
+    Replaced by `ContentAddressedStorage`, only kept because the initial migration references it.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        """Remove the file with the same name so that the new one takes its place."""
+        self.delete(name)
         return name
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""Template helpers for the responsive variants of the images.
+
+Usage::
+
+    {% load sports_manager_images %}
+    {% responsive_image team "(min-width: 768px) 25vw, 100vw" %}
+    <img src="{{ team|thumbnail_url }}" srcset="{{ team|srcset:'jpeg' }}">
+"""
+
+# Django
+from django import template
+from django.utils.html import format_html, format_html_join
+
+register = template.Library()
+
+
+@register.filter
+def srcset(obj, fmt):
+    """Return the `srcset` attribute of the variants of a format."""
+    return obj.srcset(fmt)
+
+
+@register.filter
+def thumbnail_url(obj):
+    """Return the URL of the smallest variant of the image."""
+    return obj.thumbnail_url()
+
+
+@register.simple_tag
+def responsive_image(obj, sizes='100vw', css_class='', alt=''):
+    """Render a `<picture>` element offering every variant of the image of the object."""
+    sources = format_html_join('', '<source type="{}" srcset="{}" sizes="{}">',
+                               ((source['type'], source['srcset'], sizes) for source in obj.sources()))
+    return format_html('<picture>{}<img class="{}" src="{}" alt="{}"></picture>',
+                       sources, css_class, obj.thumbnail_url(), alt or str(obj))
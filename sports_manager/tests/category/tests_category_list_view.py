@@ -4,9 +4,14 @@
 """Tests the views."""
 
 # Django
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+# Current django project
+from sports_manager.models import Category, Team
+
 from ..helper import create_category, create_user
 
 
@@ -110,3 +115,34 @@ class TestCategoryListViewAsSuperuser(TestCase):
         self.assertEqual(r.status_code, 200)
         self.assertEqual(len(r.context['category_list']), 1)
         self.assertIn(c, r.context['category_list'])
+
+
+class TestCategoryListViewQueries(TestCase):
+    """Tests the number of queries run by the ListView for Category."""
+
+    def get_list(self):
+        """Get the list and check the trainer flag of every category."""
+        r = self.client.get(reverse('sports-manager:category-list'))
+        self.assertEqual(r.status_code, 200)
+        for c in r.context['category_list']:
+            c.has_teams_with_trainer()
+        return r
+
+    def tests_constant_number_of_queries(self):
+        """Tests."""
+        user = create_user()[1]
+        Team.objects.create(category=Category.objects.create(name="0", min_age=18), name="0", trainer=user,
+                            recrutment=True)
+
+        with CaptureQueriesContext(connection) as queries:
+            r = self.get_list()
+        self.assertTrue(r.context['category_list'][0].has_teams_with_trainer())
+
+        for i in range(1, 20):
+            c = Category.objects.create(name=str(i), min_age=18)
+            Team.objects.create(category=c, name=str(i), trainer=user if i % 2 else None, recrutment=True)
+
+        with self.assertNumQueries(len(queries)):
+            r = self.get_list()
+        self.assertEqual(len(r.context['category_list']), 20)
+        self.assertEqual(sum(c.has_teams_with_trainer() for c in r.context['category_list']), 11)
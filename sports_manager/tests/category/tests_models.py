@@ -3,8 +3,14 @@
 
 """Tests for `sports-manager` models module."""
 
+# Standard library
+from io import StringIO
+from unittest import mock, skipUnless
+
 # Django
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
 
 # Current django project
@@ -69,6 +75,44 @@ class TestCategoryModel(TestCase):
             self.assertIn(test[1], c.description_md())
             self.assertIn(test[2], c.description_md())
 
+    def test_description_rendered_on_save(self):
+        """Test that the HTML of the description is stored when the category is saved."""
+        c = Category.objects.create(name="Toto", min_age=18, description="# Toto")
+        c.refresh_from_db()
+        self.assertIn("<h1>", c.description_html)
+        self.assertEqual(len(c.description_hash), 64)
+
+        c.description = "*Toto*"
+        c.save()
+        c.refresh_from_db()
+        self.assertIn("<em>", c.description_html)
+
+    def test_description_not_rendered_if_unchanged(self):
+        """Test that the markdown is not parsed again when the description did not change."""
+        c = Category.objects.create(name="Toto", min_age=18, description="# Toto")
+
+        with mock.patch('sports_manager.models.abstract.markdownify') as markdownify:
+            c.summary = "Hello"
+            c.save()
+            c.description_md()
+            Category.objects.get(pk=c.pk).description_md()
+        markdownify.assert_not_called()
+
+    def test_render_descriptions_command(self):
+        """Test that the command backfills the rows that were never rendered."""
+        c = Category.objects.create(name="Toto", min_age=18, description="# Toto")
+        Category.objects.filter(pk=c.pk).update(description_html='', description_hash='')
+
+        out = StringIO()
+        call_command('render_descriptions', stdout=out)
+        c.refresh_from_db()
+        self.assertIn("<h1>", c.description_html)
+        self.assertIn("categories: 1 description(s) rendered", out.getvalue())
+
+        out = StringIO()
+        call_command('render_descriptions', stdout=out)
+        self.assertIn("categories: 0 description(s) rendered", out.getvalue())
+
     def test_has_teams_with_trainer(self):
         """Test the description_md function of post class."""
         c = Category.objects.create(min_age=18)
@@ -85,6 +129,28 @@ class TestCategoryModel(TestCase):
         self.assertEqual(c.team_set.count(), 2)
         self.assertTrue(c.has_teams_with_trainer())
 
+    def test_has_teams_with_trainer_annotated(self):
+        """Test that the annotation of the queryset is used instead of a new query."""
+        u = get_user_model().objects.create(first_name="Toto", last_name="Toto")
+        a = Category.objects.create(name="a", min_age=18)
+        b = Category.objects.create(name="b", min_age=18)
+        Team.objects.create(category=a, name='a', recrutment=True, trainer=u)
+        Team.objects.create(category=b, name='b', recrutment=True)
+
+        categories = list(Category.objects.with_trainer_flags())
+        with self.assertNumQueries(0):
+            self.assertEqual([c.has_teams_with_trainer() for c in categories], [True, False])
+
+    @skipUnless(connection.vendor == 'sqlite', "EXPLAIN QUERY PLAN is specific to SQLite")
+    def test_has_teams_with_trainer_uses_partial_index(self):
+        """Test that the lookup of the teams with a trainer uses the partial index."""
+        c = Category.objects.create(min_age=18)
+        sql, params = Team.objects.filter(category=c, trainer__isnull=False).query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("sm_team_with_trainer_idx", plan)
+
     def test_path_image_upload_to(self):
         """Test image_upload_to function for Category."""
         c = Category.objects.create(min_age=18)
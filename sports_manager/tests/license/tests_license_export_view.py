@@ -0,0 +1,99 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the views."""
+
+# Standard library
+import csv
+from datetime import date
+from io import StringIO
+
+# Django
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# Current django project
+from sports_manager.models import License, Player, Season, Team
+from sports_manager.views.license import LicenseExportView
+
+from ..helper import create_player, create_team, create_user
+
+
+class TestLicenseExportView(TestCase):
+    """Tests the export of the licenses."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create the users, a team and the licenses."""
+        cls.owner_info, cls.owner = create_user()
+        cls.staff_info, cls.staff = create_user('staff', staff=True)
+        cls.team = create_team()[1]
+        cls.other = Team.objects.create(category=cls.team.category, name="Other", recrutment=True)
+        cls.player = create_player(owner=cls.owner)[1]
+
+        cls.payed = License.objects.create(player=cls.player, number="1", is_payed=True)
+        cls.payed.teams.set([cls.team, cls.other])
+        cls.not_payed = License.objects.create(player=cls.player, number="2", is_payed=False)
+        cls.not_payed.teams.set([cls.other])
+        License.objects.filter(pk=cls.not_payed.pk).update(season=Season.objects.for_year(1999))
+
+    def export(self, **params):
+        """Get the export and parse it."""
+        r = self.client.get(reverse('sports-manager:license-export'), params)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r['Content-Type'], 'text/csv')
+        return list(csv.DictReader(StringIO(b"".join(r.streaming_content).decode('utf-8'))))
+
+    def test_anonymous(self):
+        """Tests."""
+        r = self.client.get(reverse('sports-manager:license-export'))
+        self.assertEqual(r.status_code, 403)
+
+    def test_logged(self):
+        """Tests."""
+        self.assertTrue(self.client.login(username=self.owner_info['username'], password=self.owner_info['password']))
+        r = self.client.get(reverse('sports-manager:license-export'))
+        self.assertEqual(r.status_code, 403)
+
+    def test_export(self):
+        """Tests."""
+        self.assertTrue(self.client.login(username=self.staff_info['username'], password=self.staff_info['password']))
+        rows = self.export()
+
+        self.assertEqual([row['number'] for row in rows], ["1", "2"])
+        self.assertEqual(rows[0]['first_name'], self.player.first_name)
+        self.assertEqual(rows[0]['owner'], self.owner.username)
+        self.assertEqual(sorted(rows[0]['teams'].split(";")), sorted([self.team.name, self.other.name]))
+        self.assertEqual(rows[0]['is_payed'], "1")
+        self.assertEqual(rows[1]['is_payed'], "0")
+
+    def test_filters(self):
+        """Tests."""
+        self.assertTrue(self.client.login(username=self.staff_info['username'], password=self.staff_info['password']))
+
+        self.assertEqual([row['number'] for row in self.export(is_payed=0)], ["2"])
+        self.assertEqual([row['number'] for row in self.export(team=self.team.slug)], ["1"])
+        self.assertEqual([row['number'] for row in self.export(season=1999)], ["2"])
+        self.assertEqual([row['number'] for row in self.export(season=2000)], [])
+
+    def test_constant_number_of_queries_per_chunk(self):
+        """Tests."""
+        self.assertTrue(self.client.login(username=self.staff_info['username'], password=self.staff_info['password']))
+        for i in range(3, 30):
+            player = Player.objects.create(owner=self.owner, first_name=str(i), last_name=str(i), sex='MA',
+                                           birthday=date(2000, 1, 1))
+            License.objects.create(player=player, number=str(i), is_payed=False).teams.set([self.team])
+
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.export()
+        self.assertEqual(len(rows), 29)
+
+        # One chunk: the licenses with their players and owners, then their teams, then the end of the iteration
+        chunk_queries = [q['sql'] for q in queries.captured_queries if 'sports_manager_license' in q['sql']]
+        self.assertEqual(len(chunk_queries), 3)
+
+        LicenseExportView.chunk_size = 10
+        self.addCleanup(setattr, LicenseExportView, 'chunk_size', 1000)
+        self.assertEqual(len(self.export()), 29)
@@ -0,0 +1,131 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the reminders of the certificates expiring soon."""
+
+# Standard library
+import io
+from datetime import timedelta
+
+# Django
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# Current django project
+from sports_manager.models import CertificateExpiryNotice, MedicalCertificate, Player
+from sports_manager.reminders import send_reminders
+
+from ..helper import create_player, create_user
+
+
+class TestCertificateExpiry(TestCase):
+    """Tests the command."""
+
+    def setUp(self):
+        """Create players for two owners."""
+        self.today = timezone.localdate()
+        self.owner = create_user()[1]
+        self.owner.email = 'toto@example.com'
+        self.owner.save()
+        self.other = create_user(username='titi')[1]
+        self.other.email = 'titi@example.com'
+        self.other.save()
+
+        self.player = create_player(self.owner)[1]
+        self.sibling = Player.objects.create(owner=self.owner, first_name="Tutu", last_name="Tata", sex="FE",
+                                             birthday=self.player.birthday)
+        self.other_player = create_player(self.other)[1]
+
+    def certificate(self, player, days, validation=MedicalCertificate.VALID):
+        """Create a certificate ending in `days` days."""
+        return MedicalCertificate.objects.create(player=player, validation=validation,
+                                                 end=self.today + timedelta(days=days))
+
+    def run_command(self, *args):
+        """Run the command and return its output."""
+        out = io.StringIO()
+        call_command('notify_certificate_expiry', *args, stdout=out)
+        return out.getvalue()
+
+    def test_one_digest_per_owner(self):
+        """The certificates of an owner are listed in a single email."""
+        self.certificate(self.player, 3)
+        self.certificate(self.sibling, 10)
+        self.certificate(self.other_player, 29)
+
+        self.assertIn('2 email(s) sent', self.run_command())
+
+        self.assertEqual(len(mail.outbox), 2)
+        digest = next(m for m in mail.outbox if m.to == ['toto@example.com'])
+        self.assertIn('Toto Tata: {}'.format((self.today + timedelta(days=3)).isoformat()), digest.body)
+        self.assertIn('Tutu Tata: {}'.format((self.today + timedelta(days=10)).isoformat()), digest.body)
+        self.assertEqual(CertificateExpiryNotice.objects.count(), 3)
+
+    def test_window(self):
+        """Only the valid certificates ending in the window are reminded."""
+        self.certificate(self.player, -1)
+        self.certificate(self.player, 31)
+        self.certificate(self.player, 5, validation=MedicalCertificate.IN_VALIDATION)
+        MedicalCertificate.objects.create(player=self.player, validation=MedicalCertificate.VALID)
+
+        self.assertIn('0 email(s) sent', self.run_command())
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.assertIn('1 email(s) sent', self.run_command('--days', '31'))
+
+    def test_idempotent(self):
+        """The certificates already reminded are skipped."""
+        self.certificate(self.player, 3)
+        self.run_command()
+
+        self.assertIn('0 email(s) sent', self.run_command())
+        self.assertEqual(len(mail.outbox), 1)
+
+        # A new certificate of the same owner only triggers a reminder for itself
+        self.certificate(self.sibling, 4)
+        self.run_command()
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertNotIn('- Toto Tata', mail.outbox[1].body)
+
+    def test_new_end_date(self):
+        """A certificate whose ending date changed is reminded again."""
+        certificate = self.certificate(self.player, 3)
+        self.run_command()
+
+        certificate.end = self.today + timedelta(days=20)
+        certificate.save()
+        self.run_command()
+
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_owner_without_email(self):
+        """The owners without email are skipped and not recorded."""
+        self.owner.email = ''
+        self.owner.save()
+        self.certificate(self.player, 3)
+
+        self.assertIn('0 email(s) sent', self.run_command())
+        self.assertFalse(CertificateExpiryNotice.objects.exists())
+
+    def test_dry_run(self):
+        """Nothing is sent nor recorded."""
+        self.certificate(self.player, 3)
+
+        self.assertIn('1 email(s) would be sent', self.run_command('--dry-run'))
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertFalse(CertificateExpiryNotice.objects.exists())
+
+    def test_queries(self):
+        """The certificates are fetched with one query and the reminders recorded with another."""
+        for player in (self.player, self.sibling, self.other_player):
+            self.certificate(player, 3)
+
+        with CaptureQueriesContext(connection) as ctx:
+            send_reminders(self.today, 30)
+
+        queries = [q['sql'] for q in ctx.captured_queries if not q['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+        self.assertEqual(len(queries), 2)
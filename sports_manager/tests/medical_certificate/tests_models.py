@@ -0,0 +1,41 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the models."""
+
+# Standard library
+from datetime import timedelta
+
+# Django
+from django.test import TestCase
+from django.utils import timezone
+
+# Current django project
+from sports_manager.models import MedicalCertificate
+
+from ..helper import create_player, create_user
+
+
+class TestMedicalCertificateModel(TestCase):
+    """Tests MedicalCertificate."""
+
+    def setUp(self):
+        """Create a player."""
+        self.player = create_player(create_user()[1])[1]
+
+    def test_is_valid(self):
+        """Only the validated certificates are valid."""
+        for validation, _ in MedicalCertificate.CERTIFICATION_STEPS:
+            certificate = MedicalCertificate(player=self.player, validation=validation)
+            self.assertEqual(certificate.is_valid(), validation == MedicalCertificate.VALID)
+
+    def test_is_valid_end(self):
+        """A validated certificate expires after its ending date, as in MedicalCertificate.objects.valid()."""
+        today = timezone.localdate()
+        for end, valid in ((None, True), (today, True), (today + timedelta(days=1), True),
+                           (today - timedelta(days=1), False)):
+            certificate = MedicalCertificate.objects.create(player=self.player, validation=MedicalCertificate.VALID,
+                                                            end=end)
+            self.assertEqual(certificate.is_valid(), valid)
+            self.assertEqual(MedicalCertificate.objects.valid().filter(pk=certificate.pk).exists(), valid)
+            self.assertEqual(certificate.is_valid(today=today + timedelta(days=2)), end is None)
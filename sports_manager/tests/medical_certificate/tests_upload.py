@@ -0,0 +1,189 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the chunked upload of the medical certificates."""
+
+# Standard library
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+# Django
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+# Current django project
+from sports_manager.models import CertificateUpload, MedicalCertificate
+from sports_manager.uploads import UploadError, partial_path, write_chunk
+
+from ..helper import create_player, create_user
+
+CONTENT = b'%PDF-1.4 ' + bytes(range(256)) * 40
+
+
+class TestCertificateUpload(TestCase):
+    """Tests the chunked upload."""
+
+    def setUp(self):
+        """Create a player and its certificate and use temporary directories."""
+        self.media_root = tempfile.mkdtemp()
+        self.upload_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.addCleanup(shutil.rmtree, self.upload_directory)
+        override = override_settings(MEDIA_ROOT=self.media_root,
+                                     SPORTS_MANAGER={'upload_directory': self.upload_directory,
+                                                     'upload_max_chunk_size': 4096,
+                                                     'upload_max_size': 1024 * 1024,
+                                                     'upload_expiration': 24})
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user_info, self.user = create_user()
+        self.player = create_player(self.user)[1]
+        self.certificate = MedicalCertificate.objects.create(player=self.player)
+        self.assertTrue(self.client.login(username=self.user_info['username'], password=self.user_info['password']))
+
+    def start(self, content=CONTENT, checksum=None):
+        """Create an upload."""
+        return self.client.post(reverse('sports-manager:certificate-upload-create', kwargs={'pk': self.certificate.pk}),
+                                {'filename': 'certificate.pdf',
+                                 'size': len(content),
+                                 'checksum': checksum or hashlib.sha256(content).hexdigest()})
+
+    def send(self, url, offset, chunk):
+        """Send a chunk."""
+        return self.client.put(url, chunk, content_type='application/octet-stream', HTTP_UPLOAD_OFFSET=str(offset))
+
+    def test_start(self):
+        """The upload is created."""
+        r = self.start()
+
+        self.assertEqual(r.status_code, 201)
+        upload = CertificateUpload.objects.get()
+        self.assertEqual(r.json(), {'token': str(upload.token), 'url': r['Location'], 'offset': 0,
+                                    'size': len(CONTENT), 'complete': False})
+
+    def test_start_invalid(self):
+        """The size and the checksum are checked."""
+        r = self.client.post(reverse('sports-manager:certificate-upload-create', kwargs={'pk': self.certificate.pk}),
+                             {'filename': 'certificate.pdf', 'size': 10 * 1024 * 1024, 'checksum': 'abc'})
+
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(set(r.json()['errors']), {'size', 'checksum'})
+        self.assertFalse(CertificateUpload.objects.exists())
+
+    def test_other_owner(self):
+        """A user can not upload the certificate of the player of someone else."""
+        self.client.logout()
+        other = create_user(username='other')[0]
+        self.assertTrue(self.client.login(username=other['username'], password=other['password']))
+
+        self.assertEqual(self.start().status_code, 404)
+
+    def test_anonymous(self):
+        """Anonymous users can not upload."""
+        self.client.logout()
+
+        self.assertEqual(self.start().status_code, 403)
+
+    def test_upload(self):
+        """The chunks are assembled and the file is attached to the certificate."""
+        url = self.start()['Location']
+
+        for offset in range(0, len(CONTENT), 4096):
+            r = self.send(url, offset, CONTENT[offset:offset + 4096])
+            self.assertEqual(r.status_code, 200)
+
+        self.assertTrue(r.json()['complete'])
+        self.certificate.refresh_from_db()
+        self.assertEqual(self.certificate.validation, MedicalCertificate.IN_VALIDATION)
+        with self.certificate.file.open('rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+        self.assertFalse(CertificateUpload.objects.exists())
+        self.assertEqual(os.listdir(self.upload_directory), [])
+
+    def test_resume(self):
+        """An interrupted upload resumes from the last acknowledged offset."""
+        url = self.start()['Location']
+        self.send(url, 0, CONTENT[:4096])
+
+        # The connection is lost in the middle of the second chunk: the body is shorter than its Content-Length
+        upload = CertificateUpload.objects.get()
+        with self.assertRaises(UploadError):
+            write_chunk(upload, io.BytesIO(CONTENT[4096:6000]), 4096, 4096)
+        self.assertEqual(os.path.getsize(partial_path(upload)), 6000)
+
+        r = self.client.get(url)
+        self.assertEqual(r.json()['offset'], 4096)
+
+        r = self.send(url, 8192, CONTENT[8192:])
+        self.assertEqual(r.status_code, 409)
+        self.assertEqual(r.json()['offset'], 4096)
+
+        for offset in range(4096, len(CONTENT), 4096):
+            r = self.send(url, offset, CONTENT[offset:offset + 4096])
+        self.assertTrue(r.json()['complete'])
+        self.certificate.refresh_from_db()
+        with self.certificate.file.open('rb') as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    def test_chunk_too_large(self):
+        """The chunks larger than the setting are rejected."""
+        url = self.start()['Location']
+
+        r = self.send(url, 0, CONTENT[:5000])
+
+        self.assertEqual(r.status_code, 413)
+
+    def test_chunk_after_end(self):
+        """A chunk can not go past the announced size."""
+        url = self.start(content=CONTENT[:100])['Location']
+
+        r = self.send(url, 0, CONTENT[:200])
+
+        self.assertEqual(r.status_code, 400)
+
+    def test_checksum_mismatch(self):
+        """The upload starts over when the checksum does not match."""
+        url = self.start(checksum='0' * 64)['Location']
+
+        for offset in range(0, len(CONTENT), 4096):
+            r = self.send(url, offset, CONTENT[offset:offset + 4096])
+
+        self.assertEqual(r.status_code, 422)
+        self.assertEqual(r.json()['offset'], 0)
+        self.certificate.refresh_from_db()
+        self.assertFalse(self.certificate.file)
+        self.assertEqual(self.certificate.validation, MedicalCertificate.NOT_UPLOADED)
+
+    def test_cancel(self):
+        """A cancelled upload is deleted with its partial file."""
+        url = self.start()['Location']
+        self.send(url, 0, CONTENT[:4096])
+        upload = CertificateUpload.objects.get()
+
+        r = self.client.delete(url)
+
+        self.assertEqual(r.status_code, 204)
+        self.assertFalse(CertificateUpload.objects.exists())
+        self.assertFalse(os.path.exists(partial_path(upload)))
+
+    def test_clear_expired(self):
+        """The command deletes the uploads that have not been resumed."""
+        url = self.start()['Location']
+        self.send(url, 0, CONTENT[:4096])
+        self.start()
+        expired = CertificateUpload.objects.order_by('created').first()
+        CertificateUpload.objects.filter(pk=expired.pk).update(modified=timezone.now() - timedelta(hours=25))
+
+        out = io.StringIO()
+        call_command('clear_certificate_uploads', stdout=out)
+
+        self.assertIn('1 expired upload(s) deleted', out.getvalue())
+        self.assertEqual(CertificateUpload.objects.count(), 1)
+        self.assertFalse(os.path.exists(partial_path(expired)))
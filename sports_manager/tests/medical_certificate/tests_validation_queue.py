@@ -0,0 +1,148 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the validation queue of the medical certificates."""
+
+# Standard library
+import base64
+import shutil
+import tempfile
+
+# Django
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# Current django project
+from sports_manager.models import MedicalCertificate
+from sports_manager.views.certificate import CertificateValidationQueueView
+
+from ..helper import create_player, create_user
+
+
+class TestCertificateValidationQueue(TestCase):
+    """Tests the queue."""
+
+    def setUp(self):
+        """Create certificates waiting for a validation."""
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root, MEDIA_URL='/media/')
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.staff_info = create_user(username='staff', staff=True)[0]
+        self.user_info, user = create_user()
+        self.player = create_player(user)[1]
+        self.certificates = []
+        for i in range(30):
+            certificate = MedicalCertificate(player=self.player, validation=MedicalCertificate.IN_VALIDATION)
+            certificate.file.save('certificate{}.pdf'.format(i), ContentFile(b'%PDF'), save=False)
+            certificate.save()
+            self.certificates.append(certificate)
+        # Certificates that are not waiting
+        MedicalCertificate.objects.create(player=self.player, validation=MedicalCertificate.VALID)
+        MedicalCertificate.objects.create(player=self.player)
+
+        self.url = reverse('sports-manager:certificate-validation-queue')
+
+    def login(self, info):
+        """Log in."""
+        self.assertTrue(self.client.login(username=info['username'], password=info['password']))
+
+    def test_not_staff(self):
+        """Only the staff can access the queue."""
+        self.login(self.user_info)
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_anonymous(self):
+        """Anonymous users can not access the queue."""
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_pages(self):
+        """The queue is browsed with a cursor."""
+        self.login(self.staff_info)
+        page_size = CertificateValidationQueueView.paginate_by
+        prefetch = CertificateValidationQueueView.paginate_following
+
+        r = self.client.get(self.url)
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.context['certificate_list'], self.certificates[:page_size])
+        self.assertEqual(r.context['prefetch_urls'],
+                         [c.file.url for c in self.certificates[page_size:page_size + prefetch]])
+        self.assertIsNotNone(r.context['next_cursor'])
+
+        r = self.client.get(self.url, {'after': r.context['next_cursor']})
+
+        self.assertEqual(r.context['certificate_list'], self.certificates[page_size:])
+        self.assertEqual(r.context['prefetch_urls'], [])
+        self.assertIsNone(r.context['next_cursor'])
+
+    def test_page_fetched_in_one_query(self):
+        """The page, the owners of the players and the prefetched files come from one query."""
+        self.login(self.staff_info)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url)
+
+        queries = [q['sql'] for q in ctx.captured_queries if 'sports_manager_medicalcertificate' in q['sql']]
+        self.assertEqual(len(queries), 1)
+        self.assertIn('LIMIT 25', queries[0])
+
+    def test_invalid_cursor(self):
+        """A forged cursor is rejected."""
+        self.login(self.staff_info)
+
+        self.assertEqual(self.client.get(self.url, {'after': 'abc'}).status_code, 404)
+
+    def test_unsigned_cursor(self):
+        """A cursor that was not signed by the server is rejected."""
+        self.login(self.staff_info)
+        created = self.certificates[0].created.isoformat()
+        cursor = base64.urlsafe_b64encode('{}|{}'.format(created, self.certificates[0].pk).encode()).decode()
+
+        self.assertEqual(self.client.get(self.url, {'after': cursor}).status_code, 404)
+
+    def test_approve(self):
+        """The selected certificates are approved with a single UPDATE."""
+        self.login(self.staff_info)
+        pks = [c.pk for c in self.certificates[:3]]
+
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.post(self.url, {'action': 'approve', 'certificates': pks})
+
+        self.assertRedirects(r, self.url, fetch_redirect_response=False)
+        self.assertEqual(len([q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')]), 1)
+        self.assertEqual(MedicalCertificate.objects.filter(validation=MedicalCertificate.VALID).count(), 4)
+        self.assertTrue(all(c.is_valid() for c in MedicalCertificate.objects.filter(pk__in=pks)))
+
+    def test_reject(self):
+        """The selected certificates are rejected."""
+        self.login(self.staff_info)
+
+        self.client.post(self.url, {'action': 'reject', 'certificates': [self.certificates[0].pk]})
+
+        self.certificates[0].refresh_from_db()
+        self.assertEqual(self.certificates[0].validation, MedicalCertificate.REJECTED)
+
+    def test_only_waiting_certificates_updated(self):
+        """A certificate that is not waiting for a validation is not updated."""
+        self.login(self.staff_info)
+        certificate = MedicalCertificate.objects.get(validation=MedicalCertificate.NOT_UPLOADED)
+
+        self.client.post(self.url, {'action': 'approve', 'certificates': [certificate.pk]})
+
+        certificate.refresh_from_db()
+        self.assertEqual(certificate.validation, MedicalCertificate.NOT_UPLOADED)
+
+    def test_unknown_action(self):
+        """Nothing is updated without a valid action."""
+        self.login(self.staff_info)
+
+        self.client.post(self.url, {'action': 'delete', 'certificates': [self.certificates[0].pk]})
+
+        self.assertEqual(MedicalCertificate.objects.filter(validation=MedicalCertificate.IN_VALIDATION).count(), 30)
@@ -0,0 +1,211 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the detection and the merge of the duplicate players."""
+
+# Standard library
+from datetime import date
+
+# Django
+from django.test import TestCase
+from django.urls import reverse
+
+# Current django project
+from sports_manager.duplicates import blocking_keys, find_duplicates, merge, normalize, phonetic, similarity
+from sports_manager.models import License, MedicalCertificate, Player, SearchDocument, Team
+from sports_manager.models.player import EmergencyContact
+from sports_manager.search import search
+
+from ..helper import create_team, create_user
+
+
+class TestNames(TestCase):
+    """Tests the normalization of the names."""
+
+    def test_normalize(self):
+        """The accents, the case, the spaces and the punctuation are removed."""
+        self.assertEqual(normalize("L'Hôpital-Dupré"), "lhopitaldupre")
+
+    def test_phonetic(self):
+        """The names sounding the same share their key."""
+        self.assertEqual(phonetic("Dupont"), phonetic("Dupond"))
+        self.assertEqual(phonetic("Philippe"), phonetic("Filipe"))
+        self.assertEqual(phonetic("Mathieu"), phonetic("Matthieu"))
+        self.assertEqual(phonetic("Dupré"), phonetic("Dupret"))
+        self.assertNotEqual(phonetic("Martin"), phonetic("Marin"))
+
+    def test_similarity(self):
+        """Test the similarity of the names."""
+        self.assertEqual(similarity("Éloïse", "eloise"), 1.0)
+        self.assertEqual(similarity("Dupont", "Dupond"), 0.9)
+        self.assertGreater(similarity("Alexandre", "Alexnadre"), 0.8)
+        self.assertLess(similarity("Jean", "Marie"), 0.5)
+
+    def test_blocking_keys(self):
+        """A player is in the blocks of its last name, of its phonetic key and of its first name."""
+        player = {'first_name': "Éloïse", 'last_name': "Dupré", 'birthday': date(2010, 1, 1)}
+        self.assertEqual(blocking_keys(player), [('last_name', 'dupre', date(2010, 1, 1)),
+                                                 ('phonetic', 'dupr', date(2010, 1, 1)),
+                                                 ('first_name', 'eloise', date(2010, 1, 1))])
+
+
+class TestDuplicates(TestCase):
+    """Tests the detection and the merge."""
+
+    def setUp(self):
+        """Create players of two owners."""
+        self.mother = create_user('mother')[1]
+        self.father = create_user('father')[1]
+        self.team = create_team()[1]
+
+    def create_player(self, first_name, last_name, birthday=date(2010, 1, 1), owner=None):
+        """Create a player."""
+        return Player.objects.create(owner=owner or self.mother, first_name=first_name, last_name=last_name,
+                                     sex='FE', birthday=birthday)
+
+    def pairs(self, **kwargs):
+        """Return the names of the duplicates."""
+        return [("{} {}".format(duplicate.player['first_name'], duplicate.player['last_name']),
+                 "{} {}".format(duplicate.other['first_name'], duplicate.other['last_name']))
+                for duplicate in find_duplicates(**kwargs)]
+
+    def test_other_owner(self):
+        """The same child registered by both of its parents."""
+        self.create_player("Éloïse", "Dupré")
+        self.create_player("Eloise", "DUPRE", owner=self.father)
+        self.assertEqual(self.pairs(), [("Éloïse Dupré", "Eloise DUPRE")])
+        self.assertEqual(find_duplicates()[0].score, 1.0)
+        self.assertEqual(find_duplicates()[0].other['owner__username'], 'father')
+
+    def test_typos(self):
+        """A typo in the first or in the last name."""
+        self.create_player("Alexandre", "Dupont")
+        self.create_player("Alexnadre", "Dupont")
+        self.create_player("Jean", "Martinez", birthday=date(2011, 1, 1))
+        self.create_player("Jean", "Martiez", birthday=date(2011, 1, 1))
+        self.create_player("Louis", "Dupond", birthday=date(2012, 1, 1))
+        self.create_player("Louis", "Dupont", birthday=date(2012, 1, 1))
+        self.assertEqual(set(self.pairs()), {("Alexandre Dupont", "Alexnadre Dupont"),
+                                             ("Jean Martinez", "Jean Martiez"),
+                                             ("Louis Dupond", "Louis Dupont")})
+
+    def test_not_duplicates(self):
+        """Twins and namesakes born another day are not duplicates."""
+        self.create_player("Jean", "Dupont")
+        self.create_player("Marie", "Dupont")
+        self.create_player("Jean", "Dupont", birthday=date(2011, 1, 1))
+        self.assertEqual(self.pairs(), [])
+
+    def test_threshold(self):
+        """Test the minimal similarity."""
+        self.create_player("Louis", "Dupont")
+        self.create_player("Louise", "Dupont")
+        self.assertEqual(self.pairs(), [("Louis Dupont", "Louise Dupont")])
+        self.assertEqual(self.pairs(threshold=0.99), [])
+        with self.settings(SPORTS_MANAGER={'duplicate_threshold': 0.99}):
+            self.assertEqual(self.pairs(), [])
+
+    def test_queries(self):
+        """The players are read with a single query."""
+        for i in range(20):
+            self.create_player("Jean", "Dupont", birthday=date(2000 + i, 1, 1))
+            self.create_player("Jean", "Dupont", birthday=date(2000 + i, 1, 1), owner=self.father)
+        with self.assertNumQueries(1):
+            self.assertEqual(len(find_duplicates()), 20)
+
+    def test_merge(self):
+        """The licenses, certificates and emergency contacts are moved to the player kept."""
+        player = self.create_player("Éloïse", "Dupré")
+        duplicate = self.create_player("Eloise", "Dupre", owner=self.father)
+        License.objects.create(player=duplicate, number='1', is_payed=True).teams.add(self.team)
+        MedicalCertificate.objects.create(player=duplicate, validation=MedicalCertificate.VALID,
+                                          start=date.today())
+        EmergencyContact.objects.create(player=duplicate, first_name="Marie", last_name="Curie", phone="0600000000")
+
+        self.assertEqual(merge(player, [duplicate]), 3)
+        self.assertFalse(Player.objects.filter(pk=duplicate.pk).exists())
+        self.assertEqual(License.objects.get().player, player)
+        self.assertEqual(MedicalCertificate.objects.get().player, player)
+        self.assertEqual(EmergencyContact.objects.get().player, player)
+
+        team = Team.objects.get(pk=self.team.pk)
+        self.assertEqual((team.player_count, team.payed_player_count, team.certified_player_count), (1, 1, 1))
+        self.assertEqual([result['title'] for result in search("dupre", kinds=[SearchDocument.PLAYER])],
+                         ["Éloïse Dupré"])
+        self.assertEqual(search("curie")[0]['subtitle'], "Éloïse Dupré")
+        self.assertEqual(find_duplicates(), [])
+
+    def test_merge_itself(self):
+        """A player is not merged with itself."""
+        player = self.create_player("Éloïse", "Dupré")
+        self.assertEqual(merge(player, [player]), 0)
+        self.assertTrue(Player.objects.filter(pk=player.pk).exists())
+
+
+class TestDuplicateView(TestCase):
+    """Tests the report of the duplicates."""
+
+    def setUp(self):
+        """Create duplicates."""
+        owner = create_user('owner')[1]
+        self.player = Player.objects.create(owner=owner, first_name="Jean", last_name="Dupont", sex='MA',
+                                            birthday=date(2010, 1, 1))
+        self.duplicate = Player.objects.create(owner=owner, first_name="Jean", last_name="Dupond", sex='MA',
+                                               birthday=date(2010, 1, 1))
+        self.url = reverse('sports-manager:player-duplicates')
+
+    def login(self, **kwargs):
+        """Log in."""
+        user_info = create_user(**kwargs)[0]
+        self.assertTrue(self.client.login(username=user_info['username'], password=user_info['password']))
+
+    def test_not_staff(self):
+        """The report is restricted to the staff."""
+        self.login()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.assertEqual(self.client.post(self.url, {'player': self.player.pk,
+                                                     'duplicates': [self.duplicate.pk]}).status_code, 403)
+        self.assertTrue(Player.objects.filter(pk=self.duplicate.pk).exists())
+
+    def test_report(self):
+        """Test the duplicates reported."""
+        self.login(staff=True)
+        r = self.client.get(self.url)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.content.decode(), "0.95 {} {}\n".format(self.player.pk, self.duplicate.pk))
+
+    def test_merge(self):
+        """Test the merge of a duplicate."""
+        self.login(staff=True)
+        r = self.client.post(self.url, {'player': self.player.pk, 'duplicates': [self.duplicate.pk]})
+        self.assertRedirects(r, self.url)
+        self.assertFalse(Player.objects.filter(pk=self.duplicate.pk).exists())
+
+    def test_merge_itself(self):
+        """A player cannot be merged with itself."""
+        self.login(staff=True)
+        r = self.client.post(self.url, {'player': self.player.pk, 'duplicates': [self.player.pk]})
+        self.assertEqual(r.status_code, 200)
+        self.assertIn("A player cannot be merged with itself.", r.content.decode())
+        self.assertEqual(Player.objects.count(), 2)
+
+
+class TestMergeAdminAction(TestCase):
+    """Tests the merge action of the admin."""
+
+    def test_merge(self):
+        """The selected players are merged into the oldest one."""
+        user_info, user = create_user(superuser=True)
+        self.assertTrue(self.client.login(username=user_info['username'], password=user_info['password']))
+        players = [Player.objects.create(owner=user, first_name="Jean", last_name=last_name, sex='MA',
+                                         birthday=date(2010, 1, 1))
+                   for last_name in ("Dupont", "Dupond", "Dupon")]
+        License.objects.create(player=players[2], number='1', is_payed=False)
+
+        r = self.client.post(reverse('admin:sports_manager_player_changelist'), {
+            'action': 'merge_players',
+            '_selected_action': [player.pk for player in players],
+        })
+        self.assertEqual(r.status_code, 302)
+        self.assertEqual(list(Player.objects.all()), [players[0]])
+        self.assertEqual(License.objects.get().player, players[0])
@@ -0,0 +1,217 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the import of a roster of players."""
+
+# Standard library
+import os
+import tempfile
+import unittest
+from datetime import date
+from io import BytesIO, StringIO
+
+# Django
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# Current django project
+from sports_manager.models import License, MedicalCertificate, Player
+from sports_manager.models.player import EmergencyContact
+from sports_manager.roster import RosterImporter, read_rows
+
+from ..helper import create_team, create_user
+
+try:
+    # Third-party
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+HEADER = ("owner,first_name,last_name,birthday,sex,emergency_first_name,emergency_last_name,emergency_phone,"
+          "emergency_email,license_number,is_payed,teams\n")
+
+
+def roster(*rows):
+    """Build the content of a CSV roster."""
+    return (HEADER + "".join(row + "\n" for row in rows)).encode('utf-8')
+
+
+def row(i, owner='toto', birthday='2000-01-01', license_number='', is_payed='', teams=''):
+    """Build a line of a CSV roster."""
+    return "{},Player{},Last{},{},MA,Contact,Last{},0100000000,,{},{},{}".format(
+        owner, i, i, birthday, i, license_number, is_payed, teams)
+
+
+class TestRosterImporter(TestCase):
+    """Tests the importer."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create an owner and a team."""
+        cls.owner = create_user()[1]
+        cls.team = create_team()[1]
+
+    def run_import(self, content, chunk_size=500):
+        """Import a CSV roster."""
+        f = SimpleUploadedFile('roster.csv', content)
+        return RosterImporter(chunk_size=chunk_size).run(read_rows(f.file, f.name))
+
+    def test_import(self):
+        """Test the import of valid rows."""
+        report = self.run_import(roster(
+            row(0),
+            row(1, license_number='123', is_payed='yes', teams=self.team.slug),
+        ))
+
+        self.assertEqual(report.created, 2)
+        self.assertEqual(report.errors, [])
+        self.assertEqual(Player.objects.filter(owner=self.owner).count(), 2)
+        self.assertEqual(EmergencyContact.objects.count(), 2)
+        self.assertEqual(MedicalCertificate.objects.filter(validation=MedicalCertificate.NOT_UPLOADED).count(), 2)
+
+        license = License.objects.get()
+        self.assertEqual(license.player.first_name, "Player1")
+        self.assertEqual(license.number, "123")
+        self.assertTrue(license.is_payed)
+        self.assertEqual(list(license.teams.all()), [self.team])
+
+    def test_invalid_rows_are_reported(self):
+        """Test that the invalid rows do not stop the import."""
+        report = self.run_import(roster(
+            row(0),
+            row(1, birthday=date.today().isoformat()),
+            row(2, owner='unknown'),
+            row(3, teams='unknown-team'),
+            "toto,Player4,Last4,2000-01-01,MA,,,,,,,",
+            row(5),
+        ), chunk_size=2)
+
+        self.assertEqual(report.created, 2)
+        self.assertEqual(sorted((e.line, sorted(e.errors)) for e in report.errors), [
+            (3, ['birthday']),
+            (4, ['owner']),
+            (5, ['teams']),
+            (6, ['emergency_first_name', 'emergency_last_name', 'emergency_phone']),
+        ])
+        self.assertEqual(sorted(Player.objects.values_list('first_name', flat=True)), ["Player0", "Player5"])
+        self.assertEqual(set(EmergencyContact.objects.values_list('player__first_name', flat=True)),
+                         {"Player0", "Player5"})
+
+    def test_constant_number_of_queries(self):
+        """Test that the number of queries does not depend on the number of rows of a chunk."""
+        with CaptureQueriesContext(connection) as queries:
+            self.run_import(roster(row(0, teams=self.team.slug)))
+
+        with self.assertNumQueries(len(queries)):
+            report = self.run_import(roster(*[row(i, teams=self.team.slug) for i in range(1, 51)]))
+        self.assertEqual(report.created, 50)
+        self.assertEqual(License.teams.through.objects.count(), 51)
+
+    @unittest.skipIf(openpyxl is None, "openpyxl is not installed")
+    def test_import_xlsx(self):
+        """Test the import of a XLSX file."""
+        workbook = openpyxl.Workbook()
+        workbook.active.append(HEADER.strip().split(','))
+        workbook.active.append(['toto', 'Player0', 'Last0', date(2000, 1, 1), 'MA', 'Contact', 'Last0', '0100000000',
+                                None, 123, 1, self.team.slug])
+        content = BytesIO()
+        workbook.save(content)
+        content.seek(0)
+
+        report = RosterImporter().run(read_rows(content, 'roster.xlsx'))
+        self.assertEqual(report.errors, [])
+        self.assertEqual(License.objects.get().number, "123")
+
+    def test_invalid_csv(self):
+        """A malformed CSV file raises a ValueError."""
+        for content in (roster(row(0)) + b'toto,"Player1\n', roster(row(0)) + b"toto,Player\xff1\n"):
+            with self.assertRaises(ValueError):
+                self.run_import(content)
+        self.assertEqual(Player.objects.count(), 0)
+
+    def test_invalid_end_of_file(self):
+        """Nothing is inserted when the end of the file is malformed, even after several chunks."""
+        content = roster(*[row(i) for i in range(300)]) + b"toto,Player\xff300\n"
+        with self.assertRaises(ValueError):
+            self.run_import(content, chunk_size=100)
+        self.assertEqual(Player.objects.count(), 0)
+
+    @unittest.skipIf(openpyxl is None, "openpyxl is not installed")
+    def test_invalid_xlsx(self):
+        """A corrupt XLSX file raises a ValueError."""
+        with self.assertRaises(ValueError):
+            RosterImporter().run(read_rows(BytesIO(b"not a zip archive"), 'roster.xlsx'))
+
+    def test_command(self):
+        """Test the management command."""
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as f:
+            f.write(roster(row(0), row(1, owner='unknown')))
+        self.addCleanup(os.remove, f.name)
+
+        out, err = StringIO(), StringIO()
+        call_command('import_players', f.name, stdout=out, stderr=err)
+        self.assertIn("1 player(s) imported, 1 error(s)", out.getvalue())
+        self.assertIn("Line 3: owner: Unknown user 'unknown'.", err.getvalue())
+
+
+class TestPlayerImportView(TestCase):
+    """Tests the view importing a roster."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create the users."""
+        cls.owner_info, cls.owner = create_user()
+        cls.staff_info, cls.staff = create_user('staff', staff=True)
+
+    def post(self, name='roster.csv'):
+        """Upload a roster."""
+        return self.client.post(reverse('sports-manager:player-import'),
+                                {'file': SimpleUploadedFile(name, roster(row(0), row(1, owner='unknown')))})
+
+    def test_anonymous(self):
+        """Tests."""
+        self.assertEqual(self.client.get(reverse('sports-manager:player-import')).status_code, 403)
+        self.assertEqual(self.post().status_code, 403)
+
+    def test_logged(self):
+        """Tests."""
+        self.assertTrue(self.client.login(username=self.owner_info['username'], password=self.owner_info['password']))
+        self.assertEqual(self.client.get(reverse('sports-manager:player-import')).status_code, 403)
+        self.assertEqual(self.post().status_code, 403)
+        self.assertEqual(Player.objects.count(), 0)
+
+    def test_staff(self):
+        """Tests."""
+        self.assertTrue(self.client.login(username=self.staff_info['username'], password=self.staff_info['password']))
+        self.assertEqual(self.client.get(reverse('sports-manager:player-import')).status_code, 200)
+
+        r = self.post()
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.context['report'].created, 1)
+        self.assertEqual(len(r.context['report'].errors), 1)
+        self.assertEqual(Player.objects.count(), 1)
+
+    def test_staff_invalid_file(self):
+        """A corrupt file is reported on the form."""
+        self.assertTrue(self.client.login(username=self.staff_info['username'], password=self.staff_info['password']))
+        files = [('roster.csv', roster(row(0)) + b"toto,Player\xff1\n")]
+        if openpyxl is not None:
+            files.append(('roster.xlsx', b"corrupt"))
+        for name, content in files:
+            r = self.client.post(reverse('sports-manager:player-import'),
+                                 {'file': SimpleUploadedFile(name, content)})
+            self.assertEqual(r.status_code, 200)
+            self.assertIn('file', r.context['form'].errors)
+        self.assertEqual(Player.objects.count(), 0)
+
+    def test_staff_wrong_extension(self):
+        """Tests."""
+        self.assertTrue(self.client.login(username=self.staff_info['username'], password=self.staff_info['password']))
+        r = self.post('roster.txt')
+        self.assertEqual(r.status_code, 200)
+        self.assertIn('file', r.context['form'].errors)
+        self.assertEqual(Player.objects.count(), 0)
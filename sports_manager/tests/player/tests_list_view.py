@@ -7,6 +7,9 @@
 from django.test import TestCase
 from django.urls import reverse
 
+# Current django project
+from sports_manager.ical import player_token
+
 from ..helper import create_player, create_user
 
 
@@ -75,6 +78,17 @@ class TestPlayerListViewAsLogged(TestCase):
         self.assertEqual(r.status_code, 200)
         self.assertEqual(len(r.context['player_list']), 1)
 
+    def tests_right_account_calendar(self):
+        """The owner gets the URL of the calendar of its players."""
+        self.player_info, self.player = create_player(owner=self.owner)
+        self.assertTrue(self.client.login(username=self.owner_info['username'], password=self.owner_info['password']))
+        r = self.client.get(reverse('sports-manager:player-list', kwargs={'username': self.owner.username}))
+
+        url = 'http://testserver' + reverse('sports-manager:player-calendar', kwargs={'token': player_token(self.player)})
+        self.assertEqual(r.context['player_list'][0].calendar_url, url)
+        self.assertIn(url, r.content.decode())
+        self.assertEqual(self.client.get(url).status_code, 200)
+
 
 class TestPlayerListViewAsStaff(TestCase):
     """Tests ListView for Team."""
@@ -104,6 +118,15 @@ class TestPlayerListViewAsStaff(TestCase):
             self.assertEqual(r.status_code, 200)
             self.assertEqual(len(r.context['player_list']), 1)
 
+    def tests_calendar_hidden(self):
+        """The URL of the calendar is only shown to the owner."""
+        self.player_info, self.player = create_player(owner=self.owner)
+        self.assertTrue(self.client.login(username=self.user_info['username'], password=self.user_info['password']))
+        r = self.client.get(reverse('sports-manager:player-list', kwargs={'username': self.owner.username}))
+
+        self.assertFalse(hasattr(r.context['player_list'][0], 'calendar_url'))
+        self.assertNotIn('.ics', r.content.decode())
+
 
 class TestPlayerListViewAsSuperuser(TestCase):
     """Tests ListView for Team."""
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests the archive of the closed seasons."""
+
+# Standard library
+from datetime import timedelta
+from io import StringIO
+
+# Django
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+# Current django project
+from sports_manager.archive import ArchiveError, archive_season
+from sports_manager.models import (
+    ArchivedLicense, ArchivedMedicalCertificate, ArchivedTimeSlot, License, MedicalCertificate, Season, TimeSlot
+)
+from sports_manager.models.season import current_season
+
+from ..helper import create_player, create_time_slot, create_user
+
+
+class TestArchive(TestCase):
+    """Tests the move of a closed season to the archive tables."""
+
+    def setUp(self):
+        """Create the objects of a closed season and of the current one."""
+        self.player = create_player(create_user()[1])[1]
+        self.season = Season.objects.for_year(current_season() - 1)
+        self.season.is_closed = True
+        self.season.save()
+        self.time_slot = create_time_slot()[1]
+        self.team = self.time_slot.team
+
+        self.licenses = [License.objects.create(season=self.season, player=self.player, number=str(i),
+                                                is_payed=i % 2 == 0)
+                         for i in range(3)]
+        self.licenses[0].teams.add(self.team)
+        self.current = License.objects.create(player=self.player, number='current', is_payed=True)
+        self.current.teams.add(self.team)
+        self.rejected = MedicalCertificate.objects.create(season=self.season, player=self.player,
+                                                          validation=MedicalCertificate.REJECTED)
+        self.valid = MedicalCertificate.objects.create(season=self.season, player=self.player,
+                                                       validation=MedicalCertificate.VALID,
+                                                       end=timezone.localdate() + timedelta(days=30))
+        TimeSlot.objects.filter(pk=self.time_slot.pk).update(season=self.season)
+
+    def test_archive(self):
+        """The objects are moved with their primary key, the valid certificates stay."""
+        result = archive_season(self.season, chunk_size=2)
+
+        self.assertEqual(result, {'licenses': 3, 'certificates': 1, 'time slots': 1})
+        self.assertEqual(list(License.all_objects.all()), [self.current])
+        self.assertEqual(list(MedicalCertificate.all_objects.all()), [self.valid])
+        self.assertFalse(TimeSlot.all_objects.exists())
+
+        archived = ArchivedLicense.objects.get(pk=self.licenses[0].pk)
+        self.assertEqual((archived.season, archived.player, archived.number, archived.is_payed),
+                         (self.season, self.player, '0', True))
+        self.assertEqual(list(archived.teams.all()), [self.team])
+        self.assertEqual(ArchivedLicense.objects.count(), 3)
+        self.assertEqual(ArchivedMedicalCertificate.objects.get().pk, self.rejected.pk)
+        self.assertEqual(ArchivedTimeSlot.objects.get().pk, self.time_slot.pk)
+        self.assertEqual(list(self.current.teams.all()), [self.team])
+
+        self.season.refresh_from_db()
+        self.assertIsNotNone(self.season.archived)
+
+    def test_counters(self):
+        """The counters of the teams only count the current season."""
+        archive_season(self.season)
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.player_count, 1)
+
+    def test_dry_run(self):
+        """Nothing is moved."""
+        result = archive_season(self.season, dry_run=True)
+
+        self.assertEqual(result, {'licenses': 3, 'certificates': 1, 'time slots': 1})
+        self.assertEqual(License.all_objects.count(), 4)
+        self.assertFalse(ArchivedLicense.objects.exists())
+
+    def test_not_closed(self):
+        """Only the closed seasons are archived."""
+        self.season.is_closed = False
+        with self.assertRaises(ArchiveError):
+            archive_season(self.season)
+
+    def test_current(self):
+        """The current season is never archived."""
+        season = Season.objects.current()
+        season.is_closed = True
+        with self.assertRaises(ArchiveError):
+            archive_season(season)
+
+    def test_command(self):
+        """The closed seasons are archived."""
+        out = StringIO()
+        call_command('archive_seasons', '--chunk-size', '1', stdout=out)
+
+        self.assertEqual(out.getvalue(), "{}: 3 license(s), 1 certificate(s), 1 time slot(s) archived\n".format(
+            self.season))
+        self.assertEqual(ArchivedLicense.objects.count(), 3)
+
+    def test_command_dry_run(self):
+        """Test the dry run."""
+        out = StringIO()
+        call_command('archive_seasons', '--dry-run', stdout=out)
+
+        self.assertIn("would be archived", out.getvalue())
+        self.assertFalse(ArchivedLicense.objects.exists())
+
+    def test_command_season(self):
+        """Test the archive of an unknown or open season."""
+        with self.assertRaises(CommandError):
+            call_command('archive_seasons', '--season', '1900', stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('archive_seasons', '--season', str(current_season()), stdout=StringIO())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests the Season model and the managers scoped to the current season."""
+
+# Standard library
+from datetime import date
+from unittest import mock
+
+# Django
+from django.test import TestCase
+
+# Current django project
+from sports_manager.models import License, MedicalCertificate, Season, TimeSlot
+from sports_manager.models.season import current_season
+
+from ..helper import create_player, create_time_slot, create_user
+
+
+class TestSeasonModel(TestCase):
+    """Test the Season model."""
+
+    def test_string_representation(self):
+        """Test string representation."""
+        self.assertEqual(str(Season.objects.for_year(2019)), "2019-2020")
+
+    def test_verbose_name(self):
+        """Test the verbose name."""
+        self.assertEqual(str(Season._meta.verbose_name), "season")
+
+    def test_for_year(self):
+        """The season is created once, from September to the next September."""
+        season = Season.objects.for_year(2019)
+        self.assertEqual((season.start, season.end), (date(2019, 9, 1), date(2020, 9, 1)))
+        self.assertEqual(Season.objects.for_year(2019), season)
+        self.assertEqual(Season.objects.filter(year=2019).count(), 1)
+
+    def test_current_season(self):
+        """The season changes in September."""
+        with mock.patch('django.utils.timezone.localdate', return_value=date(2020, 8, 31)):
+            self.assertEqual(current_season(), 2019)
+        with mock.patch('django.utils.timezone.localdate', return_value=date(2020, 9, 1)):
+            self.assertEqual(current_season(), 2020)
+
+    def test_is_current(self):
+        """Test is_current."""
+        self.assertTrue(Season.objects.current().is_current())
+        self.assertFalse(Season.objects.for_year(current_season() - 1).is_current())
+
+
+class TestCurrentSeasonManager(TestCase):
+    """Test the default managers of the objects belonging to a season."""
+
+    def setUp(self):
+        """Create a license, a certificate and a time slot of the current season and of the previous one."""
+        self.player = create_player(create_user()[1])[1]
+        self.previous = Season.objects.for_year(current_season() - 1)
+        self.time_slot = create_time_slot()[1]
+        self.objects = {
+            License: [License.objects.create(player=self.player, is_payed=True),
+                      License.objects.create(player=self.player, is_payed=True, season=self.previous)],
+            MedicalCertificate: [MedicalCertificate.objects.create(player=self.player),
+                                 MedicalCertificate.objects.create(player=self.player, season=self.previous)],
+            TimeSlot: [self.time_slot,
+                       TimeSlot.objects.create(season=self.previous, type=TimeSlot.PRACTICE, team=self.time_slot.team,
+                                               gymnasium=self.time_slot.gymnasium, day=TimeSlot.MONDAY,
+                                               start=self.time_slot.start, end=self.time_slot.end)],
+        }
+
+    def test_default_season(self):
+        """The objects belong to the current season unless told otherwise."""
+        for model, (current, previous) in self.objects.items():
+            with self.subTest(model=model.__name__):
+                self.assertEqual(current.season, Season.objects.current())
+                self.assertEqual(previous.season, self.previous)
+
+    def test_default_season_without_query(self):
+        """The current season is only looked up when an object is inserted."""
+        with self.assertNumQueries(0):
+            License(player=self.player, is_payed=True)
+            MedicalCertificate(player=self.player)
+            TimeSlot(team=self.time_slot.team)
+
+        with mock.patch('django.utils.timezone.localdate', return_value=date(current_season() + 1, 9, 1)):
+            license = License.objects.create(player=self.player, is_payed=True)
+        self.assertEqual(license.season.year, current_season() + 1)
+
+    def test_objects_without_join(self):
+        """The default manager compares the season by primary key, without joining the seasons."""
+        for model in self.objects:
+            with self.subTest(model=model.__name__):
+                self.assertNotIn('JOIN "sports_manager_season"', str(model.objects.all().query))
+
+    def test_objects(self):
+        """The default manager only returns the objects of the current season."""
+        for model, (current, previous) in self.objects.items():
+            with self.subTest(model=model.__name__):
+                self.assertEqual(list(model.objects.all()), [current])
+                self.assertEqual(model._default_manager.count(), 1)
+
+    def test_all_objects(self):
+        """The objects of every season are available."""
+        for model, objects in self.objects.items():
+            with self.subTest(model=model.__name__):
+                self.assertEqual(set(model.all_objects.all()), set(objects))
+
+    def test_related_managers(self):
+        """The related managers are scoped as well."""
+        self.assertEqual(list(self.player.license_set.all()), self.objects[License][:1])
+        self.assertEqual(list(self.time_slot.team.timeslot_set.all()), [self.time_slot])
+
+    def test_for_season(self):
+        """Test the filter of the licenses of a season."""
+        self.assertEqual(list(License.all_objects.for_season(self.previous.year)), self.objects[License][1:])
+
+    def test_valid_certificate_of_previous_season(self):
+        """A certificate of the previous season still counts until it ends."""
+        MedicalCertificate.all_objects.filter(season=self.previous).update(validation=MedicalCertificate.VALID)
+        license = License.objects.with_roster_status().get()
+        self.assertTrue(license.has_valid_certificate)
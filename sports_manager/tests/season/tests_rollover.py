@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests the rollover of a season to the next one."""
+
+# Standard library
+from datetime import time
+from io import StringIO
+
+# Django
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+# Current django project
+from sports_manager.cache import SCHEDULE, get_version
+from sports_manager.models import License, Player, Season, Team, TimeSlot
+from sports_manager.models.season import current_season
+from sports_manager.rollover import Rollover
+
+from ..helper import create_time_slot, create_user
+
+
+class TestRollover(TestCase):
+    """Tests the copy of the time slots and the renewal of the licenses."""
+
+    def setUp(self):
+        """Create the schedule and the licenses of the previous season."""
+        cache.clear()
+        self.owner = create_user()[1]
+        self.previous = Season.objects.for_year(current_season() - 1)
+        self.current = Season.objects.current()
+        time_slot = create_time_slot()[1]
+        self.team, self.gymnasium = time_slot.team, time_slot.gymnasium
+        self.other = Team.objects.create(category=self.team.category, name="Other", recrutment=True)
+        TimeSlot.objects.filter(pk=time_slot.pk).update(season=self.previous)
+        TimeSlot.objects.create(season=self.previous, type=TimeSlot.MATCH, team=self.other, gymnasium=self.gymnasium,
+                                day=TimeSlot.SATURDAY, start=time(14), end=time(16))
+
+        self.players = [Player.objects.create(owner=self.owner, first_name='Player', last_name='{:02d}'.format(i),
+                                              sex='MA', birthday='2000-01-01')
+                        for i in range(10)]
+        for i, player in enumerate(self.players):
+            license = License.objects.create(season=self.previous, player=player, number=str(i), is_payed=True)
+            license.teams.set([self.team] if i % 2 else [self.team, self.other])
+
+    def tearDown(self):
+        """Do not leak the cache to the other tests."""
+        cache.clear()
+
+    def test_rollover(self):
+        """The time slots are copied and the licenses renewed unpaid in the same teams."""
+        version = get_version(SCHEDULE)
+        Rollover(self.previous, self.current).apply()
+
+        self.assertEqual(TimeSlot.objects.count(), 2)
+        self.assertEqual(set(TimeSlot.objects.values_list('team__name', 'day', 'start', 'end')),
+                         {(self.team.name, TimeSlot.MONDAY, time(20), time(22, 30)),
+                          ("Other", TimeSlot.SATURDAY, time(14), time(16))})
+        licenses = License.objects.order_by('number')
+        self.assertEqual([license.player for license in licenses], self.players)
+        self.assertFalse(any(license.is_payed for license in licenses))
+        self.assertEqual(list(licenses.get(number='0').teams.order_by('name')), [self.team, self.other])
+        self.assertEqual(list(licenses.get(number='1').teams.all()), [self.team])
+        self.assertEqual(License.all_objects.filter(season=self.previous).count(), 10)
+
+        self.team.refresh_from_db()
+        self.assertEqual((self.team.player_count, self.team.payed_player_count), (10, 0))
+        self.assertNotEqual(get_version(SCHEDULE), version)
+
+    def count_queries(self):
+        """Return the number of queries of a rollover, which is rolled back."""
+        with CaptureQueriesContext(connection) as queries:
+            try:
+                with transaction.atomic():
+                    Rollover(self.previous, self.current).apply()
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+        return len(queries)
+
+    def test_queries(self):
+        """The number of queries does not depend on the number of players."""
+        with self.assertNumQueries(5):
+            Rollover(self.previous, self.current)
+
+        count = self.count_queries()
+        for i in range(10):
+            player = Player.objects.create(owner=self.owner, first_name='Other', last_name=str(i), sex='MA',
+                                           birthday='2000-01-01')
+            License.objects.create(season=self.previous, player=player, is_payed=True).teams.add(self.other)
+        self.assertEqual(self.count_queries(), count)
+
+    def test_skip_existing(self):
+        """The objects already in the new season are not created again."""
+        TimeSlot.objects.create(type=TimeSlot.MATCH, team=self.other, gymnasium=self.gymnasium,
+                                day=TimeSlot.SATURDAY, start=time(14), end=time(16))
+        License.objects.create(player=self.players[0], number='new', is_payed=True)
+
+        rollover = Rollover(self.previous, self.current)
+
+        self.assertEqual(len(rollover.time_slots), 1)
+        self.assertEqual([license.player for license in rollover.licenses], self.players[1:])
+        rollover.apply()
+        self.assertEqual(len(Rollover(self.previous, self.current).time_slots), 0)
+        self.assertEqual(len(Rollover(self.previous, self.current).licenses), 0)
+
+    def test_command(self):
+        """Test the command."""
+        out = StringIO()
+        call_command('rollover_season', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertIn("+ license Player 00 (0) in Hello World Team, Other", lines)
+        self.assertEqual(lines[-1], "2 time slot(s) and 10 license(s) created")
+        self.assertEqual(License.objects.count(), 10)
+
+    def test_command_dry_run(self):
+        """Nothing is created."""
+        Season.objects.filter(pk=self.current.pk).delete()
+        out = StringIO()
+        call_command('rollover_season', '--dry-run', stdout=out)
+
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "+ time slot Hello World Team - monday 20:00-22:30 in Gymnasium Toto")
+        self.assertEqual(lines[-1], "2 time slot(s) and 10 license(s) would be created")
+        self.assertFalse(Season.objects.filter(year=current_season()).exists())
+
+    def test_command_unknown_season(self):
+        """The previous season must exist."""
+        with self.assertRaises(CommandError):
+            call_command('rollover_season', '--to', '1900', stdout=StringIO())
@@ -28,9 +28,11 @@ DATABASES = {
 ROOT_URLCONF = "sports_manager.tests.urls"
 
 REQUIRED_APPS = [
+    "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     'django.contrib.sessions',
+    'django.contrib.messages',
     "django.contrib.sites",
     "markdownx",
 ]
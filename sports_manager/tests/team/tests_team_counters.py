@@ -0,0 +1,181 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the counters of players of the teams."""
+
+# Standard library
+from io import StringIO
+
+# Django
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+# Current django project
+from sports_manager.counters import drift
+from sports_manager.models import License, MedicalCertificate, Season, Team
+from sports_manager.models.season import current_season
+
+from ..helper import create_player, create_team, create_user
+
+
+class TestTeamCounters(TestCase):
+    """Tests the signal handlers maintaining the counters."""
+
+    def setUp(self):
+        """Create a team and a player."""
+        self.team = create_team()[1]
+        self.owner = create_user()[1]
+        self.player = create_player(self.owner)[1]
+
+    def assertCounters(self, players, payed, certified, team=None):
+        """Check the counters stored for the team and that they did not drift."""
+        team = Team.objects.get(pk=(team or self.team).pk)
+        self.assertEqual((team.player_count, team.payed_player_count, team.certified_player_count),
+                         (players, payed, certified))
+        self.assertEqual(drift(), [])
+
+    def add_license(self, is_payed=False, player=None):
+        """Create a license of the team."""
+        license = License.objects.create(player=player or self.player, number='1', is_payed=is_payed)
+        license.teams.add(self.team)
+        return license
+
+    def test_add_and_remove(self):
+        """The licenses are counted when they are added to a team, from both sides of the relation."""
+        license = self.add_license(is_payed=True)
+        self.assertCounters(1, 1, 0)
+
+        other = License.objects.create(player=create_player(self.owner)[1], number='2', is_payed=False)
+        self.team.license_set.add(other)
+        self.assertCounters(2, 1, 0)
+
+        license.teams.remove(self.team)
+        self.assertCounters(1, 0, 0)
+
+        self.team.license_set.clear()
+        self.assertCounters(0, 0, 0)
+
+    def test_set(self):
+        """Replacing the teams of a license moves it from a team to the other."""
+        license = self.add_license(is_payed=True)
+        other = Team.objects.create(name='Other', category=self.team.category, level='GOL', sex='MI',
+                                    url='http://example.com', description='', recrutment=False)
+
+        license.teams.set([other])
+
+        self.assertCounters(0, 0, 0)
+        self.assertCounters(1, 1, 0, team=other)
+
+    def test_payment(self):
+        """Paying a license updates the counters of its teams."""
+        license = self.add_license()
+
+        license.is_payed = True
+        license.save()
+        self.assertCounters(1, 1, 0)
+
+        license.is_payed = False
+        license.save()
+        self.assertCounters(1, 0, 0)
+
+    def test_certificate(self):
+        """Validating and rejecting a certificate updates the counters of the teams of the player."""
+        self.add_license()
+        certificate = MedicalCertificate.objects.create(player=self.player, validation=MedicalCertificate.IN_VALIDATION)
+        self.assertCounters(1, 0, 0)
+
+        certificate.validation = MedicalCertificate.VALID
+        certificate.save()
+        self.assertCounters(1, 0, 1)
+
+        # A second valid certificate does not count the player twice
+        second = MedicalCertificate.objects.create(player=self.player, validation=MedicalCertificate.VALID)
+        self.assertCounters(1, 0, 1)
+
+        certificate.validation = MedicalCertificate.REJECTED
+        certificate.save()
+        self.assertCounters(1, 0, 1)
+
+        second.delete()
+        self.assertCounters(1, 0, 0)
+
+    def test_delete_license(self):
+        """Deleting a license uncounts it."""
+        license = self.add_license(is_payed=True)
+
+        license.delete()
+
+        self.assertCounters(0, 0, 0)
+
+    def test_delete_player(self):
+        """Deleting a player uncounts its licenses whatever the order of the cascading deletions."""
+        MedicalCertificate.objects.create(player=self.player, validation=MedicalCertificate.VALID)
+        self.add_license(is_payed=True)
+        self.add_license(is_payed=False, player=create_player(self.owner)[1])
+        self.assertCounters(2, 1, 1)
+
+        self.player.delete()
+
+        self.assertCounters(1, 0, 0)
+
+    def test_previous_season(self):
+        """The licenses of the previous seasons are not counted."""
+        license = License.objects.create(player=self.player, number='1', is_payed=True)
+        License.objects.filter(pk=license.pk).update(season=Season.objects.for_year(current_season() - 1))
+
+        license.teams.add(self.team)
+
+        self.assertCounters(0, 0, 0)
+
+    def test_team_save(self):
+        """Saving a team loaded before the counters changed does not overwrite them."""
+        stale = Team.objects.get(pk=self.team.pk)
+        self.add_license(is_payed=True)
+
+        stale.name = 'Renamed'
+        stale.save()
+
+        self.assertCounters(1, 1, 0)
+        self.assertEqual(Team.objects.get(pk=self.team.pk).name, 'Renamed')
+
+    def test_validation_queue(self):
+        """The certificates approved from the validation queue are counted."""
+        self.add_license()
+        certificate = MedicalCertificate.objects.create(player=self.player, validation=MedicalCertificate.IN_VALIDATION)
+        staff_info = create_user(username='staff', staff=True)[0]
+        self.assertTrue(self.client.login(username=staff_info['username'], password=staff_info['password']))
+
+        self.client.post(reverse('sports-manager:certificate-validation-queue'),
+                         {'action': 'approve', 'certificates': [certificate.pk]})
+
+        self.assertCounters(1, 0, 1)
+
+
+class TestReconcileTeamCounters(TestCase):
+    """Tests the reconcile_team_counters command."""
+
+    def setUp(self):
+        """Create a team with a payed license and make its counters drift."""
+        self.team = create_team()[1]
+        player = create_player(create_user()[1])[1]
+        License.objects.create(player=player, number='1', is_payed=False).teams.add(self.team)
+        License.objects.update(is_payed=True)
+
+    def test_dry_run(self):
+        """The drift is reported and not fixed."""
+        out = StringIO()
+        call_command('reconcile_team_counters', '--dry-run', stdout=out)
+
+        self.assertIn('hello-world-team: payed_player_count is 0 instead of 1', out.getvalue())
+        self.assertIn('1 counter(s) drifted', out.getvalue())
+        self.assertEqual(Team.objects.get(pk=self.team.pk).payed_player_count, 0)
+
+    def test_fix(self):
+        """The drift is reported and fixed."""
+        out = StringIO()
+        call_command('reconcile_team_counters', stdout=out)
+
+        self.assertIn('1 counter(s) fixed', out.getvalue())
+        self.assertEqual(Team.objects.get(pk=self.team.pk).payed_player_count, 1)
+        self.assertEqual(drift(), [])
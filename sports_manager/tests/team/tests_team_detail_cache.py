@@ -0,0 +1,123 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the cache of the details of a team."""
+
+# Standard library
+from datetime import date, time
+from unittest import mock
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# Current django project
+from sports_manager.cache import get_team_version
+from sports_manager.models import Gymnasium, Team, TimeSlot
+from sports_manager.models.season import SEASON_START_MONTH, current_season
+
+from ..helper import create_gymnasium, create_team, create_user
+
+
+class TestTeamDetailViewCache(TestCase):
+    """Tests the fragment cache of the DetailView for Team."""
+
+    def setUp(self):
+        """Create a team with a time slot and another team."""
+        cache.clear()
+        self.team = create_team()[1]
+        self.other = Team.objects.create(category=self.team.category, name="Other", recrutment=True)
+        self.gymnasium = create_gymnasium()[1]
+        self.time_slot = TimeSlot.objects.create(type=TimeSlot.PRACTICE, team=self.team, gymnasium=self.gymnasium,
+                                                 day=TimeSlot.MONDAY, start=time(20), end=time(22))
+
+    def get(self, team=None):
+        """Get the details of the team."""
+        r = self.client.get(reverse('sports-manager:team-detail', kwargs={'slug': (team or self.team).slug}))
+        self.assertEqual(r.status_code, 200)
+        return r.content.decode('utf-8')
+
+    def test_cached(self):
+        """Tests that the time slots are not fetched again when the fragment is cached."""
+        with CaptureQueriesContext(connection) as first:
+            content = self.get()
+        self.assertIn("monday", content)
+        self.assertIn("Toto", content)
+
+        with CaptureQueriesContext(connection) as second:
+            self.assertEqual(self.get(), content)
+        self.assertLess(len(second), len(first))
+        self.assertFalse([q for q in second.captured_queries if 'sports_manager_timeslot' in q['sql']])
+
+    def test_time_slot_changes(self):
+        """Tests."""
+        self.get()
+        self.time_slot.day = TimeSlot.FRIDAY
+        self.time_slot.save()
+        self.assertIn("friday", self.get())
+
+        self.time_slot.delete()
+        self.assertNotIn("friday", self.get())
+
+    def test_time_slot_moves_to_another_team(self):
+        """Tests."""
+        self.get()
+        self.get(self.other)
+        self.time_slot.team = self.other
+        self.time_slot.save()
+        self.assertNotIn("monday", self.get())
+        self.assertIn("monday", self.get(self.other))
+
+    def test_gymnasium_changes(self):
+        """Tests."""
+        self.get()
+        self.gymnasium.name = "Watteau"
+        self.gymnasium.save()
+        self.assertIn("Watteau", self.get())
+
+    def test_category_changes(self):
+        """Tests."""
+        self.get()
+        self.team.category.name = "Seniors"
+        self.team.category.save()
+        self.assertIn("Seniors", self.get())
+
+    def test_team_changes(self):
+        """Tests."""
+        self.get()
+        self.team.description = "*Hello*"
+        self.team.save()
+        self.assertIn("<em>Hello</em>", self.get())
+
+    def test_trainer_changes(self):
+        """The name of the trainer is updated in the fragment."""
+        trainer = create_user()[1]
+        self.team.trainer = trainer
+        self.team.save()
+        self.assertIn("Toto Tata", self.get())
+        other_version = get_team_version(self.other.slug)
+
+        trainer.first_name = "Jean"
+        trainer.save()
+        self.assertIn("Jean Tata", self.get())
+        self.assertEqual(get_team_version(self.other.slug), other_version)
+
+    def test_new_season(self):
+        """The time slots of the previous season are not shown once a new season starts."""
+        self.assertIn("monday", self.get())
+
+        with mock.patch('django.utils.timezone.localdate', return_value=date(current_season() + 1,
+                                                                             SEASON_START_MONTH, 1)):
+            self.assertNotIn("monday", self.get())
+
+    def test_only_affected_versions_are_bumped(self):
+        """Tests."""
+        team_version = get_team_version(self.team.slug)
+        other_version = get_team_version(self.other.slug)
+
+        Gymnasium.objects.get(pk=self.gymnasium.pk).save()
+        self.assertGreater(get_team_version(self.team.slug), team_version)
+        self.assertEqual(get_team_version(self.other.slug), other_version)
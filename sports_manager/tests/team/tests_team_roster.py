@@ -0,0 +1,137 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the roster of a team."""
+
+# Standard library
+from datetime import timedelta
+
+# Django
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+# Current django project
+from sports_manager.models import License, MedicalCertificate, Player, Season
+from sports_manager.models.season import current_season
+
+from ..helper import create_team, create_time_slot, create_user
+
+
+class TestTeamRoster(TestCase):
+    """Tests Team.get_players and Team.get_training_days."""
+
+    def setUp(self):
+        """Create a team and an owner."""
+        self.team = create_team()[1]
+        self.owner = create_user()[1]
+
+    def add_player(self, first_name, last_name, is_payed=False, validation=None, end=None):
+        """Create a player with a license for the team and optionally a medical certificate."""
+        player = Player.objects.create(owner=self.owner, first_name=first_name, last_name=last_name, sex='MA',
+                                       birthday=timezone.localdate() - timedelta(weeks=20 * 52))
+        license = License.objects.create(player=player, number=last_name, is_payed=is_payed)
+        license.teams.add(self.team)
+        if validation is not None:
+            MedicalCertificate.objects.create(player=player, validation=validation, end=end)
+        return license
+
+    def test_ordered_by_player_name(self):
+        """The licenses are ordered by the last then the first name of their player."""
+        self.add_player('Zoe', 'Martin')
+        self.add_player('Anna', 'Martin')
+        self.add_player('Paul', 'Durand')
+
+        self.assertEqual([str(license.player) for license in self.team.get_players()],
+                         ['Paul Durand', 'Anna Martin', 'Zoe Martin'])
+
+    def test_status(self):
+        """The licenses are annotated with the validity of the certificate of the player."""
+        today = timezone.localdate()
+        self.add_player('A', 'Valid', is_payed=True, validation=MedicalCertificate.VALID, end=today)
+        self.add_player('B', 'Unlimited', validation=MedicalCertificate.VALID)
+        self.add_player('C', 'Expired', validation=MedicalCertificate.VALID, end=today - timedelta(days=1))
+        self.add_player('D', 'Rejected', validation=MedicalCertificate.REJECTED)
+        self.add_player('E', 'Missing')
+
+        status = {l.player.last_name: (l.has_valid_certificate, l.is_payed) for l in self.team.get_players()}
+
+        self.assertEqual(status, {
+            'Valid': (True, True),
+            'Unlimited': (True, False),
+            'Expired': (False, False),
+            'Rejected': (False, False),
+            'Missing': (False, False),
+        })
+
+    def test_current_season(self):
+        """Only the licenses of the current season and of the team are listed."""
+        current = self.add_player('A', 'Current')
+        old = self.add_player('B', 'Old')
+        License.objects.filter(pk=old.pk).update(season=Season.objects.for_year(current_season() - 1))
+        other = License.objects.create(player=current.player, number='other', is_payed=False)
+
+        self.assertEqual(list(self.team.get_players()), [current])
+        self.assertNotIn(other, self.team.get_players())
+
+    def test_one_query(self):
+        """The roster of a 30 players team is fetched with a single query."""
+        for i in range(30):
+            self.add_player('Player', '{:02d}'.format(i), is_payed=i % 2 == 0,
+                            validation=MedicalCertificate.VALID if i % 3 else None)
+
+        with self.assertNumQueries(1):
+            roster = [(str(l.player), l.has_valid_certificate, l.is_payed) for l in self.team.get_players()]
+
+        self.assertEqual(len(roster), 30)
+        self.assertEqual(sum(1 for _, valid, _ in roster if valid), 20)
+
+    def test_training_days(self):
+        """The training days are the time slots of the team."""
+        time_slot = create_time_slot(team=self.team)[1]
+
+        with self.assertNumQueries(1):
+            days = [(ts.day, ts.gymnasium.name) for ts in self.team.get_training_days()]
+
+        self.assertEqual(days, [(time_slot.day, 'Toto')])
+
+
+class TestTeamDetailRoster(TestCase):
+    """Tests the roster displayed by the team detail view."""
+
+    def setUp(self):
+        """Create a team with a player."""
+        self.team = create_team()[1]
+        owner = create_user()[1]
+        player = Player.objects.create(owner=owner, first_name='Toto', last_name='Tata', sex='MA',
+                                       birthday=timezone.localdate() - timedelta(weeks=20 * 52))
+        License.objects.create(player=player, number='1', is_payed=True).teams.add(self.team)
+        self.url = reverse('sports-manager:team-detail', kwargs={'slug': self.team.slug})
+
+    def test_anonymous(self):
+        """The status of the players is hidden to the visitors."""
+        r = self.client.get(self.url)
+
+        self.assertEqual([str(l.player) for l in r.context['players']], ['Toto Tata'])
+        self.assertFalse(r.context['show_roster_status'])
+
+    def test_trainer(self):
+        """The trainer of the team sees the status of the players."""
+        user_info, user = create_user(username='trainer')
+        self.team.trainer = user
+        self.team.save()
+        self.assertTrue(self.client.login(username=user_info['username'], password=user_info['password']))
+
+        r = self.client.get(self.url)
+
+        self.assertTrue(r.context['show_roster_status'])
+        self.assertContains(r, 'Toto Tata False True')
+
+    def test_staff(self):
+        """The staff sees the status of the players."""
+        user_info = create_user(username='staff', staff=True)[0]
+        self.assertTrue(self.client.login(username=user_info['username'], password=user_info['password']))
+
+        r = self.client.get(self.url)
+
+        self.assertTrue(r.context['show_roster_status'])
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+"""Tests for `sports-manager` admin module."""
+
+# Standard library
+from datetime import date, time
+
+# Django
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# Current django project
+from sports_manager.models import Category, Gymnasium, License, MedicalCertificate, Player, Team, TimeSlot
+from sports_manager.models.player import EmergencyContact
+
+from .helper import create_user
+
+
+def create_rows(start, end):
+    """Create a row of every model for each number between start and end."""
+    gymnasium = Gymnasium.objects.create(name="Gym {}".format(start), address="Toto", city="Toto", zip_code=1)
+    for i in range(start, end):
+        owner = create_user("owner{}".format(i))[1]
+        category = Category.objects.create(name="Category {}".format(i), min_age=18)
+        team = Team.objects.create(category=category, name="Team {}".format(i), recrutment=True)
+        TimeSlot.objects.create(type=TimeSlot.PRACTICE, team=team, gymnasium=gymnasium, day=i % 7,
+                                start=time(i % 24), end=time(i % 24, 30))
+        player = Player.objects.create(owner=owner, first_name=str(i), last_name=str(i), sex='MA',
+                                       birthday=date(2000, 1, 1))
+        MedicalCertificate.objects.create(player=player)
+        EmergencyContact.objects.create(player=player, first_name=str(i), last_name=str(i), phone="0100000000")
+        License.objects.create(player=player, number=str(i), is_payed=False)
+
+
+class TestAdminChangelistQueries(TestCase):
+    """Tests that the number of queries of the changelists does not depend on the number of rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a superuser."""
+        cls.user_info, cls.user = create_user(superuser=True)
+
+    def setUp(self):
+        """Log in as superuser."""
+        self.assertTrue(self.client.login(username=self.user_info['username'], password=self.user_info['password']))
+
+    def assertConstantNumberOfQueries(self, model, **params):
+        """Check that the changelist runs the same number of queries with 1 or 10 rows."""
+        url = reverse('admin:sports_manager_{}_changelist'.format(model._meta.model_name))
+
+        with CaptureQueriesContext(connection) as queries:
+            r = self.client.get(url, params)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.context['cl'].result_count, 1)
+
+        create_rows(1, 10)
+        with self.assertNumQueries(len(queries)):
+            r = self.client.get(url, params)
+        self.assertEqual(r.context['cl'].result_count, 10)
+
+    def test_category(self):
+        """Tests."""
+        create_rows(0, 1)
+        self.assertConstantNumberOfQueries(Category)
+
+    def test_team(self):
+        """Tests."""
+        create_rows(0, 1)
+        self.assertConstantNumberOfQueries(Team)
+
+    def test_time_slot(self):
+        """Tests."""
+        create_rows(0, 1)
+        self.assertConstantNumberOfQueries(TimeSlot)
+
+    def test_player(self):
+        """Tests."""
+        create_rows(0, 1)
+        self.assertConstantNumberOfQueries(Player)
+
+    def test_medical_certificate(self):
+        """Tests."""
+        create_rows(0, 1)
+        self.assertConstantNumberOfQueries(MedicalCertificate)
+
+    def test_medical_certificate_sorted_by_player(self):
+        """Tests."""
+        create_rows(0, 1)
+        self.assertConstantNumberOfQueries(MedicalCertificate, o='-2')
+
+    def test_emergency_contact(self):
+        """Tests."""
+        create_rows(0, 1)
+        self.assertConstantNumberOfQueries(EmergencyContact)
+
+    def test_license(self):
+        """Tests."""
+        create_rows(0, 1)
+        self.assertConstantNumberOfQueries(License)
+
+    def test_search(self):
+        """Tests."""
+        create_rows(0, 10)
+        r = self.client.get(reverse('admin:sports_manager_license_changelist'), {'q': '5'})
+        self.assertEqual(r.context['cl'].result_count, 1)
+
+    def test_search_index(self):
+        """The prefix search of the players reads the indexes of the names ignoring the case."""
+        create_rows(0, 10)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('admin:sports_manager_player_changelist'), {'q': 'dup'})
+        searches = [query['sql'] for query in queries if 'LIKE' in query['sql']]
+        self.assertTrue(searches)
+        for sql in searches:
+            with connection.cursor() as cursor:
+                cursor.execute("EXPLAIN QUERY PLAN " + sql)
+                plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+            self.assertIn('sm_player_last_name_ci_idx', plan)
+            self.assertIn('sm_player_first_name_ci_idx', plan)
+
+
+class TestAdminAutocomplete(TestCase):
+    """Tests that the foreign keys of the change forms are completed instead of listed."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a superuser."""
+        cls.user_info, cls.user = create_user(superuser=True)
+
+    def setUp(self):
+        """Log in as superuser."""
+        self.assertTrue(self.client.login(username=self.user_info['username'], password=self.user_info['password']))
+
+    def test_change_forms(self):
+        """The change forms run the same number of queries with 1 or 10 rows of each model."""
+        create_rows(0, 1)
+        time_slot = TimeSlot.objects.get()
+        urls = [
+            reverse('admin:sports_manager_timeslot_change', args=[time_slot.pk]),
+            reverse('admin:sports_manager_team_change', args=[time_slot.team.pk]),
+            reverse('admin:sports_manager_player_change', args=[Player.objects.get().pk]),
+            reverse('admin:sports_manager_license_change', args=[License.objects.get().pk]),
+            reverse('admin:sports_manager_emergencycontact_change', args=[EmergencyContact.objects.get().pk]),
+        ]
+        counts = []
+        for url in urls:
+            self.client.get(url)
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).status_code, 200)
+            counts.append(len(queries))
+
+        create_rows(1, 10)
+        for url, count in zip(urls, counts):
+            with self.assertNumQueries(count):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_autocomplete(self):
+        """The autocompletion of the admin uses the lookups of the application."""
+        create_rows(0, 10)
+        r = self.client.get(reverse('admin:sports_manager_team_autocomplete'), {'term': 'TEAM 1'})
+        self.assertEqual([result['text'] for result in r.json()['results']], ["Team 1 - ", ])
+        r = self.client.get(reverse('admin:sports_manager_gymnasium_autocomplete'), {'term': 'gym'})
+        self.assertEqual([result['text'] for result in r.json()['results']], ["Gymnasium Gym 0"])
@@ -0,0 +1,180 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the JSON API."""
+
+# Standard library
+from datetime import date
+from unittest import mock
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# Current django project
+from sports_manager.models import Gymnasium, TimeSlot
+from sports_manager.models.season import SEASON_START_MONTH, current_season
+
+from .helper import create_time_slot
+
+
+class TestApi(TestCase):
+    """Tests the API views."""
+
+    def setUp(self):
+        """Create a category with a team training twice a week."""
+        cache.clear()
+        self.time_slot = create_time_slot()[1]
+        self.team = self.time_slot.team
+        self.other = TimeSlot.objects.create(type=TimeSlot.MATCH, team=self.team, gymnasium=self.time_slot.gymnasium,
+                                             day=TimeSlot.FRIDAY, start='19:00', end='21:00')
+
+    def tearDown(self):
+        """Do not leak the cached responses to the other tests."""
+        cache.clear()
+
+    def test_list(self):
+        """Every attribute is returned and the relations are identified."""
+        r = self.client.get(reverse('sports-manager:api-team-list'))
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r['Content-Type'], 'application/json')
+        data = r.json()
+        self.assertEqual(data['version'], 'v1')
+        self.assertEqual(data['data'], [{
+            'slug': 'hello-world-team',
+            'name': 'Hello World Team',
+            'level': 'GOL',
+            'sex': 'MI',
+            'url': 'http://example.com',
+            'recrutment': True,
+            'description_html': self.team.description_html,
+            'img': None,
+            'category': 'hello-world',
+        }])
+
+    def test_detail(self):
+        """A single object is returned by its identifier."""
+        r = self.client.get(reverse('sports-manager:api-time-slot-detail', kwargs={'pk': self.other.pk}))
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json()['data'], {
+            'id': self.other.pk,
+            'type': TimeSlot.MATCH,
+            'day': TimeSlot.FRIDAY,
+            'start': '19:00:00',
+            'end': '21:00:00',
+            'team': 'hello-world-team',
+            'gymnasium': 'toto',
+        })
+
+    def test_detail_not_found(self):
+        """An unknown object gives a 404."""
+        r = self.client.get(reverse('sports-manager:api-gymnasium-detail', kwargs={'slug': 'nowhere'}))
+
+        self.assertEqual(r.status_code, 404)
+        self.assertIn('errors', r.json())
+
+    def test_sparse_fieldsets(self):
+        """Only the identifier and the asked fields are returned."""
+        r = self.client.get(reverse('sports-manager:api-time-slot-list'), {'fields[time-slots]': 'day,team'})
+
+        self.assertEqual(r.json()['data'], [
+            {'id': self.time_slot.pk, 'day': TimeSlot.MONDAY, 'team': 'hello-world-team'},
+            {'id': self.other.pk, 'day': TimeSlot.FRIDAY, 'team': 'hello-world-team'},
+        ])
+
+    def test_include(self):
+        """The included objects are embedded, with their own sparse fieldsets, in a query for each to-many relation."""
+        params = {
+            'include': 'category,time-slots',
+            'fields[teams]': 'name',
+            'fields[categories]': 'name,min_age',
+            'fields[time-slots]': 'day',
+        }
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get(reverse('sports-manager:api-team-list'), params)
+
+        self.assertEqual(r.json()['data'], [{
+            'slug': 'hello-world-team',
+            'name': 'Hello World Team',
+            'category': {'slug': 'hello-world', 'name': 'Hello World', 'min_age': 18},
+            'time-slots': [
+                {'id': self.time_slot.pk, 'day': TimeSlot.MONDAY},
+                {'id': self.other.pk, 'day': TimeSlot.FRIDAY},
+            ],
+        }])
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+    def test_include_many(self):
+        """The objects without related objects get an empty list."""
+        Gymnasium.objects.create(name='Empty', address='Rue', city='City', zip_code=12345)
+
+        r = self.client.get(reverse('sports-manager:api-gymnasium-list'),
+                            {'include': 'time-slots', 'fields[gymnasiums]': 'name', 'fields[time-slots]': 'team'})
+
+        self.assertEqual(r.json()['data'], [
+            {'slug': 'empty', 'name': 'Empty', 'time-slots': []},
+            {'slug': 'toto', 'name': 'Toto', 'time-slots': [
+                {'id': self.time_slot.pk, 'team': 'hello-world-team'},
+                {'id': self.other.pk, 'team': 'hello-world-team'},
+            ]},
+        ])
+
+    def test_invalid_parameters(self):
+        """The unknown types, fields and relations are rejected."""
+        url = reverse('sports-manager:api-category-list')
+
+        for params, parameter in (({'fields[players]': 'name'}, 'fields[players]'),
+                                  ({'fields[categories]': 'name,trainer'}, 'fields[categories]'),
+                                  ({'include': 'players'}, 'include')):
+            r = self.client.get(url, params)
+            self.assertEqual(r.status_code, 400)
+            self.assertIn(parameter, r.json()['errors'])
+
+    def test_conditional_get(self):
+        """The clients having the current version get a 304 without any query."""
+        url = reverse('sports-manager:api-gymnasium-list')
+        r = self.client.get(url)
+        etag = r['ETag']
+        self.assertFalse(etag.startswith('W/'))
+
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 304)
+        self.assertEqual(r['ETag'], etag)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_etag_changes(self):
+        """The responses are built again when an object changes."""
+        url = reverse('sports-manager:api-gymnasium-list')
+        etag = self.client.get(url)['ETag']
+
+        self.time_slot.gymnasium.city = 'Elsewhere'
+        self.time_slot.gymnasium.save()
+
+        r = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 200)
+        self.assertNotEqual(r['ETag'], etag)
+        self.assertEqual(r.json()['data'][0]['city'], 'Elsewhere')
+
+    def test_new_season(self):
+        """The time slots of the previous season are not returned once a new season starts."""
+        url = reverse('sports-manager:api-time-slot-list')
+        self.assertEqual(len(self.client.get(url).json()['data']), 2)
+
+        with mock.patch('django.utils.timezone.localdate', return_value=date(current_season() + 1,
+                                                                             SEASON_START_MONTH, 1)):
+            r = self.client.get(url)
+        self.assertEqual(r.json()['data'], [])
+
+    def test_same_etag_for_equivalent_urls(self):
+        """The order of the parameters does not change the response."""
+        url = reverse('sports-manager:api-team-list')
+        first = self.client.get(url + '?include=category&fields[teams]=name')
+        second = self.client.get(url + '?fields[teams]=name&include=category')
+
+        self.assertEqual(first['ETag'], second['ETag'])
@@ -0,0 +1,200 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the autocompletion of the forms."""
+
+# Standard library
+from datetime import date
+
+# Django
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# Current django project
+from sports_manager.autocomplete import autocomplete, prefix_filter
+from sports_manager.forms.player import PlayerUpdateForm
+from sports_manager.forms.team import TeamForm
+from sports_manager.forms.timeslot import TimeSlotForm
+from sports_manager.models import Category, Gymnasium, Player, Team
+from sports_manager.views.player import PlayerUpdateView
+
+from .helper import create_time_slot, create_user
+
+
+class TestAutocomplete(TestCase):
+    """Tests the lookups."""
+
+    def setUp(self):
+        """Create objects of every lookup."""
+        self.owner = create_user()[1]
+        self.owner.first_name, self.owner.last_name = "Jean", "Dupont"
+        self.owner.save()
+        self.category = Category.objects.create(name="Jeunes", min_age=10)
+        for name in ("U15 Garçons", "U15 Filles", "U17 Garçons"):
+            Team.objects.create(category=self.category, name=name, level='SIL', sex='MA', recrutment=True)
+        for name in ("Jean Moulin", "Jean Jaurès", "Pierre de Coubertin"):
+            Gymnasium.objects.create(name="Gymnase {}".format(name), address="Toto", city="Toto", zip_code=1)
+        for first_name, last_name in (("Éloïse", "Dupré"), ("Jean", "Dupont"), ("Marie", "de la Tour")):
+            Player.objects.create(owner=self.owner, first_name=first_name, last_name=last_name, sex='FE',
+                                  birthday=date(2010, 1, 1))
+
+    def labels(self, lookup, text, **kwargs):
+        """Return the labels of the objects completed."""
+        return [label for _pk, label in autocomplete(lookup, text, **kwargs)]
+
+    def test_prefix_filter(self):
+        """The prefix is a range of the field."""
+        self.assertEqual(dict(prefix_filter('slug', 'u15').children), {'slug__gte': 'u15', 'slug__lt': 'u16'})
+
+    def test_users(self):
+        """Test the users by username."""
+        create_user('tata')
+        self.assertEqual(self.labels('users', "to"), ["toto (Jean Dupont)"])
+        self.assertEqual(self.labels('users', "t"), ["tata (Toto Tata)", "toto (Jean Dupont)"])
+        self.assertEqual(self.labels('users', "x"), [])
+
+    def test_players(self):
+        """Test the players by last name, whatever the case typed."""
+        self.assertEqual(self.labels('players', "dup"), ["Jean Dupont", "Éloïse Dupré"])
+        self.assertEqual(self.labels('players', "DUPR"), ["Éloïse Dupré"])
+        self.assertEqual(self.labels('players', "de la"), ["Marie de la Tour"])
+
+    def test_teams(self):
+        """Test the teams by slug."""
+        self.assertEqual(self.labels('teams', "u15"), ["U15 Filles - male", "U15 Garçons - male"])
+        self.assertEqual(self.labels('teams', "U15 Garc"), ["U15 Garçons - male"])
+
+    def test_gymnasiums(self):
+        """Test the gymnasiums by slug."""
+        self.assertEqual(self.labels('gymnasiums', "gymnase jean"),
+                         ["Gymnasium Gymnase Jean Jaurès", "Gymnasium Gymnase Jean Moulin"])
+        self.assertEqual(self.labels('gymnasiums', "Gymnase Pierre de"), ["Gymnasium Gymnase Pierre de Coubertin"])
+
+    def test_empty(self):
+        """Nothing is completed without a text."""
+        with self.assertNumQueries(0):
+            self.assertEqual(self.labels('teams', " "), [])
+            self.assertEqual(self.labels('teams', ",;"), [])
+
+    def test_limit(self):
+        """Test the maximal number of objects."""
+        self.assertEqual(len(self.labels('gymnasiums', "gym", limit=2)), 2)
+        with override_settings(SPORTS_MANAGER={'autocomplete_limit': 1}):
+            self.assertEqual(self.labels('gymnasiums', "gym"), ["Gymnasium Gymnase Jean Jaurès"])
+
+    def test_index(self):
+        """The lookups read an index."""
+        for lookup, text, index in (('players', "dup", 'sm_player_name_idx'),
+                                    ('teams', "u15", 'sqlite_autoindex_sports_manager_team_'),
+                                    ('gymnasiums', "gym", 'sqlite_autoindex_sports_manager_gymnasium_')):
+            with CaptureQueriesContext(connection) as queries:
+                autocomplete(lookup, text)
+            with connection.cursor() as cursor:
+                cursor.execute("EXPLAIN QUERY PLAN " + queries[0]['sql'])
+                plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+            self.assertIn(index, plan)
+
+
+class TestAutocompleteView(TestCase):
+    """Tests the autocompletion view."""
+
+    def setUp(self):
+        """Create a team."""
+        self.time_slot = create_time_slot()[1]
+        self.url = reverse('sports-manager:autocomplete', kwargs={'lookup': 'teams'})
+
+    def test_anonymous(self):
+        """The view is restricted to the staff."""
+        r = self.client.get(self.url, {'term': 'hello'})
+        self.assertEqual(r.status_code, 403)
+
+    def test_staff(self):
+        """Test the objects completed."""
+        user_info = create_user(staff=True)[0]
+        self.assertTrue(self.client.login(username=user_info['username'], password=user_info['password']))
+        r = self.client.get(self.url, {'term': 'hello'})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json(), {
+            'results': [{'id': str(self.time_slot.team.pk), 'text': "Hello World Team - mixed"}],
+            'pagination': {'more': False},
+        })
+
+    def test_unknown_lookup(self):
+        """Test an unknown lookup."""
+        user_info = create_user(staff=True)[0]
+        self.assertTrue(self.client.login(username=user_info['username'], password=user_info['password']))
+        r = self.client.get(reverse('sports-manager:autocomplete', kwargs={'lookup': 'toto'}), {'term': 'a'})
+        self.assertEqual(r.status_code, 404)
+
+
+class TestAutocompleteForms(TestCase):
+    """Tests that the forms only render the selected objects."""
+
+    def create_objects(self, start, end):
+        """Create a user, a team and a gymnasium for each number between start and end."""
+        category = Category.objects.create(name="Category {}".format(start), min_age=18)
+        for i in range(start, end):
+            create_user("user{}".format(i))
+            Team.objects.create(category=category, name="Team {}".format(i), recrutment=True)
+            Gymnasium.objects.create(name="Gym {}".format(i), address="Toto", city="Toto", zip_code=1)
+
+    def assertConstantNumberOfQueries(self, render):
+        """Check that rendering runs the same number of queries with 1 or 10 objects of each model."""
+        self.create_objects(0, 1)
+        with CaptureQueriesContext(connection) as queries:
+            html = render()
+        self.create_objects(1, 10)
+        with self.assertNumQueries(len(queries)):
+            self.assertEqual(render().count('<option'), html.count('<option'))
+
+    def test_time_slot(self):
+        """Test the form of a time slot."""
+        time_slot = create_time_slot()[1]
+        self.assertConstantNumberOfQueries(lambda: str(TimeSlotForm(instance=time_slot)))
+        self.assertIn(reverse('sports-manager:autocomplete', kwargs={'lookup': 'gymnasiums'}),
+                      str(TimeSlotForm(instance=time_slot)))
+
+    def test_player(self):
+        """Test the form of a player."""
+        owner = create_user()[1]
+        player = Player.objects.create(owner=owner, first_name="Toto", last_name="Tata", sex='MA',
+                                       birthday=date(2000, 1, 1))
+        self.assertConstantNumberOfQueries(lambda: str(PlayerUpdateForm(instance=player)))
+        self.assertIn('<option value="{}" selected>toto</option>'.format(owner.pk),
+                      str(PlayerUpdateForm(instance=player)))
+
+    def test_player_owner_staff_only(self):
+        """Only the staff, who can use the autocompletion, can change the owner of a player."""
+        owner = create_user()[1]
+        staff = create_user(username='staff', staff=True)[1]
+        player = Player.objects.create(owner=owner, first_name="Toto", last_name="Tata", sex='MA',
+                                       birthday=date(2000, 1, 1))
+        url = reverse('sports-manager:autocomplete', kwargs={'lookup': 'users'})
+
+        for user, editable in ((owner, False), (staff, True)):
+            view = PlayerUpdateView(object=player, kwargs={})
+            view.request = RequestFactory().get('/')
+            view.request.user = user
+            form = view.get_form()
+            self.assertEqual('owner' in form.fields, editable)
+            self.assertEqual(url in str(form), editable)
+
+    def test_team(self):
+        """Test the trainer of a team."""
+        team = create_time_slot()[1].team
+        team.trainer = create_user()[1]
+        team.save()
+        self.assertConstantNumberOfQueries(lambda: str(TeamForm(instance=team)['trainer']))
+
+    def test_valid(self):
+        """The selected objects are validated."""
+        time_slot = create_time_slot()[1]
+        form = TimeSlotForm({'type': time_slot.type, 'team': time_slot.team.pk, 'gymnasium': time_slot.gymnasium.pk,
+                             'day': 1, 'start': '20:00', 'end': '22:00'}, instance=time_slot)
+        self.assertTrue(form.is_valid(), form.errors)
+        form = TimeSlotForm({'type': time_slot.type, 'team': 0, 'gymnasium': time_slot.gymnasium.pk,
+                             'day': 1, 'start': '20:00', 'end': '22:00'}, instance=time_slot)
+        self.assertFalse(form.is_valid())
+        self.assertIn('team', form.errors)
@@ -0,0 +1,60 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the bulk inserts."""
+
+# Standard library
+from unittest import mock
+
+# Django
+from django.db import connection, transaction
+from django.db.transaction import TransactionManagementError
+from django.test import TestCase, TransactionTestCase
+
+# Current django project
+from sports_manager.bulk import bulk_create_with_pks
+from sports_manager.models import Gymnasium
+
+
+def gymnasiums(*names):
+    """Return unsaved gymnasiums."""
+    return [Gymnasium(slug=name.lower(), name=name, address="Toto", city="Toto", zip_code=1) for name in names]
+
+
+class TestBulkCreateWithPks(TestCase):
+    """Tests bulk_create_with_pks."""
+
+    def assertPks(self, objs):
+        """Check that the objects have the primary keys of their rows."""
+        self.assertTrue(all(obj.pk is not None for obj in objs))
+        self.assertEqual([Gymnasium.objects.get(pk=obj.pk).name for obj in objs], [obj.name for obj in objs])
+
+    def test_pks(self):
+        """The objects get the primary keys of their rows."""
+        Gymnasium.objects.create(name="First", address="Toto", city="Toto", zip_code=1)
+        self.assertPks(bulk_create_with_pks(Gymnasium, gymnasiums("A", "B", "C")))
+        self.assertPks(bulk_create_with_pks(Gymnasium, gymnasiums("D", "E"), batch_size=1))
+
+    def test_one_by_one(self):
+        """The backends without a write lock nor returned IDs insert the objects one by one."""
+        with mock.patch.object(connection, 'vendor', 'other'):
+            with self.assertNumQueries(3):
+                objs = bulk_create_with_pks(Gymnasium, gymnasiums("A", "B", "C"))
+        self.assertPks(objs)
+        self.assertFalse(objs[0]._state.adding)
+
+    def test_empty(self):
+        """Nothing is inserted."""
+        with self.assertNumQueries(0):
+            self.assertEqual(bulk_create_with_pks(Gymnasium, []), [])
+
+
+class TestBulkCreateWithPksTransaction(TransactionTestCase):
+    """Tests that bulk_create_with_pks requires a transaction."""
+
+    def test_transaction(self):
+        """The primary keys can only be fetched back inside a transaction."""
+        with self.assertRaises(TransactionManagementError):
+            bulk_create_with_pks(Gymnasium, gymnasiums("A"))
+        with transaction.atomic():
+            self.assertIsNotNone(bulk_create_with_pks(Gymnasium, gymnasiums("A"))[0].pk)
@@ -0,0 +1,149 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the responsive variants of the images."""
+
+# Standard library
+import io
+import shutil
+import tempfile
+
+# Third-party
+from PIL import Image
+
+# Django
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+
+# Current django project
+from sports_manager.models import Category, Team
+
+from .helper import create_category, create_team
+
+
+def upload(width, height, name='photo.png', mode='RGBA'):
+    """Return an uploaded PNG image."""
+    buffer = io.BytesIO()
+    Image.new(mode, (width, height), (200, 10, 10, 128) if mode == 'RGBA' else (200, 10, 10)).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class TestImageVariants(TestCase):
+    """Tests the generation of the variants when an image is saved."""
+
+    def setUp(self):
+        """Store the media in a temporary directory."""
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, MEDIA_URL='/media/')
+        self.settings_override.enable()
+
+    def tearDown(self):
+        """Delete the temporary directory."""
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_no_image(self):
+        """No variants without image."""
+        team = create_team()[1]
+
+        self.assertEqual(team.img_variants, '')
+        self.assertEqual(team.image_variants(), [])
+        self.assertEqual(team.thumbnail_url(), '')
+
+    def test_variants_generated(self):
+        """The image is resized to the configured widths smaller than the image in every format."""
+        team = create_team()[1]
+        team.img = upload(1000, 500)
+        team.save()
+
+        team = Team.objects.get(pk=team.pk)
+        self.assertEqual([(v['width'], v['height']) for v in team.image_variants('webp')], [(320, 160), (640, 320)])
+        self.assertEqual([v['width'] for v in team.image_variants('jpeg')], [320, 640])
+        for variant in team.image_variants():
+            self.assertTrue(team.img.storage.exists(variant['name']))
+            with team.img.storage.open(variant['name']) as f:
+                self.assertEqual(Image.open(f).format, variant['format'].upper())
+        self.assertEqual(team.image_variants_source(), team.img.name)
+
+    def test_small_image(self):
+        """An image smaller than every width gets a single variant at its own width."""
+        category = create_category()[1]
+        category.img = upload(200, 100, mode='RGB')
+        category.save()
+
+        category = Category.objects.get(pk=category.pk)
+        self.assertEqual([v['width'] for v in category.image_variants()], [200, 200])
+
+    @override_settings(SPORTS_MANAGER={'image_widths': (100,), 'image_formats': ('jpeg',)})
+    def test_srcset(self):
+        """The helpers list the URLs of the variants."""
+        team = create_team()[1]
+        team.img = upload(400, 400)
+        team.save()
+
+        url = '/media/' + team.image_variants('jpeg')[0]['name']
+        self.assertRegex(url, r'^/media/teams/hello-world-team/team\.[0-9a-f]{16}\.100w\.[0-9a-f]{16}\.jpeg$')
+        self.assertEqual(team.srcset('jpeg'), '{} 100w'.format(url))
+        self.assertEqual(team.srcset('webp'), '')
+        self.assertEqual(team.thumbnail_url(), url)
+
+        rendered = Template(
+            '{% load sports_manager_images %}{% responsive_image team "50vw" "logo" %}|{{ team|srcset:"jpeg" }}'
+        ).render(Context({'team': team}))
+        self.assertEqual(rendered,
+                         '<picture><source type="image/jpeg" srcset="{url} 100w" sizes="50vw">'
+                         '<img class="logo" src="{url}" alt="Hello World Team - mixed"></picture>'
+                         '|{url} 100w'.format(url=url))
+
+    def test_stale_variants_deleted(self):
+        """The previous image and the variants that are not generated again are deleted."""
+        team = create_team()[1]
+        team.img = upload(1000, 500)
+        team.save()
+        previous = team.image_variants()
+        previous_image = team.img.name
+
+        team.img = upload(500, 250)
+        team.save()
+
+        storage = team.img.storage
+        self.assertFalse(storage.exists(previous_image))
+        self.assertEqual([v['width'] for v in team.image_variants()], [320, 320])
+        self.assertTrue(all(storage.exists(v['name']) for v in team.image_variants()))
+        # The names of the variants are derived from the name of the image
+        self.assertFalse(any(storage.exists(v['name']) for v in previous))
+
+    def test_save_without_new_image(self):
+        """Saving the object without uploading an image does not generate the variants again."""
+        team = create_team()[1]
+        team.img = upload(1000, 500)
+        team.save()
+        team.img.storage.delete(team.image_variants()[0]['name'])
+
+        team = Team.objects.get(pk=team.pk)
+        team.save()
+
+        self.assertFalse(team.img.storage.exists(team.image_variants()[0]['name']))
+
+    def test_command(self):
+        """The command regenerates the missing or outdated variants in a process pool."""
+        team = create_team()[1]
+        team.img = upload(1000, 500)
+        team.save()
+        Team.objects.update(img_variants='')
+
+        out = io.StringIO()
+        call_command('generate_image_variants', workers=2, stdout=out)
+
+        self.assertIn('teams: 1 image(s) processed', out.getvalue())
+        self.assertEqual([v['width'] for v in Team.objects.get(pk=team.pk).image_variants('webp')], [320, 640])
+
+        out = io.StringIO()
+        call_command('generate_image_variants', workers=2, stdout=out)
+        self.assertIn('teams: 0 image(s) processed', out.getvalue())
+
+        out = io.StringIO()
+        call_command('generate_image_variants', workers=2, force=True, stdout=out)
+        self.assertIn('teams: 1 image(s) processed', out.getvalue())
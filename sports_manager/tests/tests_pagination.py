@@ -0,0 +1,215 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the cursor pagination."""
+
+# Django
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# Current django project
+from sports_manager.models import Gymnasium, License, Player
+from sports_manager.pagination import CursorPaginator, InvalidCursor, decode_cursor, encode_cursor
+
+from .helper import create_player, create_user
+
+
+def create_gymnasiums():
+    """Create gymnasiums, created in another order than their names."""
+    for i in range(23):
+        Gymnasium.objects.create(name='Gymnasium {:02d}'.format((i * 7) % 23), address='Rue',
+                                 city='City {}'.format(i % 3), zip_code=12345)
+
+
+class TestCursorPaginator(TestCase):
+    """Tests CursorPaginator."""
+
+    def setUp(self):
+        """Create gymnasiums."""
+        create_gymnasiums()
+        self.expected = list(Gymnasium.objects.order_by('name', 'city', 'pk'))
+
+    def walk(self, paginator):
+        """Return the pages from the first one to the last one."""
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_cursor))
+        return pages
+
+    def test_forward(self):
+        """The pages follow the Meta.ordering of the model with the primary key as tiebreaker."""
+        pages = self.walk(CursorPaginator(Gymnasium.objects.all(), 5))
+
+        self.assertEqual([len(page) for page in pages], [5, 5, 5, 5, 3])
+        self.assertEqual([g for page in pages for g in page], self.expected)
+        self.assertFalse(pages[0].has_previous())
+        self.assertTrue(all(page.has_previous() for page in pages[1:]))
+
+    def test_backward(self):
+        """The previous cursors go back through the same pages."""
+        paginator = CursorPaginator(Gymnasium.objects.all(), 5)
+        pages = self.walk(paginator)
+
+        page = pages[-1]
+        backward = [page]
+        while page.has_previous():
+            page = paginator.page(page.previous_cursor)
+            backward.append(page)
+
+        self.assertEqual([list(p) for p in reversed(backward)], [list(p) for p in pages])
+        self.assertFalse(backward[-1].has_previous())
+        self.assertTrue(backward[-1].has_next())
+
+    def test_descending(self):
+        """Descending orderings are supported."""
+        pages = self.walk(CursorPaginator(Gymnasium.objects.all(), 4, ordering=['-name', 'city']))
+
+        self.assertEqual([g for page in pages for g in page],
+                         list(Gymnasium.objects.order_by('-name', 'city', 'pk')))
+
+    def test_tiebreak(self):
+        """The rows with the same values are ordered by their primary key and never skipped."""
+        owner = create_user()[1]
+        for i in range(8):
+            create_player(owner)
+
+        pages = self.walk(CursorPaginator(Player.objects.all(), 3))
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 2])
+        self.assertEqual([p.pk for page in pages for p in page],
+                         list(Player.objects.order_by('pk').values_list('pk', flat=True)))
+
+    def test_datetime_ordering(self):
+        """The datetimes survive the encoding of the cursor."""
+        owner = create_user()[1]
+        player = create_player(owner)[1]
+        for i in range(7):
+            License.objects.create(player=player, number=str(i), is_payed=False)
+
+        pages = self.walk(CursorPaginator(License.objects.all(), 3))
+
+        self.assertEqual([l for page in pages for l in page], list(License.objects.order_by('created', 'pk')))
+
+    def test_no_count(self):
+        """Nothing is counted unless asked."""
+        with CaptureQueriesContext(connection) as ctx:
+            paginator = CursorPaginator(Gymnasium.objects.all(), 5)
+            paginator.page()
+            self.assertIsNone(paginator.count)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        self.assertEqual(CursorPaginator(Gymnasium.objects.all(), 5, with_count=True).count, 23)
+
+    def test_following(self):
+        """The first objects of the next page are fetched with the page."""
+        paginator = CursorPaginator(Gymnasium.objects.all(), 5)
+
+        with CaptureQueriesContext(connection) as ctx:
+            page = paginator.page(following=3)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(list(page), self.expected[:5])
+        self.assertEqual(page.following, self.expected[5:8])
+
+        # Nothing follows the last page, and nothing is fetched backward
+        page = paginator.page(self.walk(paginator)[-2].next_cursor, following=3)
+        self.assertEqual(list(page), self.expected[20:])
+        self.assertEqual(page.following, [])
+        self.assertEqual(paginator.page(page.previous_cursor, following=3).following, [])
+
+    def test_invalid_cursor(self):
+        """The cursors that can not be decoded are rejected."""
+        paginator = CursorPaginator(Gymnasium.objects.all(), 5)
+
+        for cursor in ('abc', encode_cursor('x', []), encode_cursor('n', ['a'])):
+            with self.assertRaises(InvalidCursor):
+                paginator.page(cursor)
+
+    def test_tampered_cursor(self):
+        """The cursors modified by the clients are rejected."""
+        paginator = CursorPaginator(Gymnasium.objects.all(), 5)
+        cursor = paginator.page().next_cursor
+
+        # A well-formed token without signature, then one with an invalid signature
+        for tampered in (cursor.rsplit(':', 1)[0], cursor[:-1] + ('A' if cursor[-1] != 'A' else 'B')):
+            with self.assertRaises(InvalidCursor):
+                paginator.page(tampered)
+
+    def test_invalid_values(self):
+        """The values which do not fit the ordering fields are rejected."""
+        paginator = CursorPaginator(License.objects.all(), 5)
+
+        with self.assertRaises(InvalidCursor):
+            paginator.page(encode_cursor('n', ['garbage', 1]))
+
+    def test_cursor_round_trip(self):
+        """The cursors are decoded to what has been encoded."""
+        self.assertEqual(decode_cursor(encode_cursor('p', ['a', 1])), ('p', ['a', 1]))
+
+
+class TestCursorPaginationViews(TestCase):
+    """Tests the views using the mixin."""
+
+    def test_gymnasium_list(self):
+        """The gymnasiums are browsed with cursors and without COUNT."""
+        create_gymnasiums()
+        url = reverse('sports-manager:gymnasium-list')
+
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get(url)
+        self.assertFalse(any('COUNT(' in q['sql'] for q in ctx.captured_queries))
+
+        seen = list(r.context['gymnasium_list'])
+        self.assertTrue(r.context['is_paginated'])
+        while r.context['page_obj'].has_next():
+            r = self.client.get(url, {'cursor': r.context['page_obj'].next_cursor})
+            seen.extend(r.context['gymnasium_list'])
+
+        self.assertEqual(seen, list(Gymnasium.objects.order_by('name', 'city', 'pk')))
+
+    def test_invalid_cursor(self):
+        """An invalid cursor gives a 404."""
+        r = self.client.get(reverse('sports-manager:gymnasium-list'), {'cursor': '!!'})
+
+        self.assertEqual(r.status_code, 404)
+
+    def test_player_list(self):
+        """The players of an owner are paginated."""
+        owner_info, owner = create_user()
+        for i in range(12):
+            create_player(owner)
+        self.assertTrue(self.client.login(username=owner_info['username'], password=owner_info['password']))
+        url = reverse('sports-manager:player-list', kwargs={'username': owner.username})
+
+        r = self.client.get(url)
+        self.assertEqual(len(r.context['player_list']), 10)
+
+        r = self.client.get(url, {'cursor': r.context['page_obj'].next_cursor})
+        self.assertEqual(len(r.context['player_list']), 2)
+        self.assertFalse(r.context['page_obj'].has_next())
+
+    def test_license_list(self):
+        """The licenses of an owner are paginated."""
+        owner_info, owner = create_user()
+        player = create_player(owner)[1]
+        for i in range(11):
+            License.objects.create(player=player, number=str(i), is_payed=False)
+        self.assertTrue(self.client.login(username=owner_info['username'], password=owner_info['password']))
+        url = reverse('sports-manager:license-list', kwargs={'username': owner.username})
+
+        r = self.client.get(url)
+        self.assertEqual(len(r.context['license_list']), 10)
+
+        r = self.client.get(url, {'cursor': r.context['page_obj'].next_cursor})
+        self.assertEqual(len(r.context['license_list']), 1)
+
+    def test_license_list_tampered_cursor(self):
+        """A cursor whose values do not fit the ordering gives a 404."""
+        owner_info, owner = create_user()
+        self.assertTrue(self.client.login(username=owner_info['username'], password=owner_info['password']))
+        url = reverse('sports-manager:license-list', kwargs={'username': owner.username})
+
+        for values in (['garbage', 1], [{'a': 1}, 1]):
+            r = self.client.get(url, {'cursor': encode_cursor('n', values)})
+            self.assertEqual(r.status_code, 404)
@@ -0,0 +1,221 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the full-text search."""
+
+# Standard library
+from datetime import date
+from io import StringIO
+
+# Django
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+# Current django project
+from sports_manager.models import Category, Gymnasium, License, Player, SearchDocument, Team
+from sports_manager.models.player import EmergencyContact
+from sports_manager.search import fold, get_backend, search, tokenize, trigrams
+
+from .helper import create_team, create_user
+
+
+class TestText(TestCase):
+    """Tests the normalization of the text."""
+
+    def test_fold(self):
+        """The accents are removed and the text is lowercased."""
+        self.assertEqual(fold("Éloïse DUPRÉ"), "eloise dupre")
+
+    def test_tokenize(self):
+        """Test the words of a text."""
+        self.assertEqual(tokenize("12, rue de l'Église"), ['12', 'rue', 'de', 'l', 'eglise'])
+
+    def test_trigrams(self):
+        """The first trigrams of a word are the ones of its prefixes."""
+        self.assertEqual(trigrams('dupre'), ['  d', ' du', 'dup', 'upr', 'pre'])
+        self.assertEqual(trigrams('dup'), trigrams('dupre')[:3])
+
+
+class SearchTestMixin:
+    """Tests of the search run with each backend."""
+
+    def setUp(self):
+        """Create objects of every kind."""
+        self.owner = create_user()[1]
+        self.team = create_team()[1]
+        self.u15 = Team.objects.create(category=self.team.category, name="U15 Garçons", level='SIL', sex='MA',
+                                       recrutment=True)
+        self.player = Player.objects.create(owner=self.owner, first_name="Éloïse", last_name="Dupré", sex='FE',
+                                            birthday=date(2010, 1, 1))
+        self.other = Player.objects.create(owner=self.owner, first_name="Jean", last_name="Dupont", sex='MA',
+                                           birthday=date(2010, 1, 1))
+        License.objects.create(player=self.player, number='1', is_payed=True).teams.add(self.u15)
+        self.gymnasium = Gymnasium.objects.create(name="Gymnase Jean Moulin", address="12 rue Victor Hugo",
+                                                  city="Lyon", zip_code=69001, phone="0100000000")
+        self.contact = EmergencyContact.objects.create(player=self.other, first_name="Marie", last_name="Curie",
+                                                       phone="0600000000")
+
+    def titles(self, query, **kwargs):
+        """Return the types and the titles of the results."""
+        return [(result['type'], result['title']) for result in search(query, **kwargs)]
+
+    def test_backend(self):
+        """Test the backend in use."""
+        self.assertEqual(get_backend().name, self.backend)
+
+    def test_accents(self):
+        """The accents and the case are ignored."""
+        self.assertEqual(self.titles("ELOISE dupre"), [('player', "Éloïse Dupré")])
+
+    def test_prefix(self):
+        """The words of the query are prefixes."""
+        self.assertEqual(set(self.titles("dup")), {('player', "Éloïse Dupré"), ('player', "Jean Dupont"),
+                                                   ('emergency-contact', "Marie Curie")})
+        self.assertEqual(self.titles("dupon", kinds=['player']), [('player', "Jean Dupont")])
+
+    def test_player_team(self):
+        """The players are found by the teams of their licenses."""
+        self.assertEqual(self.titles("u15 dup"), [('player', "Éloïse Dupré")])
+
+    def test_gymnasium_address(self):
+        """The gymnasiums are found by their address."""
+        self.assertEqual(self.titles("rue victor"), [('gymnasium', "Gymnase Jean Moulin")])
+        self.assertEqual(search("lyon")[0]['subtitle'], "12 rue Victor Hugo, 69001 Lyon")
+
+    def test_emergency_contact(self):
+        """The emergency contacts are found by their name and the name of their player."""
+        results = search("curie")
+        self.assertEqual([(result['type'], result['subtitle']) for result in results],
+                         [('emergency-contact', "Jean Dupont")])
+        self.assertEqual(results[0]['url'], reverse('sports-manager:player-list', kwargs={'username': 'toto'}))
+        self.assertEqual(self.titles("dupont", kinds=['emergency-contact']), [('emergency-contact', "Marie Curie")])
+
+    def test_category(self):
+        """Test the categories."""
+        self.assertIn(('category', "Hello World"), self.titles("hello"))
+
+    def test_ranking(self):
+        """The matches in the title come first."""
+        self.assertEqual(self.titles("jean"), [('player', "Jean Dupont"), ('gymnasium', "Gymnase Jean Moulin"),
+                                               ('emergency-contact', "Marie Curie")])
+
+    def test_kinds(self):
+        """The results can be restricted to some types."""
+        self.assertEqual(self.titles("jean", kinds=['gymnasium']), [('gymnasium', "Gymnase Jean Moulin")])
+
+    def test_limit(self):
+        """The number of results is capped."""
+        self.assertEqual(len(search("jean", limit=2)), 2)
+
+    def test_empty(self):
+        """Test a query without words."""
+        self.assertEqual(search(" ,; "), [])
+
+    def test_queries(self):
+        """The search runs two queries."""
+        get_backend()
+        with self.assertNumQueries(2):
+            search("dup")
+
+    def test_rename_team(self):
+        """The documents of the players of a renamed team are updated."""
+        self.u15.name = "U17 Garçons"
+        self.u15.save()
+
+        self.assertEqual(self.titles("u15"), [])
+        self.assertEqual(set(self.titles("u17")), {('team', "U17 Garçons"), ('player', "Éloïse Dupré")})
+
+    def test_remove_team(self):
+        """The documents of the players are updated when their teams change."""
+        self.u15.license_set.clear()
+        self.assertEqual(self.titles("u15"), [('team', "U15 Garçons")])
+
+        License.objects.get().teams.add(self.u15)
+        self.assertIn(('player', "Éloïse Dupré"), self.titles("u15"))
+
+        self.u15.delete()
+        self.assertEqual(self.titles("u15"), [])
+
+    def test_rename_player(self):
+        """The documents of the emergency contacts show the name of their player."""
+        self.other.last_name = "Martin"
+        self.other.save()
+
+        self.assertEqual(self.titles("dupont"), [])
+        self.assertEqual(search("curie")[0]['subtitle'], "Jean Martin")
+
+    def test_delete(self):
+        """The documents of the deleted objects are removed."""
+        self.other.delete()
+        self.gymnasium.delete()
+
+        self.assertEqual(self.titles("jean"), [])
+        self.assertFalse(SearchDocument.objects.filter(kind__in=['gymnasium', 'emergency-contact']).exists())
+
+    def test_rebuild(self):
+        """Test the command building the documents again."""
+        SearchDocument.objects.filter(kind='player').delete()
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+
+        self.assertEqual(out.getvalue(), "7 document(s) indexed with the {} backend\n".format(self.backend))
+        self.assertEqual(self.titles("u15 dup"), [('player', "Éloïse Dupré")])
+
+
+@override_settings(SPORTS_MANAGER={'search_backend': 'fts5'})
+class TestFts5Search(SearchTestMixin, TestCase):
+    """Tests the search with SQLite FTS5."""
+
+    backend = 'fts5'
+
+
+@override_settings(SPORTS_MANAGER={'search_backend': 'trigram'})
+class TestTrigramSearch(SearchTestMixin, TestCase):
+    """Tests the search with the trigram table."""
+
+    backend = 'trigram'
+
+
+class TestSearchView(TestCase):
+    """Tests the search endpoint."""
+
+    def setUp(self):
+        """Create a category."""
+        Category.objects.create(name="Seniors", min_age=18, summary="Adults", description="")
+
+    def get(self, **params):
+        """Search as a member of the staff."""
+        create_user('staff', staff=True)
+        self.client.login(username='staff', password='hello-world')
+        return self.client.get(reverse('sports-manager:search'), params)
+
+    def test_anonymous(self):
+        """The search is reserved to the staff."""
+        r = self.client.get(reverse('sports-manager:search'), {'q': 'seniors'})
+        self.assertEqual(r.status_code, 403)
+
+    def test_not_staff(self):
+        """Test as a logged user."""
+        create_user()
+        self.client.login(username='toto', password='hello-world')
+        r = self.client.get(reverse('sports-manager:search'), {'q': 'seniors'})
+        self.assertEqual(r.status_code, 403)
+
+    def test_search(self):
+        """Test the results."""
+        r = self.get(q='senior')
+
+        self.assertEqual(r.status_code, 200)
+        data = r.json()
+        self.assertEqual(data['query'], 'senior')
+        self.assertEqual([(result['type'], result['title'], result['url']) for result in data['results']],
+                         [('category', "Seniors", reverse('sports-manager:category-detail',
+                                                          kwargs={'slug': 'seniors'}))])
+
+    def test_unknown_type(self):
+        """Test an unknown type."""
+        r = self.get(q='senior', type='category,license')
+
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(r.json(), {'errors': {'type': ["Unknown type(s): license."]}})
@@ -0,0 +1,145 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the statistics of the committee."""
+
+# Standard library
+from datetime import date, timedelta
+
+# Django
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+# Current django project
+from sports_manager.models import Category, License, MedicalCertificate, Player, Season
+from sports_manager.models.season import current_season
+from sports_manager.stats import build_stats, get_stats, years_before
+
+from .helper import create_team, create_user
+
+
+class TestStats(TestCase):
+    """Tests the computation of the statistics."""
+
+    def setUp(self):
+        """Create licenses of adults in the team of a category and of a child without team."""
+        cache.clear()
+        self.team = create_team()[1]
+        self.kids = Category.objects.create(name='Kids', min_age=6, max_age=12, summary='', description='')
+        owner = create_user()[1]
+        today = timezone.localdate()
+
+        def add(first_name, sex, age, is_payed, team=None):
+            player = Player.objects.create(owner=owner, first_name=first_name, last_name='Tata', sex=sex,
+                                           birthday=years_before(today, age) - timedelta(days=1))
+            license = License.objects.create(player=player, number=first_name, is_payed=is_payed)
+            if team is not None:
+                license.teams.add(team)
+            return player
+
+        MedicalCertificate.objects.create(player=add('Adam', 'MA', 30, True, self.team),
+                                          validation=MedicalCertificate.VALID)
+        MedicalCertificate.objects.create(player=add('Eve', 'FE', 25, False, self.team),
+                                          validation=MedicalCertificate.VALID, end=today - timedelta(days=1))
+        MedicalCertificate.objects.create(player=add('Kid', 'MA', 10, True), validation=MedicalCertificate.IN_VALIDATION)
+        old = add('Old', 'FE', 40, True)
+        License.objects.filter(player=old).update(season=Season.objects.for_year(current_season() - 1))
+        License.all_objects.get(player=old).teams.add(self.team)
+
+    def tearDown(self):
+        """Do not leak the cached statistics to the other tests."""
+        cache.clear()
+
+    def test_queries(self):
+        """The statistics are computed with four queries."""
+        with self.assertNumQueries(4):
+            build_stats(current_season(), timezone.localdate())
+
+    def test_totals(self):
+        """The licenses of the season are counted by payment, certificate and sex."""
+        stats = build_stats(current_season(), timezone.localdate())
+
+        self.assertEqual(stats['total'], 3)
+        self.assertEqual(stats['payed'], 2)
+        self.assertEqual(stats['payed_percentage'], 67)
+        self.assertEqual(stats['certified'], 1)
+        self.assertEqual(stats['without_team'], 1)
+        self.assertEqual([(s['sex'], s['count']) for s in stats['sexes']], [('MA', 2), ('FE', 1)])
+        self.assertEqual({c['validation']: c['count'] for c in stats['certificates']}, {
+            MedicalCertificate.NOT_UPLOADED: 0,
+            MedicalCertificate.IN_VALIDATION: 1,
+            MedicalCertificate.VALID: 2,
+            MedicalCertificate.REJECTED: 0,
+        })
+        self.assertEqual(stats['expired_certificates'], 1)
+        self.assertEqual(stats['teams'], [{'name': 'Hello World Team', 'slug': 'hello-world-team',
+                                           'player_count': 2, 'payed_player_count': 1, 'certified_player_count': 1}])
+
+    def test_categories(self):
+        """The categories get their licenses through their teams and the players of their ages."""
+        stats = build_stats(current_season(), timezone.localdate())
+
+        kids, adults = stats['categories']
+        self.assertEqual((kids['name'], kids['licenses'], kids['bracket']), ('Kids', 0, 1))
+        self.assertEqual((adults['name'], adults['licenses'], adults['payed'], adults['sexes'], adults['bracket']),
+                         ('Hello World', 2, 1, [1, 1], 2))
+        self.assertEqual(adults['payed_percentage'], 50)
+
+    def test_age_boundaries(self):
+        """A player is in the bracket from its birthday of the minimal age to the eve of the one after the maximal."""
+        today = date(2020, 3, 1)
+        owner = Player.objects.first().owner
+        Player.objects.all().delete()
+        for birthday in (date(2014, 3, 2), date(2014, 3, 1), date(2007, 3, 2), date(2007, 3, 1)):
+            player = Player.objects.create(owner=owner, first_name='A', last_name='B', sex='MA', birthday=birthday)
+            License.objects.create(player=player, number='1', is_payed=False)
+
+        stats = build_stats(current_season(), today)
+
+        self.assertEqual(stats['categories'][0]['bracket'], 2)
+
+    def test_cache(self):
+        """The statistics are cached."""
+        get_stats()
+
+        with self.assertNumQueries(0):
+            get_stats()
+
+    @override_settings(SPORTS_MANAGER={'stats_timeout': 0})
+    def test_timeout(self):
+        """The duration of the cache is configurable."""
+        get_stats()
+
+        with self.assertNumQueries(4):
+            get_stats()
+
+
+class TestStatsView(TestCase):
+    """Tests the dashboard."""
+
+    def tearDown(self):
+        """Do not leak the cached statistics to the other tests."""
+        cache.clear()
+
+    def test_anonymous(self):
+        """The visitors are denied."""
+        self.assertEqual(self.client.get(reverse('sports-manager:stats')).status_code, 403)
+
+    def test_user(self):
+        """The users are denied."""
+        user_info = create_user()[0]
+        self.assertTrue(self.client.login(username=user_info['username'], password=user_info['password']))
+
+        self.assertEqual(self.client.get(reverse('sports-manager:stats')).status_code, 403)
+
+    def test_staff(self):
+        """The staff sees the dashboard."""
+        user_info = create_user(staff=True)[0]
+        self.assertTrue(self.client.login(username=user_info['username'], password=user_info['password']))
+
+        r = self.client.get(reverse('sports-manager:stats'))
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.context['stats']['total'], 0)
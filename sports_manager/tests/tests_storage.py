@@ -0,0 +1,152 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the storages."""
+
+# Standard library
+import os
+import shutil
+import tempfile
+
+# Django
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.test import RequestFactory, TestCase, override_settings
+
+# Current django project
+from sports_manager.storage import ContentAddressedStorage, OverwriteStorage, is_content_addressed
+from sports_manager.views.media import serve
+
+# sha256(b'hello')
+HELLO_DIGEST = '2cf24dba5fb0a30e'
+
+
+class TestContentAddressedStorage(TestCase):
+    """Tests ContentAddressedStorage."""
+
+    def setUp(self):
+        """Create a storage in a temporary directory different from the MEDIA_ROOT."""
+        self.location = tempfile.mkdtemp()
+        self.storage = ContentAddressedStorage(location=self.location, base_url='/media/')
+
+    def tearDown(self):
+        """Delete the temporary directory."""
+        shutil.rmtree(self.location)
+
+    def test_hashed_name(self):
+        """The digest of the content is inserted in the name."""
+        name = self.storage.save('teams/a/team.txt', ContentFile(b'hello'))
+
+        self.assertEqual(name, 'teams/a/team.{}.txt'.format(HELLO_DIGEST))
+        with self.storage.open(name) as f:
+            self.assertEqual(f.read(), b'hello')
+        self.assertEqual(self.storage.url(name), '/media/teams/a/team.{}.txt'.format(HELLO_DIGEST))
+
+    def test_text_content(self):
+        """The text content is stored as UTF-8."""
+        name = self.storage.save('a.txt', ContentFile('hello'))
+
+        self.assertEqual(name, 'a.{}.txt'.format(HELLO_DIGEST))
+
+    def test_max_length(self):
+        """The name is truncated so that it fits in the field once the digest is inserted."""
+        name = self.storage.save('teams/a/{}.txt'.format('a' * 200), ContentFile(b'hello'), max_length=100)
+
+        self.assertEqual(len(name), 100)
+        self.assertEqual(name, 'teams/a/{}.{}.txt'.format('a' * 71, HELLO_DIGEST))
+        self.assertTrue(self.storage.exists(name))
+
+    def test_max_length_too_short(self):
+        """The name cannot be truncated more than its stem."""
+        with self.assertRaises(SuspiciousFileOperation):
+            self.storage.save('teams/a/team.txt', ContentFile(b'hello'), max_length=20)
+
+    def test_deduplicated(self):
+        """The same content saved twice under the same name is stored once."""
+        first = self.storage.save('teams/a/team.txt', ContentFile(b'hello'))
+        second = self.storage.save('teams/a/team.txt', ContentFile(b'hello'))
+
+        self.assertEqual(first, second)
+        self.assertEqual(os.listdir(os.path.join(self.location, 'teams', 'a')), [os.path.basename(first)])
+
+    def test_new_content_new_name(self):
+        """Another content gets another name and does not replace the previous file."""
+        first = self.storage.save('teams/a/team.txt', ContentFile(b'hello'))
+        second = self.storage.save('teams/a/team.txt', ContentFile(b'world'))
+
+        self.assertNotEqual(first, second)
+        self.assertTrue(self.storage.exists(first))
+        self.assertTrue(self.storage.exists(second))
+
+    @override_settings(FILE_UPLOAD_PERMISSIONS=0o640)
+    def test_permissions(self):
+        """The permissions of the settings are applied."""
+        storage = ContentAddressedStorage(location=self.location)
+        name = storage.save('a.txt', ContentFile(b'hello'))
+
+        self.assertEqual(os.stat(storage.path(name)).st_mode & 0o777, 0o640)
+
+    def test_no_temporary_file_left(self):
+        """The temporary file is removed when the content can not be read."""
+        class BrokenFile(ContentFile):
+            def chunks(self, chunk_size=None):
+                yield b'hel'
+                raise IOError("Connection lost")
+
+        with self.assertRaises(IOError):
+            self.storage.save('a.txt', BrokenFile(b'hello'))
+        self.assertEqual(os.listdir(self.location), [])
+
+    def test_is_content_addressed(self):
+        """Only the hashed names are recognized."""
+        self.assertTrue(is_content_addressed('teams/a/team.{}.jpg'.format(HELLO_DIGEST)))
+        self.assertTrue(is_content_addressed('teams/a/team.{}'.format(HELLO_DIGEST)))
+        self.assertFalse(is_content_addressed('teams/a/team.jpg'))
+        self.assertFalse(is_content_addressed('teams/a/team.{}.jpg'.format(HELLO_DIGEST[:8])))
+
+
+class TestOverwriteStorage(TestCase):
+    """Tests OverwriteStorage."""
+
+    def test_location(self):
+        """The existing file is replaced in the location of the storage, not in the MEDIA_ROOT."""
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        storage = OverwriteStorage(location=location)
+
+        storage.save('a.txt', ContentFile(b'hello'))
+        name = storage.save('a.txt', ContentFile(b'world'))
+
+        self.assertEqual(name, 'a.txt')
+        with storage.open(name) as f:
+            self.assertEqual(f.read(), b'world')
+
+
+class TestServe(TestCase):
+    """Tests the media view."""
+
+    def setUp(self):
+        """Create a file."""
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location)
+        self.storage = ContentAddressedStorage(location=self.location)
+        self.factory = RequestFactory()
+
+    def test_immutable(self):
+        """The content-addressed files are cached forever."""
+        name = self.storage.save('a.txt', ContentFile(b'hello'))
+
+        r = serve(self.factory.get('/media/' + name), name, document_root=self.location)
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r['Cache-Control'], 'public, max-age=31536000, immutable')
+
+    def test_not_hashed(self):
+        """The other files are served without cache headers."""
+        with open(os.path.join(self.location, 'a.txt'), 'wb') as f:
+            f.write(b'hello')
+
+        r = serve(self.factory.get('/media/a.txt'), 'a.txt', document_root=self.location)
+
+        self.assertEqual(r.status_code, 200)
+        self.assertNotIn('Cache-Control', r)
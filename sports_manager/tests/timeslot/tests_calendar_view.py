@@ -0,0 +1,196 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the iCalendar feeds."""
+
+# Standard library
+from datetime import time
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# Current django project
+from sports_manager.ical import first_occurrence, fold, player_token, serialize_timezone
+from sports_manager.models import License, TimeSlot
+
+from ..helper import create_player, create_team, create_time_slot, create_user
+
+
+class TestCalendarHelpers(TestCase):
+    """Tests the serialization helpers."""
+
+    def test_first_occurrence(self):
+        """The first occurrence is the first matching day of the season."""
+        # The 1st of September 2018 is a saturday
+        self.assertEqual(first_occurrence(TimeSlot.SATURDAY, 2018).isoformat(), '2018-09-01')
+        self.assertEqual(first_occurrence(TimeSlot.MONDAY, 2018).isoformat(), '2018-09-03')
+        self.assertEqual(first_occurrence(TimeSlot.FRIDAY, 2018).isoformat(), '2018-09-07')
+
+    def test_fold(self):
+        """The long lines are folded at 75 octets."""
+        line = 'SUMMARY:' + 'é' * 100
+        folded = fold(line)
+
+        self.assertTrue(all(len(part.encode('utf-8')) <= 75 for part in folded.split('\r\n')))
+        self.assertEqual(folded.replace('\r\n ', ''), line)
+
+    @override_settings(TIME_ZONE='Europe/Paris')
+    def test_timezone(self):
+        """The time zone lists the offset at the start of the season and its changes."""
+        self.assertEqual(serialize_timezone(2018).split('\r\n'), [
+            'BEGIN:VTIMEZONE',
+            'TZID:Europe/Paris',
+            'BEGIN:DAYLIGHT',
+            'DTSTART:20180901T000000',
+            'TZOFFSETFROM:+0200',
+            'TZOFFSETTO:+0200',
+            'TZNAME:CEST',
+            'END:DAYLIGHT',
+            'BEGIN:STANDARD',
+            'DTSTART:20181028T030000',
+            'TZOFFSETFROM:+0200',
+            'TZOFFSETTO:+0100',
+            'TZNAME:CET',
+            'END:STANDARD',
+            'BEGIN:DAYLIGHT',
+            'DTSTART:20190331T020000',
+            'TZOFFSETFROM:+0100',
+            'TZOFFSETTO:+0200',
+            'TZNAME:CEST',
+            'END:DAYLIGHT',
+            'END:VTIMEZONE',
+        ])
+
+    @override_settings(TIME_ZONE='UTC')
+    def test_timezone_without_changes(self):
+        """A time zone without offset changes has a single component."""
+        self.assertEqual(serialize_timezone(2018).count('BEGIN:STANDARD'), 1)
+        self.assertNotIn('BEGIN:DAYLIGHT', serialize_timezone(2018))
+
+
+class TestCalendarViews(TestCase):
+    """Tests the feeds of the teams, gymnasiums and players."""
+
+    def setUp(self):
+        """Create a time slot."""
+        cache.clear()
+        self.team = create_team()[1]
+        self.time_slot = create_time_slot(team=self.team)[1]
+
+    def tearDown(self):
+        """Do not leak the cached feeds to the other tests."""
+        cache.clear()
+
+    def test_team(self):
+        """The time slots of the team are weekly events."""
+        r = self.client.get(reverse('sports-manager:team-calendar', kwargs={'slug': self.team.slug}))
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r['Content-Type'], 'text/calendar; charset=utf-8')
+        content = r.content.decode('utf-8')
+        self.assertTrue(content.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertIn('UID:timeslot-{}@sports-manager\r\n'.format(self.time_slot.pk), content)
+        self.assertIn('RRULE:FREQ=WEEKLY;BYDAY=MO;UNTIL=', content)
+        self.assertIn('BEGIN:VTIMEZONE\r\nTZID:America/Chicago\r\n', content)
+        self.assertIn('DTSTART;TZID=America/Chicago:', content)
+        self.assertIn('T200000\r\n', content)
+        self.assertIn('T223000\r\n', content)
+        self.assertIn('SUMMARY:Hello World Team - practice\r\n', content)
+
+    @override_settings(TIME_ZONE='Europe/Paris')
+    def test_until(self):
+        """The events end with the season, the end of the rule is a UTC time."""
+        r = self.client.get(reverse('sports-manager:team-calendar', kwargs={'slug': self.team.slug}))
+
+        season = self.time_slot.season.year
+        self.assertIn('UNTIL={}0831T220000Z\r\n'.format(season + 1), r.content.decode('utf-8'))
+
+    def test_unknown_team(self):
+        """Unknown team."""
+        r = self.client.get(reverse('sports-manager:team-calendar', kwargs={'slug': 'unknown'}))
+
+        self.assertEqual(r.status_code, 404)
+
+    def test_gymnasium(self):
+        """The time slots taking place in the gymnasium are listed."""
+        r = self.client.get(reverse('sports-manager:gymnasium-calendar',
+                                    kwargs={'slug': self.time_slot.gymnasium.slug}))
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.content.decode('utf-8').count('BEGIN:VEVENT'), 1)
+
+    def test_player(self):
+        """The time slots of the teams of the licenses of the player are listed."""
+        player = create_player(create_user()[1])[1]
+        license = License.objects.create(player=player, number='1', is_payed=True)
+        license.teams.add(self.team)
+
+        r = self.client.get(reverse('sports-manager:player-calendar', kwargs={'token': player_token(player)}))
+
+        self.assertEqual(r.status_code, 200)
+        self.assertIn('UID:timeslot-{}@'.format(self.time_slot.pk), r.content.decode('utf-8'))
+
+    def test_player_without_license(self):
+        """A player without license has an empty calendar."""
+        player = create_player(create_user()[1])[1]
+
+        r = self.client.get(reverse('sports-manager:player-calendar', kwargs={'token': player_token(player)}))
+
+        self.assertEqual(r.status_code, 200)
+        self.assertNotIn('BEGIN:VEVENT', r.content.decode('utf-8'))
+
+    def test_player_bad_token(self):
+        """A forged token is rejected."""
+        r = self.client.get(reverse('sports-manager:player-calendar', kwargs={'token': '1:forged'}))
+
+        self.assertEqual(r.status_code, 404)
+
+    def test_if_none_match(self):
+        """A client with the current ETag gets a 304 response with a single query."""
+        url = reverse('sports-manager:team-calendar', kwargs={'slug': self.team.slug})
+        etag = self.client.get(url)['ETag']
+
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(r.status_code, 304)
+        # The team and the time slots
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+    def test_only_changed_events_serialized(self):
+        """Only the modified time slots are fetched again."""
+        other = TimeSlot.objects.create(type=TimeSlot.MATCH, team=self.team, gymnasium=self.time_slot.gymnasium,
+                                        day=TimeSlot.FRIDAY, start=time(18, 0), end=time(19, 0))
+        url = reverse('sports-manager:team-calendar', kwargs={'slug': self.team.slug})
+        etag = self.client.get(url)['ETag']
+
+        other.start = time(17, 0)
+        other.save()
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(r.status_code, 200)
+        self.assertNotEqual(r['ETag'], etag)
+        self.assertIn('T170000\r\n', r.content.decode('utf-8'))
+        fetched = [q['sql'] for q in ctx.captured_queries if '"sports_manager_timeslot"."id" IN' in q['sql']]
+        self.assertEqual(len(fetched), 1)
+        self.assertIn('IN ({})'.format(other.pk), fetched[0])
+
+    def test_team_and_gymnasium_changes(self):
+        """Renaming the team or moving the gymnasium changes the events."""
+        self.team.name = "Renamed"
+        self.team.save()
+        url = reverse('sports-manager:team-calendar', kwargs={'slug': self.team.slug})
+        self.client.get(url)
+
+        self.time_slot.gymnasium.address = "Somewhere else"
+        self.time_slot.gymnasium.save()
+        r = self.client.get(url)
+
+        self.assertEqual(r.status_code, 200)
+        self.assertIn('SUMMARY:Renamed - practice\r\n', r.content.decode('utf-8'))
+        self.assertIn('Somewhere else', r.content.decode('utf-8'))
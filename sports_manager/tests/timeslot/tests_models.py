@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `sports-manager` models module."""
+
+# Standard library
+from datetime import time
+from io import StringIO
+
+# Django
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+# Current django project
+from sports_manager.models import Season, Team, TimeSlot
+from sports_manager.models.season import current_season
+
+from ..helper import create_gymnasium, create_team
+
+
+class TestTimeSlotModel(TestCase):
+    """Test the TimeSlot model."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a gymnasium and two teams."""
+        cls.gymnasium = create_gymnasium()[1]
+        cls.team = create_team()[1]
+        cls.other = Team.objects.create(category=cls.team.category, name="Other", recrutment=True)
+
+    def create(self, start, end, team=None, day=TimeSlot.MONDAY):
+        """Create a time slot in the gymnasium."""
+        return TimeSlot.objects.create(type=TimeSlot.PRACTICE, team=team or self.team, gymnasium=self.gymnasium,
+                                       day=day, start=start, end=end)
+
+    def test_clean_end_before_start(self):
+        """Test that a time slot can not end before it starts."""
+        ts = TimeSlot(type=TimeSlot.PRACTICE, team=self.team, gymnasium=self.gymnasium, day=TimeSlot.MONDAY,
+                      start=time(20), end=time(19))
+        with self.assertRaises(ValidationError):
+            ts.full_clean()
+
+    def test_clean_overlap(self):
+        """Test that a time slot can not overlap another one in the same gymnasium."""
+        self.create(time(20), time(22), team=self.other)
+
+        ts = TimeSlot(type=TimeSlot.PRACTICE, team=self.team, gymnasium=self.gymnasium, day=TimeSlot.MONDAY,
+                      start=time(21), end=time(23))
+        with self.assertRaisesMessage(ValidationError, "Other"):
+            ts.full_clean()
+
+        # Same time on another day
+        ts.day = TimeSlot.TUESDAY
+        ts.full_clean()
+
+        # Adjacent time slots do not overlap
+        ts.day, ts.start, ts.end = TimeSlot.MONDAY, time(22), time(23)
+        ts.full_clean()
+
+    def test_clean_overlap_other_season(self):
+        """Test that the time slots are only compared with the ones of their season."""
+        self.create(time(20), time(22), team=self.other)
+        next_season = Season.objects.for_year(current_season() + 1)
+
+        ts = TimeSlot(season=next_season, type=TimeSlot.PRACTICE, team=self.team, gymnasium=self.gymnasium,
+                      day=TimeSlot.MONDAY, start=time(21), end=time(23))
+        ts.full_clean()
+        ts.save()
+
+        other = TimeSlot(season=next_season, type=TimeSlot.PRACTICE, team=self.other, gymnasium=self.gymnasium,
+                         day=TimeSlot.MONDAY, start=time(22), end=time(23))
+        with self.assertRaisesMessage(ValidationError, "Hello World Team"):
+            other.full_clean()
+
+    def test_clean_does_not_conflict_with_itself(self):
+        """Test that updating a time slot does not make it conflict with itself."""
+        ts = self.create(time(20), time(22))
+        ts.end = time(22, 30)
+        ts.full_clean()
+
+    def test_find_conflicts(self):
+        """Test the detection of the overlapping time slots."""
+        a = self.create(time(18), time(20))
+        b = self.create(time(19), time(21), team=self.other)
+        c = self.create(time(19, 30), time(19, 45), team=self.other)
+        self.create(time(21), time(22))
+        self.create(time(19), time(21), day=TimeSlot.FRIDAY)
+
+        with self.assertNumQueries(1):
+            conflicts = TimeSlot.objects.find_conflicts()
+
+        self.assertEqual({frozenset((x.pk, y.pk)) for x, y in conflicts},
+                         {frozenset((a.pk, b.pk)), frozenset((a.pk, c.pk)), frozenset((b.pk, c.pk))})
+
+    def test_occupancy_report(self):
+        """Test the occupancy of the gymnasium."""
+        self.create(time(18), time(20))
+        self.create(time(19), time(21), team=self.other)
+        self.create(time(21, 30), time(22))
+
+        report = TimeSlot.objects.occupancy_index().report()
+        self.assertEqual(len(report), 1)
+        self.assertEqual(report[0]['slots'], 3)
+        self.assertEqual(report[0]['blocks'], [(time(18), time(21)), (time(21, 30), time(22))])
+        self.assertEqual(report[0]['occupied_minutes'], 210)
+
+    def test_gymnasium_occupancy_command(self):
+        """Test the command printing the occupancy report."""
+        self.create(time(18), time(20))
+        out = StringIO()
+        call_command('gymnasium_occupancy', '--check', stdout=out)
+        self.assertIn("Toto - monday: 1 slot(s), 2h00 (18:00-20:00)", out.getvalue())
+
+        self.create(time(19), time(21), team=self.other)
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('gymnasium_occupancy', '--check', stdout=out)
+        self.assertIn("Conflict in Toto on monday", out.getvalue())
@@ -0,0 +1,188 @@
+#! /usr/bin/env python
+# coding=utf-8
+
+"""Tests the weekly schedule."""
+
+# Standard library
+from datetime import time, timedelta
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date
+from django.utils.translation import override
+
+# Current django project
+from sports_manager.cache import MODIFIED_KEY, SCHEDULE
+from sports_manager.models import TimeSlot
+
+from ..helper import create_team, create_time_slot
+
+
+def add_time_slot(time_slot, day):
+    """Create a time slot like `time_slot` during another day."""
+    return TimeSlot.objects.create(type=time_slot.type, team=time_slot.team, gymnasium=time_slot.gymnasium, day=day,
+                                   start=time_slot.start, end=time_slot.end)
+
+
+class TestScheduleView(TestCase):
+    """Tests the schedule served as HTML and JSON."""
+
+    def setUp(self):
+        """Create two time slots."""
+        cache.clear()
+        self.team = create_team()[1]
+        self.monday = create_time_slot(team=self.team)[1]
+        self.thursday = add_time_slot(self.monday, TimeSlot.THURSDAY)
+
+    def tearDown(self):
+        """Do not leak the cached schedule to the other tests."""
+        cache.clear()
+
+    def test_html(self):
+        """The time slots are grouped by day."""
+        r = self.client.get(reverse('sports-manager:schedule'))
+
+        self.assertEqual(r.status_code, 200)
+        days = r.context['days']
+        self.assertEqual(len(days), 7)
+        self.assertEqual([ts['id'] for ts in days[TimeSlot.MONDAY]['time_slots']], [self.monday.pk])
+        self.assertEqual([ts['id'] for ts in days[TimeSlot.THURSDAY]['time_slots']], [self.thursday.pk])
+        self.assertEqual(days[TimeSlot.FRIDAY]['time_slots'], [])
+        self.assertIn('ETag', r)
+        self.assertIn('Last-Modified', r)
+
+    def test_json(self):
+        """The schedule is also served as JSON."""
+        r = self.client.get(reverse('sports-manager:schedule-json'))
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r['Content-Type'], 'application/json')
+        time_slot = r.json()['days'][TimeSlot.MONDAY]['time_slots'][0]
+        self.assertEqual(time_slot['start'], '20:00')
+        self.assertEqual(time_slot['end'], '22:30')
+        self.assertEqual(time_slot['team'], {'name': self.team.name, 'slug': self.team.slug})
+        self.assertEqual(time_slot['gymnasium']['slug'], self.monday.gymnasium.slug)
+
+    def test_time_slots_fetched_in_one_query(self):
+        """The teams and the gymnasiums are fetched with the time slots."""
+        for day in (TimeSlot.TUESDAY, TimeSlot.WEDNESDAY, TimeSlot.FRIDAY, TimeSlot.SATURDAY, TimeSlot.SUNDAY):
+            add_time_slot(self.monday, day)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('sports-manager:schedule-json'))
+        timeslot_queries = [q for q in ctx.captured_queries if 'FROM "sports_manager_timeslot"' in q['sql']]
+        # The aggregate giving the ETag and the query fetching the time slots
+        self.assertEqual(len(timeslot_queries), 2)
+
+    def test_schedule_cached(self):
+        """The time slots are not fetched again while the schedule does not change."""
+        url = reverse('sports-manager:schedule-json')
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get(url)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_if_none_match(self):
+        """A client with the current ETag gets a 304 response."""
+        url = reverse('sports-manager:schedule-json')
+        etag = self.client.get(url)['ETag']
+
+        r = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(r.status_code, 304)
+        self.assertEqual(r['ETag'], etag)
+
+    def test_etag_per_format_and_language(self):
+        """The representations in another format or language have another ETag."""
+        html_etag = self.client.get(reverse('sports-manager:schedule'))['ETag']
+        r = self.client.get(reverse('sports-manager:schedule-json'))
+        self.assertNotEqual(r['ETag'], html_etag)
+        self.assertIn('Accept-Language', r['Vary'])
+
+        with override('fr'):
+            r = self.client.get(reverse('sports-manager:schedule-json'), HTTP_IF_NONE_MATCH=r['ETag'])
+        self.assertEqual(r.status_code, 200)
+        self.assertIn('Accept-Language', r['Vary'])
+
+    def test_if_modified_since(self):
+        """A client with the current version gets a 304 response."""
+        url = reverse('sports-manager:schedule')
+        last_modified = self.client.get(url)['Last-Modified']
+
+        r = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(r.status_code, 304)
+
+    def test_etag_changes_with_time_slot(self):
+        """Updating a time slot changes the ETag and the content."""
+        url = reverse('sports-manager:schedule-json')
+        etag = self.client.get(url)['ETag']
+
+        self.monday.start = time(19, 0)
+        self.monday.save()
+        r = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(r.status_code, 200)
+        self.assertNotEqual(r['ETag'], etag)
+        self.assertEqual(r.json()['days'][TimeSlot.MONDAY]['time_slots'][0]['start'], '19:00')
+
+    def test_etag_changes_with_time_slot_deletion(self):
+        """Deleting a time slot changes the ETag."""
+        url = reverse('sports-manager:schedule-json')
+        etag = self.client.get(url)['ETag']
+
+        self.thursday.delete()
+        r = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json()['days'][TimeSlot.THURSDAY]['time_slots'], [])
+
+    def test_etag_changes_with_team(self):
+        """Renaming a team changes the ETag and the content."""
+        url = reverse('sports-manager:schedule-json')
+        etag = self.client.get(url)['ETag']
+
+        self.team.name = "Renamed"
+        self.team.save()
+        r = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json()['days'][TimeSlot.MONDAY]['time_slots'][0]['team']['name'], "Renamed")
+
+    def set_modified_in_past(self):
+        """Move the modification dates of the time slots and of the schedule an hour back, return the header."""
+        past = timezone.now() - timedelta(hours=1)
+        TimeSlot.objects.update(modified=past)
+        cache.set(MODIFIED_KEY.format(name=SCHEDULE), past, timeout=None)
+        return http_date(int(past.timestamp()))
+
+    def test_last_modified_changes_with_deletion(self):
+        """Deleting a time slot moves the Last-Modified date forward."""
+        url = reverse('sports-manager:schedule')
+        last_modified = self.set_modified_in_past()
+        self.assertEqual(self.client.get(url)['Last-Modified'], last_modified)
+
+        self.thursday.delete()
+        r = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(r.status_code, 200)
+        self.assertGreater(parse_http_date(r['Last-Modified']), parse_http_date(last_modified))
+
+    def test_last_modified_changes_with_team(self):
+        """Renaming a team moves the Last-Modified date forward."""
+        url = reverse('sports-manager:schedule')
+        last_modified = self.set_modified_in_past()
+
+        self.team.name = "Renamed"
+        self.team.save()
+        r = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(r.status_code, 200)
+        self.assertGreater(parse_http_date(r['Last-Modified']), parse_http_date(last_modified))
@@ -6,9 +6,11 @@
 from __future__ import absolute_import, unicode_literals
 
 # Django
+from django.contrib import admin
 from django.contrib.auth import views as auth_views
 from django.urls import include, path
 
 urlpatterns = [
+    path('admin/', admin.site.urls),
     path('', include('sports_manager.urls', namespace='sports_manager')),
 ]
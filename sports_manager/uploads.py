@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Chunked and resumable upload of the medical certificates.
+
+The protocol is close to tus (https://tus.io):
+
+1. the client creates an upload giving the name, the size and the SHA-256 checksum of the file;
+2. it sends the content by chunks in the body of PUT requests, each one with an `Upload-Offset` header telling where
+   the chunk starts;
+3. after an interruption, it asks the current offset of the upload and sends the rest.
+
+The chunks are streamed from the request to a partial file on disk, so the memory used by a worker does not depend on
+the size of the chunks or of the file. Once every byte has been received, the checksum of the partial file is verified
+and the file is moved to the storage of the certificate.
+"""
+
+# Standard library
+import hashlib
+import logging
+import os
+import tempfile
+
+# Django
+from django.core.files import File
+from django.db import transaction
+from django.utils.translation import ugettext as _
+
+# Current django project
+from sports_manager.conf import get_setting
+from sports_manager.models import MedicalCertificate
+
+logger = logging.getLogger(__name__)
+
+# Size of the buffers used to read the requests and the partial files
+BUFFER_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """Error raised when a chunk can not be written or when the upload can not be completed."""
+
+    def __init__(self, message, status=400):
+        """Keep the HTTP status of the error."""
+        super().__init__(message)
+        self.status = status
+
+
+class PartialFile(File):
+    """Complete partial file that the file system storages move instead of copying it."""
+
+    def temporary_file_path(self):
+        """Return the path of the file."""
+        return self.file.name
+
+
+def upload_directory():
+    """Return the directory of the partial files, creating it if needed."""
+    directory = get_setting('upload_directory') or os.path.join(tempfile.gettempdir(), 'sports_manager_uploads')
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def partial_path(upload):
+    """Return the path of the partial file of an upload."""
+    return os.path.join(upload_directory(), '{}.part'.format(upload.token))
+
+
+def write_chunk(upload, stream, offset, length):
+    """Append `length` bytes read from `stream` to the partial file and return the new offset.
+
+    `upload` must have been locked with `select_for_update()`.
+    """
+    if offset != upload.offset:
+        raise UploadError(_("The upload is at offset %(offset)s.") % {'offset': upload.offset}, status=409)
+    if length > get_setting('upload_max_chunk_size'):
+        raise UploadError(_("The chunk is too large."), status=413)
+    if offset + length > upload.size:
+        raise UploadError(_("The chunk ends after the end of the file."))
+
+    path = partial_path(upload)
+    with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+        # Drop the bytes written by an interrupted request that have not been acknowledged
+        f.seek(offset)
+        f.truncate()
+        remaining = length
+        while remaining:
+            data = stream.read(min(BUFFER_SIZE, remaining))
+            if not data:
+                break
+            f.write(data)
+            remaining -= len(data)
+
+    if remaining:
+        raise UploadError(_("The chunk is incomplete."))
+
+    upload.offset = offset + length
+    upload.save(update_fields=['offset', 'modified'])
+    return upload.offset
+
+
+def file_checksum(path):
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for data in iter(lambda: f.read(BUFFER_SIZE), b''):
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def discard(upload):
+    """Delete an upload and its partial file."""
+    path = partial_path(upload)
+    if os.path.exists(path):
+        os.remove(path)
+    upload.delete()
+
+
+def complete(upload):
+    """Verify the checksum of the received file, attach it to the certificate and delete the upload."""
+    path = partial_path(upload)
+    if file_checksum(path) != upload.checksum.lower():
+        # Start over: the received bytes can not be trusted
+        os.remove(path)
+        upload.offset = 0
+        upload.save(update_fields=['offset', 'modified'])
+        raise UploadError(_("The checksum of the file does not match."), status=422)
+
+    certificate = upload.certificate
+    with transaction.atomic():
+        with open(path, 'rb') as f:
+            certificate.file.save(upload.filename, PartialFile(f, name=upload.filename), save=False)
+        certificate.validation = MedicalCertificate.IN_VALIDATION
+        certificate.save(update_fields=['file', 'validation'])
+        upload.delete()
+
+    if os.path.exists(path):
+        os.remove(path)
+    logger.info("Medical certificate {} uploaded to {}".format(certificate.pk, certificate.file.name))
+    return certificate
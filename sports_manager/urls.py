@@ -7,13 +7,20 @@ from django.conf.urls.static import static
 from django.urls import path
 
 # Current django project
+import sports_manager.views.api as vapi
+import sports_manager.views.autocomplete as vautocomplete
+import sports_manager.views.calendar as vcalendar
 import sports_manager.views.category as vcategory
+import sports_manager.views.certificate as vcertificate
 import sports_manager.views.gymnasium as vgymnasium
 import sports_manager.views.license as vlicense
 import sports_manager.views.player as vplayer
+import sports_manager.views.search as vsearch
+import sports_manager.views.stats as vstats
 import sports_manager.views.team as vteam
 import sports_manager.views.timeslot as vtimeslot
 from sports_manager import views
+from sports_manager.api import API_VERSION, CategoryResource, GymnasiumResource, TeamResource, TimeSlotResource
 
 app_name = 'sports-manager'
 urlpatterns = [
@@ -40,6 +47,26 @@ urlpatterns = [
 ]
 
 urlpatterns += [
+     path("stats/",
+          view=vstats.StatsView.as_view(),
+          name='stats',
+          ),
+     path("search/",
+          view=vsearch.SearchView.as_view(),
+          name='search',
+          ),
+     path("autocomplete/<str:lookup>/",
+          view=vautocomplete.AutocompleteView.as_view(),
+          name='autocomplete',
+          ),
+     path("schedule/",
+          view=vtimeslot.ScheduleView.as_view(),
+          name='schedule',
+          ),
+     path("schedule.json",
+          view=vtimeslot.ScheduleView.as_view(format='json'),
+          name='schedule-json',
+          ),
      path("team/",
           view=vteam.TeamListView.as_view(),
           name='team-list',
@@ -60,6 +87,10 @@ urlpatterns += [
           view=vteam.TeamDeleteView.as_view(),
           name='team-delete',
           ),
+     path("team/<str:slug>/calendar.ics",
+          view=vcalendar.TeamCalendarView.as_view(),
+          name='team-calendar',
+          ),
      path("team/<str:slug>/time-slot/",
           view=vtimeslot.TeamTimeSlotListView.as_view(),
           name='team-time-slot-list',
@@ -79,6 +110,34 @@ urlpatterns += [
 ]
 
 urlpatterns += [
+     path("player/import/",
+          view=vplayer.PlayerImportView.as_view(),
+          name='player-import',
+          ),
+     path("player/duplicates/",
+          view=vplayer.PlayerDuplicateView.as_view(),
+          name='player-duplicates',
+          ),
+     path("player/calendar/<str:token>.ics",
+          view=vcalendar.PlayerCalendarView.as_view(),
+          name='player-calendar',
+          ),
+     path("certificate/validation/",
+          view=vcertificate.CertificateValidationQueueView.as_view(),
+          name='certificate-validation-queue',
+          ),
+     path("certificate/<int:pk>/upload/",
+          view=vcertificate.CertificateUploadCreateView.as_view(),
+          name='certificate-upload-create',
+          ),
+     path("certificate/upload/<uuid:token>/",
+          view=vcertificate.CertificateUploadView.as_view(),
+          name='certificate-upload',
+          ),
+     path("license/export/",
+          view=vlicense.LicenseExportView.as_view(),
+          name='license-export',
+          ),
      path("<str:username>/license/",
           view=vlicense.LicenseListView.as_view(),
           name='license-list',
@@ -115,6 +174,10 @@ urlpatterns += [
           view=vgymnasium.GymnasiumDetailView.as_view(),
           name='gymnasium-detail',
           ),
+     path("gymnasium/<slug:slug>/calendar.ics",
+          view=vcalendar.GymnasiumCalendarView.as_view(),
+          name='gymnasium-calendar',
+          ),
      path("gymnasium/<slug:slug>/update/",
           view=vgymnasium.GymnasiumUpdateView.as_view(),
           name='gymnasium-update',
@@ -124,3 +187,38 @@ urlpatterns += [
           name='gymnasium-delete',
           )
 ]
+
+urlpatterns += [
+     path("api/{}/categories/".format(API_VERSION),
+          view=vapi.ApiView.as_view(resource=CategoryResource),
+          name='api-category-list',
+          ),
+     path("api/{}/categories/<slug:slug>/".format(API_VERSION),
+          view=vapi.ApiView.as_view(resource=CategoryResource, many=False),
+          name='api-category-detail',
+          ),
+     path("api/{}/teams/".format(API_VERSION),
+          view=vapi.ApiView.as_view(resource=TeamResource),
+          name='api-team-list',
+          ),
+     path("api/{}/teams/<slug:slug>/".format(API_VERSION),
+          view=vapi.ApiView.as_view(resource=TeamResource, many=False),
+          name='api-team-detail',
+          ),
+     path("api/{}/gymnasiums/".format(API_VERSION),
+          view=vapi.ApiView.as_view(resource=GymnasiumResource),
+          name='api-gymnasium-list',
+          ),
+     path("api/{}/gymnasiums/<slug:slug>/".format(API_VERSION),
+          view=vapi.ApiView.as_view(resource=GymnasiumResource, many=False),
+          name='api-gymnasium-detail',
+          ),
+     path("api/{}/time-slots/".format(API_VERSION),
+          view=vapi.ApiView.as_view(resource=TimeSlotResource),
+          name='api-time-slot-list',
+          ),
+     path("api/{}/time-slots/<int:pk>/".format(API_VERSION),
+          view=vapi.ApiView.as_view(resource=TimeSlotResource, many=False),
+          name='api-time-slot-detail',
+          )
+]
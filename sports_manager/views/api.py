@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""JSON API views."""
+
+# Django
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.utils.translation import ugettext as _
+from django.views.generic import View
+
+# Current django project
+from sports_manager.api import ApiError, Document, get_response, render
+
+
+class ApiView(View):
+    """Serve the objects of a resource (or one of them if not `many`) as JSON.
+
+    The response carries a strong ETag so that the clients can send conditional requests.
+    """
+
+    resource = None
+    many = True
+
+    def get_queryset(self):
+        """Return the objects to serialize."""
+        queryset = self.resource.model.objects.all()
+        if not self.many:
+            queryset = queryset.filter(**{self.resource.lookup: self.kwargs[self.resource.lookup]})
+        return queryset
+
+    def get(self, request, *args, **kwargs):
+        """Return the objects or a 304 response if the client already has them."""
+        try:
+            document = Document(self.resource, request.GET)
+        except ApiError as e:
+            return JsonResponse({'errors': {e.parameter: [str(e)]}}, status=400)
+
+        result = get_response(request.path, request.GET, lambda: render(document, self.get_queryset(), self.many))
+        if result is None:
+            return JsonResponse({'errors': {'__all__': [_("Not found.")]}}, status=404)
+
+        body, etag = result
+        etag = quote_etag(etag)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        return response
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""Autocompletion views."""
+
+# Django
+from django.http import Http404, JsonResponse
+from django.views.generic import View
+
+# Current django project
+from sports_manager.autocomplete import LOOKUPS, autocomplete
+from sports_manager.mixins import StaffMixin
+
+
+class AutocompleteView(StaffMixin, View):
+    """Complete the objects selected in the forms (see `sports_manager.autocomplete`).
+
+    Expects the beginning of the object in the `term` parameter, as sent by select2, and returns the first matching
+    objects as JSON in the format of the admin autocompletion.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """Return the objects of the lookup starting with the term."""
+        if kwargs['lookup'] not in LOOKUPS:
+            raise Http404("Unknown lookup '{}'".format(kwargs['lookup']))
+        results = autocomplete(kwargs['lookup'], request.GET.get('term', ''))
+        return JsonResponse({
+            'results': [{'id': str(pk), 'text': label} for pk, label in results],
+            # The results are capped, not paginated
+            'pagination': {'more': False},
+        })
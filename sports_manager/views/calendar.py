@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""iCalendar feed views."""
+
+# Django
+from django.core import signing
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views.generic import View
+
+# Current django project
+from sports_manager.ical import CalendarFeed, player_from_token
+from sports_manager.models import Gymnasium, License, Player, Team, TimeSlot
+
+
+class CalendarView(View):
+    """Serve the time slots returned by `get_feed()` as an iCalendar file."""
+
+    def get_feed(self):
+        """Return the CalendarFeed to serve."""
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        """Return the calendar or a 304 response if the client already has it."""
+        feed = self.get_feed()
+        etag = quote_etag(feed.etag)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(feed.serialize(), content_type='text/calendar; charset=utf-8')
+        response['ETag'] = etag
+        return response
+
+
+class TeamCalendarView(CalendarView):
+    """Time slots of a team."""
+
+    def get_feed(self):
+        """Return the feed of the team."""
+        team = get_object_or_404(Team.objects.only('name'), slug=self.kwargs['slug'])
+        return CalendarFeed(team.name, TimeSlot.objects.filter(team=team))
+
+
+class GymnasiumCalendarView(CalendarView):
+    """Time slots taking place in a gymnasium."""
+
+    def get_feed(self):
+        """Return the feed of the gymnasium."""
+        gymnasium = get_object_or_404(Gymnasium.objects.only('name'), slug=self.kwargs['slug'])
+        return CalendarFeed(gymnasium.name, TimeSlot.objects.filter(gymnasium=gymnasium))
+
+
+class PlayerCalendarView(CalendarView):
+    """Time slots of the teams a player has a license for during the current season.
+
+    Calendar applications can not log in, so the player is identified by a signed token.
+    """
+
+    def get_feed(self):
+        """Return the feed of the player."""
+        try:
+            pk = player_from_token(self.kwargs['token'])
+        except signing.BadSignature:
+            raise Http404
+        player = get_object_or_404(Player.objects.only('first_name', 'last_name'), pk=pk)
+        licenses = License.objects.filter(player=player)
+        return CalendarFeed("{} {}".format(player.first_name, player.last_name),
+                            TimeSlot.objects.filter(team__license__in=licenses).distinct())
@@ -21,6 +21,10 @@ class CategoryListView(ListView):
 
     model = Category
 
+    def get_queryset(self):
+        """Annotate the categories so that the template does not run one query per category."""
+        return super().get_queryset().with_trainer_flags()
+
 
 class CategoryDetailView(DetailView):
     """View that returns the details of a category."""
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""Medical certificate views."""
+
+# Standard library
+import logging
+import re
+
+# Django
+from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
+from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.http import urlencode
+from django.utils.translation import ugettext as _
+from django.views.generic import ListView, View
+
+# Current django project
+from sports_manager import counters
+from sports_manager.conf import get_setting
+from sports_manager.mixins import CursorPaginationMixin, StaffMixin
+from sports_manager.models import CertificateUpload, MedicalCertificate
+from sports_manager.uploads import UploadError, complete, discard, write_chunk
+
+logger = logging.getLogger(__name__)
+
+CHECKSUM_RE = re.compile(r'^[0-9a-fA-F]{64}$')
+
+
+def upload_state(upload, done=False):
+    """Return the JSON description of an upload."""
+    return {
+        'token': str(upload.token),
+        'url': reverse('sports-manager:certificate-upload', kwargs={'token': upload.token}),
+        'offset': upload.offset,
+        'size': upload.size,
+        'complete': done,
+    }
+
+
+class CertificateAccessMixin(LoginRequiredMixin):
+    """Only give access to the certificates of the players of the user, or to every certificate for the staff."""
+
+    raise_exception = True
+
+    def get_certificates(self):
+        """Return the certificates the user can access."""
+        queryset = MedicalCertificate.objects.all()
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(player__owner=self.request.user)
+        return queryset
+
+
+class CertificateUploadCreateView(CertificateAccessMixin, View):
+    """Start the chunked upload of the file of a medical certificate.
+
+    Expects the `filename`, `size` (in bytes) and `checksum` (SHA-256 hex digest) of the file and returns the URL
+    where the chunks have to be sent.
+    """
+
+    def post(self, request, *args, **kwargs):
+        """Create the upload."""
+        certificate = get_object_or_404(self.get_certificates(), pk=self.kwargs['pk'])
+
+        filename = request.POST.get('filename', '').strip()
+        size = request.POST.get('size', '')
+        checksum = request.POST.get('checksum', '')
+        errors = {}
+        if not filename:
+            errors['filename'] = [_("This field is required.")]
+        if not size.isdigit() or not 0 < int(size) <= get_setting('upload_max_size'):
+            errors['size'] = [_("The size must be between 1 and %(max)s bytes.") % {
+                'max': get_setting('upload_max_size')}]
+        if not CHECKSUM_RE.match(checksum):
+            errors['checksum'] = [_("The checksum must be a SHA-256 hex digest.")]
+        if errors:
+            return JsonResponse({'errors': errors}, status=400)
+
+        upload = CertificateUpload.objects.create(certificate=certificate, filename=filename[-255:], size=int(size),
+                                                  checksum=checksum.lower())
+        response = JsonResponse(upload_state(upload), status=201)
+        response['Location'] = upload_state(upload)['url']
+        return response
+
+
+class CertificateUploadView(CertificateAccessMixin, View):
+    """State of an upload (GET), next chunk (PUT) and cancellation (DELETE).
+
+    The body of a PUT request is the chunk and its `Upload-Offset` header the position of the chunk in the file.
+    """
+
+    def get_upload(self, lock=False):
+        """Return the upload if the user can access its certificate."""
+        queryset = CertificateUpload.objects.select_related('certificate__player__owner')
+        if lock:
+            queryset = queryset.select_for_update()
+        upload = get_object_or_404(queryset, token=self.kwargs['token'])
+        if not self.get_certificates().filter(pk=upload.certificate_id).exists():
+            raise Http404
+        return upload
+
+    def get(self, request, *args, **kwargs):
+        """Return the offset to resume the upload from."""
+        return JsonResponse(upload_state(self.get_upload()))
+
+    def put(self, request, *args, **kwargs):
+        """Append a chunk and attach the file to the certificate once every byte has been received."""
+        try:
+            offset = int(request.META.get('HTTP_UPLOAD_OFFSET', ''))
+            length = int(request.META.get('CONTENT_LENGTH', ''))
+        except ValueError:
+            return JsonResponse({'errors': {'__all__': [_("Upload-Offset and Content-Length are required.")]}},
+                                status=400)
+
+        with transaction.atomic():
+            upload = self.get_upload(lock=True)
+            try:
+                # Read the body directly from the request so that it is never loaded in memory at once
+                write_chunk(upload, request, offset, length)
+                if upload.is_complete:
+                    complete(upload)
+                    return JsonResponse(upload_state(upload, done=True))
+            except UploadError as e:
+                logger.info("Upload {} rejected: {}".format(upload.token, e))
+                response = upload_state(upload)
+                response['errors'] = {'__all__': [str(e)]}
+                return JsonResponse(response, status=e.status)
+
+        return JsonResponse(upload_state(upload))
+
+    def delete(self, request, *args, **kwargs):
+        """Cancel the upload."""
+        discard(self.get_upload())
+        return HttpResponse(status=204)
+
+
+class CertificateValidationQueueView(StaffMixin, CursorPaginationMixin, ListView):
+    """Certificates waiting for a validation, oldest first.
+
+    The queue is browsed with a signed cursor (`?after=`) on (created, pk) instead of an offset, so every page is an
+    index range scan whatever its position. The page is fetched with the files of the next certificates, which the
+    template prefetches so that the reviewer does not wait for them.
+    """
+
+    model = MedicalCertificate
+    template_name = 'sports_manager/certificate_validation_queue.html'
+    context_object_name = 'certificate_list'
+    paginate_by = 20
+    cursor_kwarg = 'after'
+    cursor_ordering = ('created',)
+    # Number of certificates of the next page whose file is prefetched
+    paginate_following = 5
+    actions = {
+        'approve': MedicalCertificate.VALID,
+        'reject': MedicalCertificate.REJECTED,
+    }
+
+    def get_queryset(self):
+        """Return the certificates waiting for a validation."""
+        return (MedicalCertificate.objects
+                .filter(validation=MedicalCertificate.IN_VALIDATION)
+                .select_related('player__owner'))
+
+    def get_context_data(self, **kwargs):
+        """Add the files to prefetch and the cursor of the next page."""
+        context = super().get_context_data(**kwargs)
+        page = context['page_obj']
+        context.update({
+            'prefetch_urls': [certificate.file.url for certificate in page.following if certificate.file],
+            'next_cursor': page.next_cursor,
+        })
+        return context
+
+    def post(self, request, *args, **kwargs):
+        """Approve or reject the selected certificates with a single UPDATE."""
+        validation = self.actions.get(request.POST.get('action'))
+        pks = [pk for pk in request.POST.getlist('certificates') if pk.isdigit()]
+        if validation is None or not pks:
+            messages.error(request, _("Select certificates and an action."))
+        else:
+            # Only the certificates still waiting are updated, in case someone else reviewed them meanwhile
+            certificates = MedicalCertificate.objects.filter(pk__in=pks, validation=MedicalCertificate.IN_VALIDATION)
+            players = set(certificates.values_list('player_id', flat=True))
+            count = certificates.update(validation=validation)
+            # update() does not send the signals updating the counters of the teams
+            counters.recompute(counters.teams_of_players(players))
+            logger.info("{} set {} certificate(s) to {}".format(request.user.get_username(), count, validation))
+            messages.success(request, _("%(count)s certificate(s) updated.") % {'count': count})
+
+        url = reverse('sports-manager:certificate-validation-queue')
+        if request.GET.get(self.cursor_kwarg):
+            url += '?' + urlencode({self.cursor_kwarg: request.GET[self.cursor_kwarg]})
+        return HttpResponseRedirect(url)
@@ -9,10 +9,11 @@ from django.urls import reverse
 from django.views.generic import CreateView, DeleteView, DetailView, ListView, UpdateView
 
 # Current django project
+from sports_manager.mixins import CursorPaginationMixin
 from sports_manager.models import Gymnasium
 
 
-class GymnasiumListView(ListView):
+class GymnasiumListView(CursorPaginationMixin, ListView):
     """View that returns the list of Gymnasiums."""
 
     model = Gymnasium
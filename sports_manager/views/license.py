@@ -2,23 +2,26 @@
 """Models."""
 
 # Standard library
+import csv
 import logging
 
 # Django
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.core.exceptions import PermissionDenied
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
-from django.views.generic import CreateView, DetailView, ListView
+from django.views.generic import CreateView, DetailView, ListView, View
 
 # Current django project
+from sports_manager.mixins import CursorPaginationMixin, StaffMixin
 from sports_manager.models import License
 
 logger = logging.getLogger(__name__)
 
 
-class LicenseListView(ListView):
+class LicenseListView(CursorPaginationMixin, ListView):
     """List of license."""
 
     model = License
@@ -38,6 +41,93 @@ class LicenseListView(ListView):
         return super().get(request, args, kwargs)
 
 
+class Echo:
+    """Pseudo-buffer returning the value written instead of storing it."""
+
+    def write(self, value):
+        """Return the value."""
+        return value
+
+
+def iterate_by_chunks(queryset, chunk_size):
+    """Iterate over a queryset by chunks ordered by primary key.
+
+    `QuerySet.iterator()` ignores `prefetch_related()`, so each chunk is fetched as a small list using keyset
+    pagination on the primary key. The memory used stays bounded by the size of a chunk.
+    """
+    last_pk = None
+    while True:
+        chunk = queryset.order_by('pk')
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            return
+        yield from chunk
+        last_pk = chunk[-1].pk
+
+
+class LicenseExportView(StaffMixin, View):
+    """Export the licenses, their players and their payment status as CSV.
+
+    The licenses can be filtered with the `season` (year the season starts), `team` (slug) and `is_payed` (0 or 1)
+    query parameters.
+    """
+
+    chunk_size = 1000
+    header = (
+        'number',
+        'first_name',
+        'last_name',
+        'sex',
+        'birthday',
+        'owner',
+        'email',
+        'teams',
+        'is_payed',
+        'created',
+    )
+
+    def get_queryset(self):
+        """Filter the licenses according to the query parameters."""
+        # Every season unless one is asked
+        queryset = License.all_objects.select_related('player__owner').prefetch_related('teams')
+
+        season = self.request.GET.get('season', '')
+        if season.isdigit():
+            queryset = queryset.for_season(int(season))
+        if self.request.GET.get('team'):
+            queryset = queryset.filter(teams__slug=self.request.GET['team'])
+        if self.request.GET.get('is_payed') in ('0', '1'):
+            queryset = queryset.filter(is_payed=self.request.GET['is_payed'] == '1')
+        return queryset
+
+    def get_rows(self):
+        """Yield the header and a row for each license."""
+        yield self.header
+        for license in iterate_by_chunks(self.get_queryset(), self.chunk_size):
+            yield (
+                license.number,
+                license.player.first_name,
+                license.player.last_name,
+                license.player.sex,
+                license.player.birthday.isoformat(),
+                license.player.owner.get_username(),
+                license.player.owner.email,
+                ";".join(team.name for team in license.teams.all()),
+                int(license.is_payed),
+                license.created.isoformat(),
+            )
+
+    def get(self, request, *args, **kwargs):
+        """Stream the CSV file."""
+        writer = csv.writer(Echo())
+        response = StreamingHttpResponse((writer.writerow(row) for row in self.get_rows()),
+                                         content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="licenses.csv"'
+        return response
+
+
 class LicenseDetailView(DetailView):
     """Detail of a license."""
 
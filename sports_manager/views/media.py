@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""Media files views."""
+
+# Django
+from django.views import static
+
+# Current django project
+from sports_manager.storage import is_content_addressed
+
+# One year, the maximum recommended by RFC 7234
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def serve(request, path, document_root=None, show_indexes=False):
+    """Serve a media file like `django.views.static.serve`, caching forever the content-addressed ones.
+
+    Meant for development, like `django.views.static.serve`::
+
+        urlpatterns += static(settings.MEDIA_URL, view=serve, document_root=settings.MEDIA_ROOT)
+    """
+    response = static.serve(request, path, document_root=document_root, show_indexes=show_indexes)
+    if response.status_code == 200 and is_content_addressed(path):
+        response['Cache-Control'] = 'public, max-age={}, immutable'.format(IMMUTABLE_MAX_AGE)
+    return response
@@ -11,11 +11,18 @@ from django.core.exceptions import PermissionDenied
 from django.http import HttpResponseRedirect
 from django.shortcuts import render
 from django.urls import reverse
-from django.views.generic import CreateView, DeleteView, DetailView, ListView, UpdateView
+from django.views.generic import CreateView, DeleteView, DetailView, FormView, ListView, UpdateView
 
 # Current django project
-from sports_manager.forms.player import EmergencyContactForm, MedicalCertificateForm, PlayerCreationForm
+from sports_manager.duplicates import find_duplicates, merge
+from sports_manager.forms.player import (
+    EmergencyContactForm, MedicalCertificateForm, PlayerCreationForm, PlayerMergeForm, PlayerUpdateForm,
+    RosterImportForm
+)
+from sports_manager.ical import player_token
+from sports_manager.mixins import CursorPaginationMixin, StaffMixin
 from sports_manager.models import Player
+from sports_manager.roster import RosterImporter, read_rows
 
 logger = logging.getLogger(__name__)
 
@@ -42,10 +49,11 @@ def test_access_private_page(request, kwargs, field_to_test):
             test_user_own_page(request, kwargs, field_to_test)
 
 
-class PlayerListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+class PlayerListView(LoginRequiredMixin, UserPassesTestMixin, CursorPaginationMixin, ListView):
     """View that returns the list of categories."""
 
     model = Player
+    paginate_by = 10
     permission_denied_message = "You do not have the right to view this page."            # from AccessMixin
     raise_exception = True
 
@@ -59,6 +67,19 @@ class PlayerListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
         """
         return self.model.objects.filter(owner__username=self.kwargs.get('username'))
 
+    def get_context_data(self, **kwargs):
+        """Give the owner the URL of the calendar of each player (`player.calendar_url`).
+
+        The calendar is not protected by a login, its URL is only shown to the owner of the players.
+        """
+        context = super().get_context_data(**kwargs)
+        if self.request.user.get_username() == self.kwargs.get('username'):
+            for player in context['object_list']:
+                player.calendar_url = self.request.build_absolute_uri(
+                    reverse('sports-manager:player-calendar', kwargs={'token': player_token(player)})
+                )
+        return context
+
 
 class PlayerDetailView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
     """View that returns the details of a category."""
@@ -92,7 +113,7 @@ class PlayerUpdateView(UpdateView):
     """View that updates a new category."""
 
     model = Player
-    fields = '__all__'
+    form_class = PlayerUpdateForm
 
     def get(self, request, *args, **kwargs):
         """."""
@@ -108,6 +129,13 @@ class PlayerUpdateView(UpdateView):
 
         return super().post(request, args, kwargs)
 
+    def get_form(self, form_class=None):
+        """Only the staff can change the owner, the users are completed by a staff-only endpoint."""
+        form = super().get_form(form_class)
+        if not self.request.user.is_staff:
+            del form.fields['owner']
+        return form
+
     def get_success_url(self):
         """Get the URL after the success."""
         messages.success(self.request, "Player '{}' updated successfully".format(self.object.name))
@@ -139,6 +167,54 @@ class PlayerDeleteView(DeleteView):
         return reverse('sports-manager:player-list')
 
 
+class PlayerImportView(StaffMixin, FormView):
+    """View that imports a roster of players from a CSV or XLSX file."""
+
+    form_class = RosterImportForm
+    template_name = 'sports_manager/player_import_form.html'
+
+    def form_valid(self, form):
+        """Import the file and show the report."""
+        f = form.cleaned_data['file']
+        try:
+            report = RosterImporter().run(read_rows(f.file, f.name))
+        except ValueError as e:
+            form.add_error('file', str(e))
+            return self.form_invalid(form)
+
+        logger.info("{} imported the file {}: {}".format(self.request.user.get_username(), f.name, report))
+        messages.success(self.request, str(report))
+        return self.render_to_response(self.get_context_data(form=form, report=report))
+
+
+class PlayerDuplicateView(StaffMixin, FormView):
+    """View that reports the players registered twice and merges them (see `sports_manager.duplicates`)."""
+
+    form_class = PlayerMergeForm
+    template_name = 'sports_manager/player_duplicates.html'
+
+    def get_context_data(self, **kwargs):
+        """Add the duplicates."""
+        context = super().get_context_data(**kwargs)
+        context['duplicates'] = find_duplicates()
+        return context
+
+    def form_valid(self, form):
+        """Merge the duplicates into the player."""
+        player = form.cleaned_data['player']
+        duplicates = form.cleaned_data['duplicates']
+        moved = merge(player, duplicates)
+        logger.info("{} merged {} into {}".format(self.request.user.get_username(),
+                                                  ", ".join(str(duplicate) for duplicate in duplicates), player))
+        messages.success(self.request, "{} duplicate(s) merged into '{}', {} object(s) moved".format(
+            len(duplicates), player, moved))
+        return super().form_valid(form)
+
+    def get_success_url(self):
+        """Get the URL after the success."""
+        return reverse('sports-manager:player-duplicates')
+
+
 def create_new_player(request, username):
     """Check http://www.joshuakehn.com/2013/7/18/multiple-django-forms-in-one-form.html."""
     if request.POST:
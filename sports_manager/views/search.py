@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Search views."""
+
+# Django
+from django.http import JsonResponse
+from django.utils.translation import ugettext as _
+from django.views.generic import View
+
+# Current django project
+from sports_manager.mixins import StaffMixin
+from sports_manager.models import SearchDocument
+from sports_manager.search import search
+
+
+class SearchView(StaffMixin, View):
+    """Search the players, teams, categories, gymnasiums and emergency contacts (see `sports_manager.search`).
+
+    Expects the query in the `q` parameter and optionally a comma separated list of types in `type`, returns the best
+    ranked documents as JSON.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """Return the results of the search."""
+        query = request.GET.get('q', '').strip()
+        kinds = [kind.strip() for kind in request.GET.get('type', '').split(',') if kind.strip()]
+        unknown = set(kinds) - {kind for kind, _name in SearchDocument.KINDS}
+        if unknown:
+            return JsonResponse({'errors': {'type': [_("Unknown type(s): %(types)s.") % {
+                'types': ', '.join(sorted(unknown))}]}}, status=400)
+        return JsonResponse({'query': query, 'results': search(query, kinds)})
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""Statistics views."""
+
+# Django
+from django.views.generic import TemplateView
+
+# Current django project
+from sports_manager.mixins import StaffMixin
+from sports_manager.stats import get_stats
+
+
+class StatsView(StaffMixin, TemplateView):
+    """Dashboard of the licenses of the current season for the committee (see `sports_manager.stats`)."""
+
+    template_name = 'sports_manager/stats.html'
+
+    def get_context_data(self, **kwargs):
+        """Add the cached statistics."""
+        kwargs['stats'] = get_stats()
+        return super().get_context_data(**kwargs)
@@ -12,7 +12,11 @@ from django.utils.text import slugify
 from django.views.generic import CreateView, DeleteView, DetailView, ListView, UpdateView
 
 # Current django project
+from sports_manager.cache import get_team_version
+from sports_manager.conf import get_setting
+from sports_manager.forms.team import TeamForm
 from sports_manager.models import Team
+from sports_manager.models.season import current_season
 
 logger = logging.getLogger(__name__)
 
@@ -24,26 +28,38 @@ class TeamListView(ListView):
 
 
 class TeamDetailView(DetailView):
-    """View that returns the details of a team."""
+    """View that returns the details of a team.
+
+    The template caches the details under the slug and the version of the team (see `sports_manager.cache`) and the
+    current season, so the time slots are only fetched when the cached fragment is missing and the time slots of the
+    previous season are not shown once a new season starts.
+    """
 
     model = Team
     slug_field = 'slug'
 
+    def get_context_data(self, **kwargs):
+        """Add the season and the version of the cached fragments, the lazy queryset of the time slots and the roster.
+
+        The status of the certificates and of the payments of the players is only shown to the staff and the trainer.
+        """
+        context = super().get_context_data(**kwargs)
+        context['team_cache_version'] = get_team_version(self.object.slug)
+        context['team_cache_timeout'] = get_setting('cache_timeout')
+        context['team_cache_season'] = current_season()
+        context['time_slots'] = self.object.get_training_days()
+        context['players'] = self.object.get_players()
+        context['show_roster_status'] = (self.request.user.is_staff or
+                                         (self.object.trainer_id is not None and
+                                          self.object.trainer_id == self.request.user.pk))
+        return context
+
 
 class TeamCreateView(CreateView):
     """View that creates a new team."""
 
     model = Team
-    fields = [
-        'name',
-        'category',
-        'level',
-        'sex',
-        'recrutment',
-        'url',
-        'description',
-        'img',
-    ]
+    form_class = TeamForm
 
     def get(self, request, *args, **kwargs):
         """."""
@@ -75,16 +91,7 @@ class TeamUpdateView(UpdateView):
 
     model = Team
     slug_field = 'slug'
-    fields = [
-        'name',
-        'category',
-        'level',
-        'sex',
-        'recrutment',
-        'url',
-        'description',
-        'img',
-    ]
+    form_class = TeamForm
 
     def get(self, request, *args, **kwargs):
         """."""
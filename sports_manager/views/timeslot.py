@@ -3,25 +3,66 @@
 
 # Standard library
 import logging
+from calendar import timegm
 
 # Django
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
-from django.http import Http404
+from django.http import Http404, JsonResponse
 from django.urls import reverse
-from django.views.generic import CreateView, DeleteView, DetailView, ListView, UpdateView
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.views.generic import CreateView, DeleteView, DetailView, ListView, TemplateView, UpdateView
 
 # Current django project
+from sports_manager.forms.timeslot import TimeSlotForm
 from sports_manager.models import Team, TimeSlot
+from sports_manager.schedule import ScheduleState, get_schedule
 
 logger = logging.getLogger(__name__)
 
 
 class TeamTimeSlotListView(ListView):
-    """View that returns the list of practices."""
+    """View that returns the list of practices of a team."""
 
     model = TimeSlot
 
+    def get_queryset(self):
+        """Only list the time slots of the team."""
+        return super().get_queryset().filter(team__slug=self.kwargs['slug']).select_related('team', 'gymnasium')
+
+
+class ScheduleView(TemplateView):
+    """Weekly schedule of every team in every gymnasium, as HTML or as JSON.
+
+    The response carries an ETag and a Last-Modified header so that the clients can send conditional requests. The
+    ETag depends on the format and on the language of the response, which varies with the Accept-Language header. The
+    schedule itself is only built again when a time slot, a team or a gymnasium changes.
+    """
+
+    template_name = 'sports_manager/schedule.html'
+    format = 'html'
+
+    def get(self, request, *args, **kwargs):
+        """Return the schedule or a 304 response if the client already has it."""
+        state = ScheduleState()
+        etag = quote_etag(state.representation_etag(self.format))
+        last_modified = timegm(state.last_modified.utctimetuple()) if state.last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            days = get_schedule(state)
+            if self.format == 'json':
+                response = JsonResponse({'days': days})
+            else:
+                response = self.render_to_response(self.get_context_data(days=days))
+
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ['Accept-Language'])
+        return response
+
 
 class TeamTimeSlotDetailView(DetailView):
     """View that returns the details of a Pratice."""
@@ -44,7 +85,7 @@ class TeamTimeSlotCreateView(CreateView):
     """View that creates a new TimeSlot."""
 
     model = TimeSlot
-    fields = '__all__'
+    form_class = TimeSlotForm
 
     def get(self, request, *args, **kwargs):
         """."""
@@ -71,7 +112,7 @@ class TeamTimeSlotUpdateView(UpdateView):
     """View that updates a new TimeSlot."""
 
     model = TimeSlot
-    fields = '__all__'
+    form_class = TimeSlotForm
 
     def get(self, request, *args, **kwargs):
         """."""